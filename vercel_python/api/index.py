@@ -1,31 +1,34 @@
-from re import search
-from typing import Any, List
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
-import json
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 import os
-from openai import AsyncOpenAI, OpenAI
 import csv
 from io import StringIO
 import logging
-import json
-import time
 import asyncio
-from fastapi.responses import JSONResponse
 import traceback
-import requests 
-from dotenv import load_dotenv
-from contextlib import asynccontextmanager
-
-load_dotenv()
+import tempfile
 
 import sys
 from pathlib import Path
 # Add the parent directory to sys.path
 sys.path.append(str(Path(__file__).parent.parent))
 
+# Timings of every import group below, served at /startup-report. Heavy dependencies
+# (openai, linkedin_api, requests, bs4, pandas, sqlalchemy) are imported by the
+# endpoints that use them, see custom_lib.startup_report.LAZY_MODULES
+from custom_lib.startup_report import StartupReport
+startup_report = StartupReport()
+
+with startup_report.measure("fastapi"):
+    from fastapi import FastAPI, HTTPException, Request
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import StreamingResponse
+    from pydantic import BaseModel
+
+with startup_report.measure("dotenv"):
+    from dotenv import load_dotenv
+    load_dotenv()
+
 dummy_username = 'dummy'
 dummy_password = 'dummy'
 
@@ -41,14 +44,27 @@ if not logger.hasHandlers():  # Avoid adding handlers multiple times
     logger.addHandler(console_handler)
 
 # Import from the custom_lib directory relative to vercel_python
-from custom_lib.automail_ai_craft import enrich_person, enrich_person_more, multi_enrich_persons
-from custom_lib.automail_ai_search_v2 import parse_input_prompt, convert_parms_to_targets, get_company_locations_id, execute_single_search
-from custom_lib.rocketreach_test import search_and_generate_emails
-from prompt.email import EMAIL_SYSTEM_PROMPT
-from custom_lib.linkedin_wrapper import LinkedinWrapper
-from requests.cookies import RequestsCookieJar
-from linkedin_api.cookie_repository import CookieRepository
-from custom_lib.cookies_extractor_async import cookie_extractor_from_json
+with startup_report.measure("custom_lib"):
+    from custom_lib.automail_ai_craft import enrich_person_async, enrich_person_more_async, enrich_profile_async, draft_email_async, draft_emails_packed_async, build_email_messages, legacy_email_messages
+    from custom_lib.email_pipeline import run_email_pipeline
+    from custom_lib.llm_dispatcher import LLMDispatcher, TokenUsage, estimate_tokens
+    from custom_lib.account_pool import AccountPool, load_cookie_sets, unique_cookie_sets
+    from custom_lib.automail_ai_search_v2 import parse_input_prompt_async, convert_parms_to_targets, get_company_locations_id_async, get_company_ids_async, execute_single_search_paged_async, MAX_SEARCH_PAGES
+    from custom_lib.client_pool import LinkedinClientPool, cookie_set_key
+    from custom_lib.cache_backends import MemoryLRUBackend, SQLiteBackend, TieredBackend
+    from custom_lib.profile_cache import DEFAULT_PROFILE_TTL, ProfileCache
+    from custom_lib.resolution_cache import DEFAULT_NEGATIVE_TTL, DEFAULT_RESOLUTION_TTL, ResolutionCache
+    from custom_lib.geo_gazetteer import DEFAULT_SEED_PATH, GeoGazetteer
+    from custom_lib.exclusion import BloomFilter
+    from custom_lib.school_registry import get_school_registry
+    from custom_lib.fast_json import FastJSONResponse, dumps_line
+    from custom_lib.log_payload import LogPayload
+    from custom_lib.session_store import DEFAULT_SESSION_TTL, CookieSession, SessionStore
+    from custom_lib.cookie_refresh import DEFAULT_PLAYWRIGHT_LOGIN_URL, CookieRefreshManager, LoginError, PlaywrightLoginProvider, load_accounts
+    from custom_lib.cookie_health import DEFAULT_DEAD_TTL, DEFAULT_HEALTHY_TTL, INVALID, CookieHealthChecker, CookieVerdict
+
+if TYPE_CHECKING:
+    from custom_lib.linkedin_wrapper_async import LinkedinWrapperAsync
 
 # uvicorn vercel_python.api.index:app --reload --log-level info
 
@@ -94,6 +110,10 @@ from custom_lib.cookies_extractor_async import cookie_extractor_from_json
 # Vercel version
 
 def init_linkedin_client():
+    with startup_report.measure("linkedin_api", lazy=True):
+        from requests.cookies import RequestsCookieJar
+        from linkedin_api.cookie_repository import CookieRepository
+        from custom_lib.linkedin_wrapper import LinkedinWrapper
     try:
         cookie_dir = 'custom_lib/'
         cookie_repo = CookieRepository(cookies_dir=cookie_dir)
@@ -120,8 +140,262 @@ def init_linkedin_client():
         logger.error(f"Traceback: {traceback.format_exc()}")
         return None
 
+# Raw profileView payloads shared by every client. Set PROFILE_CACHE_PATH (e.g. /tmp/profiles.db)
+# to back the in-memory LRU with SQLite so entries outlive the process
+def init_profile_cache() -> ProfileCache:
+    memory = MemoryLRUBackend(max_size=int(os.getenv("PROFILE_CACHE_MAX_SIZE", "2048")))
+    backend = memory
+    cache_path = os.getenv("PROFILE_CACHE_PATH")
+    if cache_path:
+        try:
+            backend = TieredBackend(memory, SQLiteBackend(cache_path, table="profiles"))
+        except Exception as e:
+            logger.error(f"Failed to open profile cache at {cache_path}, using memory only: {str(e)}")
+    return ProfileCache(backend, ttl=float(os.getenv("PROFILE_CACHE_TTL", str(DEFAULT_PROFILE_TTL))))
+
+profile_cache: Optional[ProfileCache] = None
+
+def get_profile_cache() -> ProfileCache:
+    global profile_cache
+    if profile_cache is None:
+        # Opened on first use so cold starts that never touch LinkedIn skip sqlalchemy
+        with startup_report.measure("profile_cache", lazy=True):
+            profile_cache = init_profile_cache()
+    return profile_cache
+
+# Company/geo name -> URN resolutions. Kept on disk by default (RESOLUTION_CACHE_PATH) so
+# "Moelis" or "New York" resolve without LinkedIn even after a restart
+def init_resolution_cache() -> ResolutionCache:
+    memory = MemoryLRUBackend(max_size=int(os.getenv("RESOLUTION_CACHE_MAX_SIZE", "4096")))
+    backend = memory
+    cache_path = os.getenv("RESOLUTION_CACHE_PATH", os.path.join(tempfile.gettempdir(), "lisa_resolutions.db"))
+    if cache_path:
+        try:
+            backend = TieredBackend(memory, SQLiteBackend(cache_path, table="resolutions"))
+        except Exception as e:
+            logger.error(f"Failed to open resolution cache at {cache_path}, using memory only: {str(e)}")
+    return ResolutionCache(
+        backend,
+        ttl=float(os.getenv("RESOLUTION_CACHE_TTL", str(DEFAULT_RESOLUTION_TTL))),
+        negative_ttl=float(os.getenv("RESOLUTION_CACHE_NEGATIVE_TTL", str(DEFAULT_NEGATIVE_TTL))),
+    )
+
+resolution_cache: Optional[ResolutionCache] = None
+
+def get_resolution_cache() -> ResolutionCache:
+    global resolution_cache
+    if resolution_cache is None:
+        with startup_report.measure("resolution_cache", lazy=True):
+            resolution_cache = init_resolution_cache()
+    return resolution_cache
+
+# Company -> RocketReach email format (url, pattern, example, domain), on disk by default
+# (EMAIL_FORMAT_CACHE_PATH) so /format-email-addresses skips both scrapes for known companies
+def init_email_format_cache() -> ResolutionCache:
+    from custom_lib.rocketreach_test import DEFAULT_EMAIL_FORMAT_NEGATIVE_TTL, DEFAULT_EMAIL_FORMAT_TTL
+    memory = MemoryLRUBackend(max_size=int(os.getenv("EMAIL_FORMAT_CACHE_MAX_SIZE", "2048")))
+    backend = memory
+    cache_path = os.getenv("EMAIL_FORMAT_CACHE_PATH", os.path.join(tempfile.gettempdir(), "lisa_email_formats.db"))
+    if cache_path:
+        try:
+            backend = TieredBackend(memory, SQLiteBackend(cache_path, table="email_formats"))
+        except Exception as e:
+            logger.error(f"Failed to open email format cache at {cache_path}, using memory only: {str(e)}")
+    return ResolutionCache(
+        backend,
+        ttl=float(os.getenv("EMAIL_FORMAT_CACHE_TTL", str(DEFAULT_EMAIL_FORMAT_TTL))),
+        negative_ttl=float(os.getenv("EMAIL_FORMAT_CACHE_NEGATIVE_TTL", str(DEFAULT_EMAIL_FORMAT_NEGATIVE_TTL))),
+    )
+
+email_format_cache: Optional[ResolutionCache] = None
+
+def get_email_format_cache() -> ResolutionCache:
+    global email_format_cache
+    if email_format_cache is None:
+        with startup_report.measure("email_format_cache", lazy=True):
+            email_format_cache = init_email_format_cache()
+    return email_format_cache
+
+# Known locations answered in memory; seeded from captured typeahead payloads and
+# extended by every live geo lookup
+with startup_report.measure("geo_gazetteer"):
+    geo_gazetteer = GeoGazetteer.from_seed_file(os.getenv("GEO_GAZETTEER_SEED_PATH", DEFAULT_SEED_PATH))
+
+# School groups (CAD schools for fill searches) and school name lookups, loaded once
+with startup_report.measure("school_registry"):
+    school_registry = get_school_registry()
+
+# Warm LinkedIn clients shared across requests, keyed by the caller's cookie set
+def create_linkedin_client(cookies: List[Dict[str, Any]]) -> "LinkedinWrapperAsync":
+    # linkedin_api, requests and aiohttp load with the first client, not with the module
+    with startup_report.measure("linkedin_wrapper_async", lazy=True):
+        from custom_lib.linkedin_wrapper_async import LinkedinWrapperAsync
+        from custom_lib.cookies_extractor_async import cookie_jar_from_json_cached
+    return LinkedinWrapperAsync(
+        cookies=cookie_jar_from_json_cached(cookies),
+        debug=True,
+        requests_per_minute=float(os.getenv("LINKEDIN_REQUESTS_PER_MINUTE", "30")),
+        profile_cache=get_profile_cache(),
+        resolution_cache=get_resolution_cache(),
+        gazetteer=geo_gazetteer,
+        resolve_concurrency=RESOLVE_CONCURRENCY,
+    )
+
+linkedin_pool = LinkedinClientPool(
+    factory=create_linkedin_client,
+    max_size=int(os.getenv("LINKEDIN_POOL_MAX_SIZE", "32")),
+    idle_ttl=float(os.getenv("LINKEDIN_POOL_IDLE_TTL", "600")),
+    on_evict=lambda client: client.close_nowait(),
+)
+
+def get_linkedin_client(cookies: List[Dict[str, Any]], key: Optional[str] = None) -> "LinkedinWrapperAsync":
+    return linkedin_pool.get(cookies, key=key)
+
+# Cookie arrays registered once through POST /session; later calls send only the handle
+session_store = SessionStore(
+    max_size=int(os.getenv("COOKIE_SESSION_MAX_SIZE", "1024")),
+    ttl=float(os.getenv("COOKIE_SESSION_TTL", str(DEFAULT_SESSION_TTL))),
+)
+
+def get_cookie_session(handle: str) -> CookieSession:
+    try:
+        return session_store.get(handle)
+    except KeyError:
+        # Handles are per instance, so a cold start also lands here
+        raise HTTPException(status_code=401, detail="Unknown or expired session, register the cookies again with POST /session")
+
+def request_session(request: "LinkedinRequest") -> CookieSession:
+    """Resolve the request's session handle, or wrap its inline cookies."""
+    if request.session:
+        return get_cookie_session(request.session)
+    if not request.cookies:
+        raise HTTPException(status_code=400, detail="Either cookies or session is required")
+    return CookieSession.from_cookies(request.cookies)
+
+async def probe_cookies(cookies: List[Dict[str, Any]], key: str):
+    await get_linkedin_client(cookies, key=key).probe_session()
+
+# Health verdicts per cookie set, so dead sessions are rejected before any LinkedIn call
+cookie_health = CookieHealthChecker(
+    probe=probe_cookies,
+    ttl=float(os.getenv("COOKIE_HEALTH_TTL", str(DEFAULT_HEALTHY_TTL))),
+    dead_ttl=float(os.getenv("COOKIE_HEALTH_DEAD_TTL", str(DEFAULT_DEAD_TTL))),
+)
+
+def record_rejected_session(key: str):
+    # The pooled client saw LinkedIn reject the session (401, challenge, login redirects or a 403 on /me).
+    # A 403 on any other resource is a private profile or company and never lands here
+    client = linkedin_pool.peek(key)
+    if client is not None and client.session_invalid:
+        cookie_health.record(key, CookieVerdict(INVALID, "LinkedIn rejected the session"))
+
+def get_request_client(request: "LinkedinRequest") -> "LinkedinWrapperAsync":
+    session = request_session(request)
+    record_rejected_session(session.key)
+    verdict = cookie_health.quick_check(session.cookies, key=session.key)
+    if not verdict.usable:
+        raise HTTPException(status_code=401, detail=f"Cookies are {verdict.status}: {verdict.reason}")
+    return get_linkedin_client(session.cookies, key=session.key)
+
+def request_cookie_sets(request: "LinkedinRequest") -> List[List[Dict[str, Any]]]:
+    """Extra accounts of a multi-account request, from cookie_sets and session handles."""
+    return (request.cookie_sets or []) + [get_cookie_session(handle).cookies for handle in (request.sessions or [])]
+
+# Profiles enriched at once per request; the per-account rate budget still applies
+ENRICH_CONCURRENCY = int(os.getenv("LINKEDIN_ENRICH_CONCURRENCY", "5"))
+
+# Company/geo lookups in flight at once per account while resolving search targets
+RESOLVE_CONCURRENCY = int(os.getenv("LINKEDIN_RESOLVE_CONCURRENCY", "5"))
+
+# Default for /execute-single-search: start the fill search together with Step 1
+SPECULATIVE_FILL_SEARCH = os.getenv("SPECULATIVE_FILL_SEARCH", "false").lower() == "true"
+
+# OpenAI drafts in flight at once per request
+DRAFT_CONCURRENCY = int(os.getenv("OPENAI_DRAFT_CONCURRENCY", "10"))
+
+# Estimated candidate + output tokens per completion when pack_size > 1
+PACKED_DRAFT_TOKEN_BUDGET = int(os.getenv("PACKED_DRAFT_TOKEN_BUDGET", "6000"))
+
+# Every OpenAI call goes through one dispatcher so concurrency and the TPM budget are process wide
+llm_dispatcher: Optional[LLMDispatcher] = None
+
+def token_usage_report(token_usage: TokenUsage, emails: int, prompt_tokens: int, legacy_prompt_tokens: int) -> Dict[str, Any]:
+    """
+    Prompt tokens per email: measured by the API, plus same-method estimates for the
+    current single-candidate layout and the old per-candidate layout so they can be compared.
+    """
+    report = token_usage.to_dict()
+    del report["prompt_tokens_per_call"]
+    report["emails"] = emails
+    report["prompt_tokens_per_email"] = token_usage.prompt_tokens / emails if emails else 0.0
+    report["prompt_tokens_per_email_estimate"] = prompt_tokens / emails if emails else 0.0
+    report["legacy_prompt_tokens_per_email_estimate"] = legacy_prompt_tokens / emails if emails else 0.0
+    return report
+
+def get_llm_dispatcher() -> LLMDispatcher:
+    global llm_dispatcher
+    if llm_dispatcher is None:
+        # Created on first use, after load_dotenv has put the API key in place
+        with startup_report.measure("openai", lazy=True):
+            from openai import AsyncOpenAI
+        tokens_per_minute = os.getenv("OPENAI_TOKENS_PER_MINUTE")
+        llm_dispatcher = LLMDispatcher(
+            # The dispatcher retries with its own backoff; SDK retries would multiply them
+            AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0),
+            max_concurrency=int(os.getenv("OPENAI_MAX_CONCURRENCY", "20")),
+            tokens_per_minute=float(tokens_per_minute) if tokens_per_minute else None,
+        )
+    return llm_dispatcher
+
+# Optional server-side accounts (one cookie export per file) added to every enrichment run
+SERVER_COOKIE_SETS = load_cookie_sets(os.environ["LINKEDIN_ACCOUNT_COOKIES_DIR"]) if os.getenv("LINKEDIN_ACCOUNT_COOKIES_DIR") else []
+
+def get_account_pool(
+    cookies: List[Dict[str, Any]],
+    cookie_sets: Optional[List[List[Dict[str, Any]]]] = None
+) -> AccountPool:
+    cookie_sets = unique_cookie_sets([cookies] + (cookie_sets or []) + SERVER_COOKIE_SETS)
+    return AccountPool(
+        [get_linkedin_client(account_cookies) for account_cookies in cookie_sets],
+        max_concurrency=ENRICH_CONCURRENCY,
+    )
+
+# Logs accounts in through the web app's playwright endpoint (/login-linkedin and cookie refreshes)
+login_provider = PlaywrightLoginProvider(os.getenv("LINKEDIN_LOGIN_URL", DEFAULT_PLAYWRIGHT_LOGIN_URL))
+
+def swap_refreshed_cookies(account, old_cookies: Optional[List[Dict[str, Any]]], new_cookies: List[Dict[str, Any]]):
+    # Pooled client, session handles and the server account list all move to the new cookies.
+    # Only an existing SERVER_COOKIE_SETS entry is replaced: refresh-only accounts never join enrichment runs
+    if not old_cookies:
+        return
+    old_key = cookie_set_key(old_cookies)
+    linkedin_pool.replace(old_key, new_cookies)
+    session_store.replace_cookies(old_key, new_cookies)
+    for i, cookie_set in enumerate(SERVER_COOKIE_SETS):
+        if cookie_set_key(cookie_set) == old_key:
+            SERVER_COOKIE_SETS[i] = new_cookies
+            break
+
+# Server-side accounts kept logged in ahead of cookie expiry. LINKEDIN_REFRESH_ACCOUNTS_FILE lists
+# {"name", "email", "password", "cookies_path"} entries; refreshes run from POST /cookie-refresh/run
+# (e.g. a cron) and, with COOKIE_REFRESH_BACKGROUND=true, in a loop on long-lived servers
+cookie_refresh: Optional[CookieRefreshManager] = None
+if os.getenv("LINKEDIN_REFRESH_ACCOUNTS_FILE"):
+    cookie_refresh = CookieRefreshManager(
+        login_provider,
+        on_refresh=swap_refreshed_cookies,
+        refresh_margin=float(os.getenv("COOKIE_REFRESH_MARGIN", "86400")),
+        max_concurrency=int(os.getenv("COOKIE_REFRESH_CONCURRENCY", "2")),
+        check_interval=float(os.getenv("COOKIE_REFRESH_INTERVAL", "300")),
+    )
+    try:
+        for account in load_accounts(os.environ["LINKEDIN_REFRESH_ACCOUNTS_FILE"]):
+            cookie_refresh.add_account(account)
+    except (OSError, ValueError, KeyError) as e:
+        logger.error(f"Failed to load cookie refresh accounts: {str(e)}")
+
 # app = FastAPI(lifespan=lifespan)
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse)
 
 # Configure CORS
 app.add_middleware(
@@ -131,48 +405,62 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-from typing import Dict, Any
+
+@app.on_event("startup")
+async def start_cookie_refresh():
+    if cookie_refresh is not None and os.getenv("COOKIE_REFRESH_BACKGROUND", "false").lower() == "true":
+        cookie_refresh.start()
 
 # Define request model
-class ProcessDataRequest(BaseModel):
+class LinkedinRequest(BaseModel):
+    cookies: List[Dict[str, Any]] = []  # EditThisCookie export of the LinkedIn account
+    session: Optional[str] = None  # handle from POST /session, sent instead of cookies
+
+class ProcessDataRequest(LinkedinRequest):
     csv_data: str
     keyword_industry: str
     user_linkedin_url: str
     email_template: str
+    cookie_sets: Optional[List[List[Dict[str, Any]]]] = None  # extra accounts to shard enrichment across
+    sessions: Optional[List[str]] = None  # handles of extra accounts, instead of cookie_sets
+    measure_tokens: bool = False  # report prompt tokens per email, old layout vs current
+    pack_size: int = 1  # candidates drafted per completion, 1 for one completion each
 
 class PromptExtractionRequest(BaseModel):
     input: str
 
-class CompanyLocationsRequest(BaseModel):
+class CompanyLocationsRequest(LinkedinRequest):
     input: list
-    cookies: List[Dict[str, Any]]
 
-class GetCompanyRequest(BaseModel):
+class CompanyLocationsBatchRequest(LinkedinRequest):
+    input: list  # convert_parms_to_targets output
+
+class GetCompanyRequest(LinkedinRequest):
     company_public_id: str
-    cookies: List[Dict[str, Any]]
 
-class StandardInputRequest(BaseModel):
+class StandardInputRequest(LinkedinRequest):
     input: str
-    cookies: List[Dict[str, Any]]
 
-class SendConnectionRequest(BaseModel):
+class SendConnectionRequest(LinkedinRequest):
     public_id: str
     message: str
-    cookies: List[Dict[str, Any]]
 
-class ExecutionSearch(BaseModel):
+class ExecutionSearch(LinkedinRequest):
     company_urn: str
     company_name_for_passthrough: str
     location_urn: str
     search_keyword: str = ""
     school_urn_id: str = ""
     existing_public_ids: list = None
+    existing_public_ids_bloom: Optional[str] = None  # BloomFilter.to_string() of IDs to exclude, instead of a long list
     offset: int = 0
+    fill_offset: Optional[int] = None  # next_fill_offset of the previous call, defaults to offset
+    max_pages: int = MAX_SEARCH_PAGES
+    speculative: bool = SPECULATIVE_FILL_SEARCH  # run the fill search alongside Step 1
     target_count: int = 10
     use_cad: bool = False
-    cookies: List[Dict[str, Any]]
 
-class SearchPeopleRequest(BaseModel):
+class SearchPeopleRequest(LinkedinRequest):
     keywords: str
     past_companies: list
     or_past_companies: bool
@@ -180,37 +468,53 @@ class SearchPeopleRequest(BaseModel):
     or_regions: bool = False
     limit: int
     offset: int
+
+class CookieHealthRequest(LinkedinRequest):
+    probe: bool = True  # ask LinkedIn when no verdict is cached, else only read the cookie fields
+
+class LoginRequest(BaseModel):
+    email: str
+    password: str
+
+class SessionRequest(BaseModel):
     cookies: List[Dict[str, Any]]
+    warm: bool = True  # build the pooled LinkedIn client now so the first call finds it ready
+
+class ExclusionBloomRequest(BaseModel):
+    ids: List[str]
+    error_rate: float = 0.001
 
 class EmailAddressRequest(BaseModel):
     names: list
     company: str
 
-class DraftEmailsRequest(BaseModel):
+class DraftEmailsRequest(LinkedinRequest):
     url_list: list
     keyword_industry: str
     user_linkedin_url: str
     email_template: str
-    cookies: List[Dict[str, Any]]
+    cookie_sets: Optional[List[List[Dict[str, Any]]]] = None  # extra accounts to shard enrichment across
+    sessions: Optional[List[str]] = None  # handles of extra accounts, instead of cookie_sets
+    measure_tokens: bool = False  # report prompt tokens per email, old layout vs current
+    pack_size: int = 1  # candidates drafted per completion, 1 for one completion each
 
-class EnrichProfileRequest(BaseModel):
+class EnrichProfileRequest(LinkedinRequest):
     linkedin_url: str
-    cookies: List[Dict[str, Any]]
+
+class SchoolIdRequest(LinkedinRequest):
+    school: str = ""  # school name, public id or /school/ URL, answered from the school registry
+    linkedin_url: str = ""  # profile whose education to return, when school is not given
 
 @app.post("/extract-prompt-data")
 async def extract_prompt_data(request: PromptExtractionRequest) -> dict:
-    logger.info(f"Received prompt: {request.input}")
+    logger.info("Received prompt: %s", request.input)
     try: 
         # Send initial checkpoint
-        openai_client = OpenAI(
-            api_key=os.getenv("OPENAI_API_KEY")
-        )
-        logger.info("Created OpenAI client")
-        output = parse_input_prompt(prompt=request.input, openai_client=openai_client)
-        logger.info(f"Successfully parsed prompt with OpenAI: {output}")
+        output = await parse_input_prompt_async(prompt=request.input, dispatcher=get_llm_dispatcher())
+        logger.info("Successfully parsed prompt with OpenAI: %s", LogPayload(output))
         company_location_targets = convert_parms_to_targets(output)
-        logger.info(f"Successfully converted parameters to targets: {company_location_targets}")
-        return JSONResponse(content={
+        logger.info("Successfully converted parameters to targets: %s", LogPayload(company_location_targets))
+        return FastJSONResponse(content={
             "params": output,
             "targets": company_location_targets
         }, media_type="application/json")
@@ -220,9 +524,16 @@ async def extract_prompt_data(request: PromptExtractionRequest) -> dict:
         logger.error(f"Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def company_location_target_list(result) -> List[list]:
+    """Flatten one (company_id, locations, company_name) result into [company, location, target, name] rows."""
+    company_id, locations, company_name = result
+    if not locations:
+        return [[company_id, "", 0, company_name]]
+    return [[company_id, location[0], location[1], company_name] for location in locations]
+
 @app.post("/get-company-locations-id")
 async def get_ids(request: CompanyLocationsRequest) -> dict:
-    logger.info(f"Received prompt: {request.input}")
+    logger.info("Received prompt: %s", request.input)
     try:
         # if not hasattr(app.state, 'linkedin_client'):
         #     raise HTTPException(status_code=500, detail="LinkedIn client not initialized")
@@ -231,52 +542,73 @@ async def get_ids(request: CompanyLocationsRequest) -> dict:
         # linkedin_client = app.state.linkedin_client
 
         # linkedin_client = init_linkedin_client()
-        cookies = request.cookies
-        cookies_jar = cookie_extractor_from_json(cookies)
-        linkedin_client = LinkedinWrapper(dummy_username, dummy_password, cookies=cookies_jar, debug=True)
+        linkedin_client = get_request_client(request)
         if not linkedin_client:
             raise HTTPException(status_code=500, detail="Failed to initialize LinkedIn client")
 
-        result = get_company_locations_id(
-            linkedin=linkedin_client, search_target=request.input)
-        logger.info(f"Successfully got company locations: {result}")
-
-        target_list = []
-        company_id, locations, company_name = result
-        if locations:
-            for location in locations:
-                target_list.append([company_id, location[0], location[1], company_name])
-        else:
-            target_list.append([company_id, "", 0, company_name])
+        result = await get_company_locations_id_async(
+            linkedin=linkedin_client, search_target=request.input,
+            semaphore=linkedin_client.resolve_semaphore)
+        logger.info("Successfully got company locations: %s", LogPayload(result))
 
         # Your existing logic here using linkedin_client
-        return JSONResponse(content={
+        return FastJSONResponse(content={
             "result": result,
-            "targets": target_list
+            "targets": company_location_target_list(result)
         }, media_type="application/json")
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in get_company_locations_id: {str(e)}")
         logger.error(f"Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/get-company-locations-ids")
+async def get_ids_batch(request: CompanyLocationsBatchRequest) -> dict:
+    logger.info("Received prompt: %s", request.input)
+    try:
+        linkedin_client = get_request_client(request)
+        if not linkedin_client:
+            raise HTTPException(status_code=500, detail="Failed to initialize LinkedIn client")
+
+        results = await get_company_ids_async(
+            linkedin=linkedin_client, search_targets=request.input,
+            semaphore=linkedin_client.resolve_semaphore)
+        logger.info(f"Successfully got company locations for {len(results)} companies")
+
+        return FastJSONResponse(content={
+            "results": results,
+            "targets": [target for result in results for target in company_location_target_list(result)]
+        }, media_type="application/json")
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in get_company_locations_ids: {str(e)}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/execute-single-search")
 async def get_execution_search(request: ExecutionSearch) -> dict:
-    logger.info(f"Received prompt: {request}")
+    logger.info("Received prompt: %s", LogPayload(request))
     try:
         # if not hasattr(app.state, 'linkedin_client'):
         #     raise HTTPException(status_code=500, detail="LinkedIn client not initialized")
             
         # # # Use the client from app state
         # linkedin_client = app.state.linkedin_client
-        cookies = request.cookies
-        cookies_jar = cookie_extractor_from_json(cookies)
-        linkedin_client = LinkedinWrapper(dummy_username, dummy_password, cookies=cookies_jar, debug=True)
+        try:
+            # Client supplied, so parsed (and bounded) before any LinkedIn work
+            exclusion_bloom = BloomFilter.parse(request.existing_public_ids_bloom)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        linkedin_client = get_request_client(request)
 
         if not linkedin_client:
             raise HTTPException(status_code=500, detail="Failed to initialize LinkedIn client")
 
-        result = execute_single_search(
+        page = await execute_single_search_paged_async(
             linkedin=linkedin_client,
             company_name_for_passthrough=request.company_name_for_passthrough,
             company_urn=request.company_urn,
@@ -284,33 +616,97 @@ async def get_execution_search(request: ExecutionSearch) -> dict:
             search_keyword=request.search_keyword,
             school_urn_id=request.school_urn_id,
             existing_public_ids=request.existing_public_ids,
+            existing_public_ids_bloom=exclusion_bloom,
             offset=request.offset,
             target_count=request.target_count,
             use_cad=request.use_cad,
+            fill_offset=request.fill_offset,
+            max_pages=request.max_pages,
+            speculative=request.speculative,
         )
-        logger.info(f"Successfully executed single search: {result}")   
+        logger.info("Successfully executed single search: %s", LogPayload(page.rows))   
 
         # Your existing logic here using linkedin_client
-        return JSONResponse(content={
-            "result": result
+        return FastJSONResponse(content={
+            "result": page.rows,
+            "next_offset": page.next_offset,
+            "next_fill_offset": page.next_fill_offset
         }, media_type="application/json")
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in get_company_locations_id: {str(e)}")
         logger.error(f"Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/exclusion-bloom")
+async def exclusion_bloom(request: ExclusionBloomRequest) -> dict:
+    # Encode a campaign's exclusion list once; later searches send the filter instead of the list
+    try:
+        bloom = BloomFilter.from_ids(request.ids, error_rate=request.error_rate)
+        return FastJSONResponse(content={
+            "bloom": bloom.to_string(),
+            "count": len(request.ids)
+        }, media_type="application/json")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in exclusion_bloom: {str(e)}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/session")
+async def create_session(request: SessionRequest) -> dict:
+    # Register a cookie export once; later calls send {"session": handle} instead of the cookies.
+    # Neither the cookies nor the handle in the response are logged
+    logger.info(f"Registering cookie session with {len(request.cookies)} cookies")
+    try:
+        session = session_store.create(request.cookies)
+        if request.warm:
+            get_linkedin_client(session.cookies, key=session.key)
+        return FastJSONResponse(content={
+            "session": session.handle,
+            "expires_in": session_store.ttl
+        }, media_type="application/json")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in create_session: {str(e)}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/cookie-health")
+async def get_cookie_health(request: CookieHealthRequest) -> dict:
+    try:
+        session = request_session(request)
+        record_rejected_session(session.key)
+        verdict = await cookie_health.check(session.cookies, key=session.key, probe=request.probe)
+        return FastJSONResponse(content={
+            "result": verdict.to_dict()
+        }, media_type="application/json")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in get_cookie_health: {str(e)}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.delete("/session/{handle}")
+async def revoke_session(handle: str) -> dict:
+    if not session_store.revoke(handle):
+        raise HTTPException(status_code=404, detail="Unknown session")
+    return {"status": "success"}
+
 @app.post("/search-people")
 async def get_search_people(request: SearchPeopleRequest) -> dict:
-    logger.info(f"Received prompt: {request}")
+    logger.info("Received prompt: %s", LogPayload(request))
     try:
-        cookies = request.cookies
-        cookies_jar = cookie_extractor_from_json(cookies)
-        linkedin_client = LinkedinWrapper(dummy_username, dummy_password, cookies=cookies_jar, debug=True)
+        linkedin_client = get_request_client(request)
         if not linkedin_client:
             raise HTTPException(status_code=500, detail="Failed to initialize LinkedIn client")
 
-        result = linkedin_client.search_people(
+        result = await linkedin_client.search_people(
             keywords=request.keywords,
             past_companies=request.past_companies,
             or_past_companies=request.or_past_companies,
@@ -319,13 +715,15 @@ async def get_search_people(request: SearchPeopleRequest) -> dict:
             limit=request.limit,
             offset=request.offset
         )
-        logger.info(f"Successfully executed single search: {result}")   
+        logger.info("Successfully executed single search: %s", LogPayload(result))   
 
         # Your existing logic here using linkedin_client
-        return JSONResponse(content={
+        return FastJSONResponse(content={
             "result": result
         }, media_type="application/json")
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in get_company_locations_id: {str(e)}")
         logger.error(f"Traceback: {traceback.format_exc()}")
@@ -333,28 +731,27 @@ async def get_search_people(request: SearchPeopleRequest) -> dict:
 
 @app.post("/format-email-addresses")
 async def get_email_addresses(request: EmailAddressRequest) -> dict:
-    logger.info(f"Received prompt: {request}")
+    logger.info("Received prompt: %s", LogPayload(request))
     try:
-        openai_client = AsyncOpenAI(
-            api_key=os.getenv("OPENAI_API_KEY")
-        )
-        logger.info("Created OpenAI client")
-
+        # rocketreach_test pulls in requests and bs4, only needed here
+        with startup_report.measure("rocketreach", lazy=True):
+            from custom_lib.rocketreach_test import search_and_generate_emails
         emails = await search_and_generate_emails(
-            async_openai_client=openai_client,
+            dispatcher=get_llm_dispatcher(),
             company=request.company,
-            names=request.names
+            names=request.names,
+            format_cache=get_email_format_cache()
         )
-        logger.info(f"Successfully generated email addresses: {emails}")
+        logger.info("Successfully generated email addresses: %s", LogPayload(emails))
 
         if not emails:
-            return JSONResponse(content={
+            return FastJSONResponse(content={
                 "format": "",
                 "result": []
             }, media_type="application/json")
         else:
             # Your existing logic here using linkedin_client
-            return JSONResponse(content={
+            return FastJSONResponse(content={
                 "format": emails[0],
                 "result": emails[1]
             }, media_type="application/json")
@@ -365,34 +762,53 @@ async def get_email_addresses(request: EmailAddressRequest) -> dict:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/get-school-id") # TBD
-async def get_school_id(request: EnrichProfileRequest) -> dict:
-    logger.info(f"Received prompt: {request}")
+async def get_school_id(request: SchoolIdRequest) -> dict:
+    logger.info("Received prompt: %s", LogPayload(request))
     try:
+        if request.school:
+            school_urn_id = school_registry.lookup(request.school)
+            logger.info(f"School registry lookup for {request.school}: {school_urn_id}")
+            return FastJSONResponse(content={
+                "result": [{
+                    "school": request.school,
+                    "school_urn_id": school_urn_id,
+                    "groups": school_registry.groups_of(school_urn_id)
+                }] if school_urn_id else []
+            }, media_type="application/json")
+
+        if not request.linkedin_url:
+            raise HTTPException(status_code=400, detail="Either school or linkedin_url is required")
+
         # if not hasattr(app.state, 'linkedin_client'):
         #     raise HTTPException(status_code=500, detail="LinkedIn client not initialized")
             
         # # # Use the client from app state
         # linkedin_client = app.state.linkedin_client
 
-        cookies = request.cookies
-        cookies_jar = cookie_extractor_from_json(cookies)
-        linkedin_client = LinkedinWrapper(dummy_username, dummy_password, cookies=cookies_jar, debug=True)
+        linkedin_client = get_request_client(request)
         if not linkedin_client:
             raise HTTPException(status_code=500, detail="Failed to initialize LinkedIn client")
 
-        result = enrich_person(
+        result = await enrich_person_async(
             linkedin=linkedin_client,
             value=request.linkedin_url,
-            url_value=True
+            url_value=True,
+            sections=("education",)
         )
-        logger.info(f"Successfully enriched person: {result}")
+        logger.info("Successfully enriched person: %s", LogPayload(result))
         education_set = result.get("education", [])
+        # Remember the schools so later lookups by name skip the enrichment
+        for education in education_set:
+            if education.get("school") and education.get("school_urn_id"):
+                school_registry.register(education["school"], education["school_urn_id"])
 
         # Your existing logic here using linkedin_client
-        return JSONResponse(content={
+        return FastJSONResponse(content={
             "result": education_set
         }, media_type="application/json")
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in get_company_locations_id: {str(e)}")
         logger.error(f"Traceback: {traceback.format_exc()}")
@@ -400,26 +816,27 @@ async def get_school_id(request: EnrichProfileRequest) -> dict:
 
 @app.post("/get-geo-id") # TBD
 async def get_geo_id(request: StandardInputRequest) -> dict:
-    logger.info(f"Received prompt: {request}")
+    logger.info("Received prompt: %s", LogPayload(request))
     try:
-        cookies = request.cookies
-        cookies_jar = cookie_extractor_from_json(cookies)
-        linkedin_client = LinkedinWrapper(dummy_username, dummy_password, cookies=cookies_jar, debug=True)
+        linkedin_client = get_request_client(request)
         if not linkedin_client:
             raise HTTPException(status_code=500, detail="Failed to initialize LinkedIn client")
 
-        result = linkedin_client.search_geo(
+        result = await linkedin_client.search_geo(
             keywords=request.input,
             limit=10,
             offset=0
         )
-        logger.info(f"Successfully enriched person: {result}")
+        logger.info("Successfully enriched person: %s", LogPayload(result))
 
         # Your existing logic here using linkedin_client
-        return JSONResponse(content={
-            "result": result
+        return FastJSONResponse(content={
+            "result": result,
+            "suggestions": [entry.to_dict() for entry in geo_gazetteer.complete(request.input, limit=10)]
         }, media_type="application/json")
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in get_geo_id: {str(e)}")
         logger.error(f"Traceback: {traceback.format_exc()}")
@@ -427,26 +844,26 @@ async def get_geo_id(request: StandardInputRequest) -> dict:
 
 @app.post("/enrich-profile") # TBD
 async def enrich_profile(request: EnrichProfileRequest) -> dict:
-    logger.info(f"Received prompt: {request}")
+    logger.info("Received prompt: %s", LogPayload(request))
     try:
 
-        cookies = request.cookies
-        cookies_jar = cookie_extractor_from_json(cookies)
-        linkedin_client = LinkedinWrapper(dummy_username, dummy_password, cookies=cookies_jar, debug=True)
+        linkedin_client = get_request_client(request)
         if not linkedin_client:
             raise HTTPException(status_code=500, detail="Failed to initialize LinkedIn client")
 
-        result = enrich_person(
+        result = await enrich_person_async(
             linkedin=linkedin_client,
             value=request.linkedin_url,
             url_value=True
         )
 
         # Your existing logic here using linkedin_client
-        return JSONResponse(content={
+        return FastJSONResponse(content={
             "result": result
         }, media_type="application/json")
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in get_company_locations_id: {str(e)}")
         logger.error(f"Traceback: {traceback.format_exc()}")
@@ -454,28 +871,28 @@ async def enrich_profile(request: EnrichProfileRequest) -> dict:
 
 @app.post("/enrich-profile-more") # TBD
 async def enrich_profile_more(request: EnrichProfileRequest) -> dict:
-    logger.info(f"Received prompt: {request}")
+    logger.info("Received prompt: %s", LogPayload(request))
     try:
 
-        cookies = request.cookies
-        cookies_jar = cookie_extractor_from_json(cookies)
-        linkedin_client = LinkedinWrapper(dummy_username, dummy_password, cookies=cookies_jar, debug=True)
+        linkedin_client = get_request_client(request)
         if not linkedin_client:
             raise HTTPException(status_code=500, detail="Failed to initialize LinkedIn client")
 
-        result = enrich_person_more(
+        result = await enrich_person_more_async(
             linkedin=linkedin_client,
             value=request.linkedin_url,
             url_value=True
         )
 
-        logger.info(f"Successfully enriched person: {result}")
+        logger.info("Successfully enriched person: %s", LogPayload(result))
 
         # Your existing logic here using linkedin_client
-        return JSONResponse(content={
+        return FastJSONResponse(content={
             "result": result
         }, media_type="application/json")
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in get_company_locations_id: {str(e)}")
         logger.error(f"Traceback: {traceback.format_exc()}")
@@ -483,22 +900,22 @@ async def enrich_profile_more(request: EnrichProfileRequest) -> dict:
 
 @app.post("/get-company") # TBD
 async def get_company(request: GetCompanyRequest) -> dict:
-    logger.info(f"Received prompt: {request}")
+    logger.info("Received prompt: %s", LogPayload(request))
     try:
 
-        cookies = request.cookies
-        cookies_jar = cookie_extractor_from_json(cookies)
-        linkedin_client = LinkedinWrapper(dummy_username, dummy_password, cookies=cookies_jar, debug=True)
+        linkedin_client = get_request_client(request)
         if not linkedin_client:
             raise HTTPException(status_code=500, detail="Failed to initialize LinkedIn client")
 
-        result = linkedin_client.get_company(public_id=request.company_public_id)
+        result = await linkedin_client.get_company(public_id=request.company_public_id)
 
         # Your existing logic here using linkedin_client
-        return JSONResponse(content={
+        return FastJSONResponse(content={
             "result": result
         }, media_type="application/json")
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in get_company_locations_id: {str(e)}")
         logger.error(f"Traceback: {traceback.format_exc()}")
@@ -506,30 +923,28 @@ async def get_company(request: GetCompanyRequest) -> dict:
 
 @app.post("/get-company-id") # TBD
 async def get_company_id(request: StandardInputRequest) -> dict:
-    logger.info(f"Received prompt: {request}")
+    logger.info("Received prompt: %s", LogPayload(request))
     try:
-        cookies = request.cookies
-        cookies_jar = cookie_extractor_from_json(cookies)
-        linkedin_client = LinkedinWrapper(dummy_username, dummy_password, cookies=cookies_jar, debug=True)
+        linkedin_client = get_request_client(request)
         if not linkedin_client:
             raise HTTPException(status_code=500, detail="Failed to initialize LinkedIn client")
 
-        search_results = linkedin_client.search_companies(
-            keywords=[request.input],
-            limit=10,
-            offset=0
-        )        
+        company = await linkedin_client.resolve_company(request.input)
+        if not company:
+            raise ValueError(f"No company found for {request.input}")
         # Use the first result's URN ID
-        company_id = search_results[0]["urn_id"]
-        company_found_name = search_results[0]["name"]
+        company_id = company["urn_id"]
+        company_found_name = company["name"]
 
         logger.info(f"Successfully found company: {company_id} for company name: {company_found_name}")
 
         # Your existing logic here using linkedin_client
-        return JSONResponse(content={
+        return FastJSONResponse(content={
             "result": [company_id, company_found_name]
         }, media_type="application/json")
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in get_company_locations_id: {str(e)}")
         logger.error(f"Traceback: {traceback.format_exc()}")
@@ -549,106 +964,110 @@ async def send_connection_request(request: SendConnectionRequest) -> dict:
         logger.info(f"Request type: {type(request)}")
         logger.info(f"public_id: {request.public_id}")
         logger.info(f"message: {request.message}")
-        logger.info(f"cookies: {request.cookies}")
+        logger.info("cookies: %s", LogPayload(request.cookies))
         logger.info("=== End Request Data ===")
         
 
         public_id = request.public_id
         message = request.message
-        cookies = request.cookies  
-        # print(public_id, message, cookies)
-        # result = True 
-
-        cookies_jar = cookie_extractor_from_json(cookies)
-        linkedin = LinkedinWrapper(dummy_username, dummy_password, cookies=cookies_jar, debug=True)
         try:
-            result = linkedin.add_connection(
+            linkedin = get_request_client(request)
+        except HTTPException as e:
+            if e.status_code != 401:
+                raise
+            # Known-dead cookies: same answer as a failed send, without the LinkedIn round trip
+            return FastJSONResponse(content={
+                "error": e.detail,
+                "result": 'Cookies are invalid'
+            }, media_type="application/json")
+        try:
+            result = await linkedin.add_connection(
                 profile_public_id=public_id,
                 message=message,
             )
 
             if result:
-                return JSONResponse(content={
+                return FastJSONResponse(content={
                     "result": 'Request has already been sent or spam to much'
                     # blasted more than 25 in a row on one day
                 }, media_type="application/json")
             else:
-                return JSONResponse(content={
+                return FastJSONResponse(content={
                     "result": 'Request sent successfully'
                 }, media_type="application/json")
         except Exception as e:
             logger.error(f"Error in send_connection_request: {str(e)}")
             logger.error(f"Traceback: {traceback.format_exc()}")
-            return JSONResponse(content={
+            session = request_session(request)
+            record_rejected_session(session.key)
+            # Only a rejected session costs the pooled client; timeouts and other errors keep it warm
+            client = linkedin_pool.peek(session.key)
+            if client is not None and client.session_invalid:
+                linkedin_pool.evict(session.cookies)
+            return FastJSONResponse(content={
                 "error": str(e),
                 "result": 'Cookies are invalid'
             }, media_type="application/json")
 
 
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in get_company_locations_id: {str(e)}")
         logger.error(f"Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/login-linkedin") # TBD
-async def login_linkedin(request: SendConnectionRequest) -> dict:
-    logger.info(f"Received prompt: {request}")
+async def login_linkedin(request: LoginRequest) -> dict:
+    logger.info("Received prompt: %s", LogPayload(request))
     try:
-        email = request.email
-        password = request.password
-        # public_id = request.public_id
-        # message = request.message
-
-        res = requests.get(
-            f'http://trylisa.vercel.app/chat/api/playwright' +
-            f'?email={email}&password={password}',
-        )
-
-        json_data = res.json()
-
-        print(json_data)
-
-        if 'error' in json_data:
-            print(False)
-            return JSONResponse(content={
-                "error": 'error'
-            }, media_type="application/json")
-        else:
-            print(True)
-            return JSONResponse(content={
-                "result": 'Successfully logged in',
-                'cookies': json_data['cookies']
-            }, media_type="application/json")
+        cookies = await login_provider.login(request.email, request.password)
+        return FastJSONResponse(content={
+            "result": 'Successfully logged in',
+            'cookies': cookies
+        }, media_type="application/json")
 
+    except LoginError as e:
+        logger.info(f"LinkedIn login failed: {str(e)}")
+        return FastJSONResponse(content={
+            "error": 'error'
+        }, media_type="application/json")
     except Exception as e:
-        logger.error(f"Error in get_company_locations_id: {str(e)}")
+        logger.error(f"Error in login_linkedin: {str(e)}")
         logger.error(f"Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/cookie-refresh/run")
+async def run_cookie_refresh() -> dict:
+    # Refresh every server account that is due; meant for a scheduled call
+    if cookie_refresh is None:
+        raise HTTPException(status_code=404, detail="No accounts configured, set LINKEDIN_REFRESH_ACCOUNTS_FILE")
+    refreshed = await cookie_refresh.run_once()
+    return {"status": "success", "refreshed": refreshed, "accounts": cookie_refresh.status()}
+
+@app.get("/cookie-refresh/status")
+async def cookie_refresh_status() -> dict:
+    return {"status": "success", "data": cookie_refresh.status() if cookie_refresh is not None else []}
+
 @app.post("/draft-emails")
 async def draft_emails(request: DraftEmailsRequest):
     async def generate_response():
         start_time = time.time()
         try:
             # Send initial checkpoint
-            yield json.dumps({"status": "started", "message": f"Request received (t=0s)"}) + "\n"
-            yield json.dumps({"status": "started", "message": f"Url List:\n{request.url_list}\n"}) + "\n"
-            yield json.dumps({"status": "started", "message": f"Industry: {request.keyword_industry}\n"}) + "\n"
-            yield json.dumps({"status": "started", "message": f"LinkedIn URL: {request.user_linkedin_url}\n"}) + "\n"
-            yield json.dumps({"status": "started", "message": f"Email Template: {request.email_template}\n"}) + "\n"
+            yield dumps_line({"status": "started", "message": f"Request received (t=0s)"})
+            yield dumps_line({"status": "started", "message": f"Url List:\n{request.url_list}\n"})
+            yield dumps_line({"status": "started", "message": f"Industry: {request.keyword_industry}\n"})
+            yield dumps_line({"status": "started", "message": f"LinkedIn URL: {request.user_linkedin_url}\n"})
+            yield dumps_line({"status": "started", "message": f"Email Template: {request.email_template}\n"})
             
-            logger.info(f"Starting process_data with industry: {request}")
+            logger.info("Starting process_data with industry: %s", LogPayload(request))
             
-            from dotenv import load_dotenv
-            load_dotenv()
-
             # Initialize OpenAI client
-            yield json.dumps({"status": "progress", "message": f"Initializing OpenAI client (t={int(time.time() - start_time)}s)"}) + "\n"
+            yield dumps_line({"status": "progress", "message": f"Initializing OpenAI client (t={int(time.time() - start_time)}s)"})
             logger.info("Initializing OpenAI client")
-            openai_client = AsyncOpenAI(
-                api_key=os.getenv("OPENAI_API_KEY")
-            )
+            dispatcher = get_llm_dispatcher()
 
             # if not hasattr(app.state, 'linkedin_client'):
             #     raise HTTPException(status_code=500, detail="LinkedIn client not initialized")
@@ -656,125 +1075,122 @@ async def draft_emails(request: DraftEmailsRequest):
             # # Use the client from app state
             # linkedin_client = app.state.linkedin_client
 
-            cookies = request.cookies
-            cookies_jar = cookie_extractor_from_json(cookies)
-            linkedin_client = LinkedinWrapper(dummy_username, dummy_password, cookies=cookies_jar, debug=True)
+            linkedin_client = get_request_client(request)
             if not linkedin_client:
                 raise HTTPException(status_code=500, detail="Failed to initialize LinkedIn client")
             
-            yield json.dumps({"status": "progress", "message": f"Starting profile enrichment (t={int(time.time() - start_time)}s)"}) + "\n"
+            yield dumps_line({"status": "progress", "message": f"Starting profile enrichment (t={int(time.time() - start_time)}s)"})
             logger.info(f"Enriching user profile: {request.user_linkedin_url}")
-            user_profile = enrich_person(
+            user_profile = await enrich_profile_async(
                 linkedin=linkedin_client,
                 value=request.user_linkedin_url,
                 url_value=True
             )
+            # Serialized once, shared by every draft
+            user_profile_prompt = user_profile.to_prompt() if user_profile else "{}"
             
             # Get the URNs (first column)
             list_of_urls = request.url_list
             
-            yield json.dumps({"status": "progress", "message": f"Found {len(list_of_urls)} URLs to process, splitting between 1 client(s) (t={int(time.time() - start_time)}s)"}) + "\n"
-            logger.info(f"Found {len(list_of_urls)} URLs to process, splitting {len(list_of_urls)} between clients")
+            account_pool = get_account_pool(request_session(request).cookies, request_cookie_sets(request))
+            yield dumps_line({"status": "progress", "message": f"Found {len(list_of_urls)} URLs to process, splitting between {len(account_pool)} client(s) (t={int(time.time() - start_time)}s)"})
+            logger.info(f"Found {len(list_of_urls)} URLs to process, splitting {len(list_of_urls)} between {len(account_pool)} clients")
             
-            # Create async tasks for both clients
-            logger.info("Starting parallel profile enrichment with both clients")
+            token_usage = TokenUsage() if request.measure_tokens else None
+            legacy_prompt_tokens = 0
+            prompt_tokens = 0
             
-            async def process_client(client, urls, client_name, start_time):
-                results = multi_enrich_persons(
-                    linkedin=client,
-                    values=urls,
-                    url_value=True
+            def measure(candidate_profile):
+                nonlocal legacy_prompt_tokens, prompt_tokens
+                legacy_candidate = candidate_profile.to_api()
+                legacy_candidate.pop("education", None)
+                legacy_messages = legacy_email_messages(user_profile.to_api() if user_profile else {}, legacy_candidate, request.keyword_industry, request.email_template)
+                legacy_prompt_tokens += estimate_tokens({"messages": legacy_messages, "max_tokens": 0})
+                messages = build_email_messages(user_profile_prompt, candidate_profile.to_prompt(exclude=("education",)), request.keyword_industry, request.email_template)
+                prompt_tokens += estimate_tokens({"messages": messages, "max_tokens": 0})
+            
+            async def draft(candidate_profile):
+                if token_usage is not None:
+                    measure(candidate_profile)
+                return await draft_email_async(
+                    dispatcher,
+                    user_profile_prompt,
+                    candidate_profile,
+                    request.keyword_industry,
+                    request.email_template,
+                    exclude=("education",),
+                    usage=token_usage
                 )
-                yield json.dumps({"status": "progress", "message": f"{client_name} enriched {len(results)} profiles (t={int(time.time() - start_time)}s)"}) + "\n"
-                yield results  # Yield the results as the last item
-            
-            # Process URLs with first client
-            logger.info("Starting profile enrichment with client")
-            multi_result_enriched = None
-            async for item in process_client(linkedin_client, list_of_urls, "Client 1", start_time):
-                if isinstance(item, str):  # If it's a progress message
-                    yield item
-                else:  # If it's the results
-                    multi_result_enriched = item
-                    # Remove education from results
-                    for person in multi_result_enriched:
-                        person.pop('education', None)
-                
-            yield json.dumps({"status": "progress", "message": f"Successfully enriched {len(multi_result_enriched)} profiles (t={int(time.time() - start_time)}s)"}) + "\n"
             
-            # Send checkpoint before email drafting
-            yield json.dumps({"status": "drafting", "message": f"Starting email drafting (t={int(time.time() - start_time)}s)"}) + "\n"
-            
-            # Process emails using batch processing
-            logger.info("Starting batch email drafting")
-            
-            all_emails = []
-            total_profiles = len(multi_result_enriched)
-            batch_size = 10
-            
-            for i in range(0, total_profiles, batch_size):
-                batch = multi_result_enriched[i:i + batch_size]
-                current_batch_size = len(batch)
-                logger.info(f"Processing batch {i//batch_size + 1} with {current_batch_size} profiles")
-                yield json.dumps({
-                    "status": "progress", 
-                    "message": f"Processing email batch {i//batch_size + 1}/{(total_profiles + batch_size - 1)//batch_size} (t={int(time.time() - start_time)}s)"
-                }) + "\n"
-                
-                # Create tasks for the batch
-                tasks = []
-                for candidate_profile in batch:
-                    messages = [
-                        {"role": "system", "content": EMAIL_SYSTEM_PROMPT},
-                        {"role": "user", "content": f"""
-                            User Profile:
-                        {json.dumps(user_profile, indent=2)}
-
-                        Candidate Profile:
-                        {json.dumps(candidate_profile, indent=2)}
-
-                        Num: 1
-                        Role: {request.keyword_industry}
-                        Email template:
-                        {request.email_template}
-                        """}
-                    ]
-                    
-                    tasks.append(
-                        openai_client.chat.completions.create(
-                            model="gpt-4o-mini",
-                            messages=messages,
-                            temperature=0.3,
-                            max_tokens=500
-                        )
-                    )
-                
-                # Process batch concurrently
-                batch_responses = await asyncio.gather(*tasks)
-                batch_emails = [response.choices[0].message.content for response in batch_responses]
-                all_emails.extend(batch_emails)
-                
-                logger.info(f"Completed batch {i//batch_size + 1}, total emails: {len(all_emails)}/{total_profiles}")
-                yield json.dumps({
-                    "status": "progress",
-                    "message": f"Completed {len(all_emails)}/{total_profiles} emails (t={int(time.time() - start_time)}s)"
-                }) + "\n"
-            
-            yield json.dumps({"status": "drafting", "message": f"Preparing final CSV (t={int(time.time() - start_time)}s)"}) + "\n"
+            async def draft_pack(candidate_profiles):
+                if token_usage is not None:
+                    for candidate_profile in candidate_profiles:
+                        measure(candidate_profile)
+                return await draft_emails_packed_async(
+                    dispatcher,
+                    user_profile_prompt,
+                    candidate_profiles,
+                    request.keyword_industry,
+                    request.email_template,
+                    exclude=("education",),
+                    token_budget=PACKED_DRAFT_TOKEN_BUDGET,
+                    max_per_pack=request.pack_size,
+                    usage=token_usage
+                )
+            
+            # Each profile is drafted as soon as it is enriched, and each email streamed as it lands
+            logger.info("Starting pipelined enrichment and email drafting")
+            all_emails = [""] * len(list_of_urls)
+            total_profiles = len(list_of_urls)
+            enriched = 0
+            drafted = 0
+            async for event in run_email_pipeline(
+                account_pool,
+                list_of_urls,
+                draft,
+                draft_concurrency=DRAFT_CONCURRENCY,
+                draft_pack=draft_pack if request.pack_size > 1 else None,
+                pack_size=request.pack_size
+            ):
+                elapsed = int(time.time() - start_time)
+                if event.kind == "enriched":
+                    enriched += 1
+                    yield dumps_line({"status": "progress", "message": f"{event.account} enriched {enriched}/{total_profiles} profiles (t={elapsed}s)"})
+                elif event.kind == "enrich_failed":
+                    yield dumps_line({"status": "progress", "message": f"Failed to enrich {event.value}: {event.error} (t={elapsed}s)"})
+                elif event.kind == "account_dropped":
+                    yield dumps_line({"status": "progress", "message": f"Dropped LinkedIn {event.account}: {event.error} (t={elapsed}s)"})
+                else:
+                    drafted += 1
+                    all_emails[event.index] = event.email
+                    yield dumps_line({
+                        "status": "email",
+                        "index": event.index,
+                        "url": event.value,
+                        "email": event.email,
+                        "error": event.error,
+                        "message": f"Completed {drafted}/{total_profiles} emails (t={elapsed}s)"
+                    })
+            
+            logger.info(f"Completed pipeline, total emails: {drafted}/{total_profiles}")
+            if token_usage is not None:
+                yield dumps_line({"status": "progress", "message": "Token usage", "token_usage": token_usage_report(token_usage, drafted, prompt_tokens, legacy_prompt_tokens)})
+            
+            yield dumps_line({"status": "drafting", "message": f"Preparing final CSV (t={int(time.time() - start_time)}s)"})
             
             # Send final CSV data
-            yield json.dumps({
+            yield dumps_line({
                 "status": "completed",
                 "message": f"Process completed (t={int(time.time() - start_time)}s)",
                 "emails": all_emails
-            }) + "\n"
+            })
             
         except Exception as e:
             logger.error(f"Error in process_data: {str(e)}", exc_info=True)
-            yield json.dumps({
+            yield dumps_line({
                 "status": "error",
                 "message": f"Error (t={int(time.time() - start_time)}s): {str(e)}"
-            }) + "\n"
+            })
     
     return StreamingResponse(
         generate_response(),
@@ -785,44 +1201,61 @@ async def draft_emails(request: DraftEmailsRequest):
 async def root():
     return {"message": "AutoMail AI API is running"}
 
+@app.get("/profile-cache/stats")
+async def profile_cache_stats() -> dict:
+    return {"status": "success", "data": get_profile_cache().stats()}
+
+@app.get("/resolution-cache/stats")
+async def resolution_cache_stats() -> dict:
+    return {"status": "success", "data": get_resolution_cache().stats()}
+
+@app.get("/session-store/stats")
+async def session_store_stats() -> dict:
+    return {"status": "success", "data": session_store.stats()}
+
+@app.get("/startup-report")
+async def get_startup_report() -> dict:
+    return {"status": "success", "data": startup_report.to_dict()}
+
+@app.get("/email-format-cache/stats")
+async def email_format_cache_stats() -> dict:
+    return {"status": "success", "data": get_email_format_cache().stats()}
+
+@app.get("/geo-gazetteer/stats")
+async def geo_gazetteer_stats() -> dict:
+    return {"status": "success", "data": {"locations": len(geo_gazetteer)}}
+
 @app.post("/process-data")
 async def process_data(request: ProcessDataRequest):
     async def generate_response():
         start_time = time.time()
         try:
             # Send initial checkpoint
-            yield json.dumps({"status": "started", "message": f"Request received (t=0s)"}) + "\n"
-            yield json.dumps({"status": "started", "message": f"CSV Data:\n{request.csv_data}\n"}) + "\n"
-            yield json.dumps({"status": "started", "message": f"Industry: {request.keyword_industry}\n"}) + "\n"
-            yield json.dumps({"status": "started", "message": f"LinkedIn URL: {request.user_linkedin_url}\n"}) + "\n"
-            yield json.dumps({"status": "started", "message": f"Email Template: {request.email_template}\n"}) + "\n"
+            yield dumps_line({"status": "started", "message": f"Request received (t=0s)"})
+            yield dumps_line({"status": "started", "message": f"CSV Data:\n{request.csv_data}\n"})
+            yield dumps_line({"status": "started", "message": f"Industry: {request.keyword_industry}\n"})
+            yield dumps_line({"status": "started", "message": f"LinkedIn URL: {request.user_linkedin_url}\n"})
+            yield dumps_line({"status": "started", "message": f"Email Template: {request.email_template}\n"})
             
-            logger.info(f"Starting process_data with industry: {request}")
+            logger.info("Starting process_data with industry: %s", LogPayload(request))
             
-            from dotenv import load_dotenv
-            load_dotenv()
-
             # Initialize OpenAI client
-            yield json.dumps({"status": "progress", "message": f"Initializing OpenAI client (t={int(time.time() - start_time)}s)"}) + "\n"
+            yield dumps_line({"status": "progress", "message": f"Initializing OpenAI client (t={int(time.time() - start_time)}s)"})
             logger.info("Initializing OpenAI client")
-            openai_client = AsyncOpenAI(
-                api_key=os.getenv("OPENAI_API_KEY")
-            )
-            cookie_dir = 'custom_lib/'
-
-            if not hasattr(app.state, 'linkedin_client'):
-                raise HTTPException(status_code=500, detail="LinkedIn client not initialized")
-            
-            # Use the client from app state
-            linkedin_client = app.state.linkedin_client
+            dispatcher = get_llm_dispatcher()
+            linkedin_client = get_request_client(request)
+            if not linkedin_client:
+                raise HTTPException(status_code=500, detail="Failed to initialize LinkedIn client")
             
-            yield json.dumps({"status": "progress", "message": f"Starting profile enrichment (t={int(time.time() - start_time)}s)"}) + "\n"
+            yield dumps_line({"status": "progress", "message": f"Starting profile enrichment (t={int(time.time() - start_time)}s)"})
             logger.info(f"Enriching user profile: {request.user_linkedin_url}")
-            user_profile = enrich_person(
+            user_profile = await enrich_profile_async(
                 linkedin=linkedin_client,
                 value=request.user_linkedin_url,
                 url_value=True
             )
+            # Serialized once, shared by every draft
+            user_profile_prompt = user_profile.to_prompt() if user_profile else "{}"
             
             # Parse CSV data
             logger.info("Parsing CSV data")
@@ -832,94 +1265,93 @@ async def process_data(request: ProcessDataRequest):
             # Get the URNs (first column)
             list_of_urls = [row[3] for row in csv_data_list[1:]]  # Skip header
             
-            yield json.dumps({"status": "progress", "message": f"Found {len(list_of_urls)} URLs to process, splitting between 1 client(s) (t={int(time.time() - start_time)}s)"}) + "\n"
-            logger.info(f"Found {len(list_of_urls)} URLs to process, splitting {len(list_of_urls)} between clients")
+            account_pool = get_account_pool(request_session(request).cookies, request_cookie_sets(request))
+            yield dumps_line({"status": "progress", "message": f"Found {len(list_of_urls)} URLs to process, splitting between {len(account_pool)} client(s) (t={int(time.time() - start_time)}s)"})
+            logger.info(f"Found {len(list_of_urls)} URLs to process, splitting {len(list_of_urls)} between {len(account_pool)} clients")
             
-            # Create async tasks for both clients
-            logger.info("Starting parallel profile enrichment with both clients")
+            token_usage = TokenUsage() if request.measure_tokens else None
+            legacy_prompt_tokens = 0
+            prompt_tokens = 0
             
-            async def process_client(client, urls, client_name, start_time):
-                results = multi_enrich_persons(
-                    linkedin=client,
-                    values=urls,
-                    url_value=True
+            def measure(candidate_profile):
+                nonlocal legacy_prompt_tokens, prompt_tokens
+                legacy_candidate = candidate_profile.to_api()
+                legacy_messages = legacy_email_messages(user_profile.to_api() if user_profile else {}, legacy_candidate, request.keyword_industry, request.email_template)
+                legacy_prompt_tokens += estimate_tokens({"messages": legacy_messages, "max_tokens": 0})
+                messages = build_email_messages(user_profile_prompt, candidate_profile.to_prompt(exclude=()), request.keyword_industry, request.email_template)
+                prompt_tokens += estimate_tokens({"messages": messages, "max_tokens": 0})
+            
+            async def draft(candidate_profile):
+                if token_usage is not None:
+                    measure(candidate_profile)
+                return await draft_email_async(
+                    dispatcher,
+                    user_profile_prompt,
+                    candidate_profile,
+                    request.keyword_industry,
+                    request.email_template,
+                    exclude=(),
+                    usage=token_usage
                 )
-                yield json.dumps({"status": "progress", "message": f"{client_name} enriched {len(results)} profiles (t={int(time.time() - start_time)}s)"}) + "\n"
-                yield results  # Yield the results as the last item
             
-            # Process URLs with first client
-            logger.info("Starting profile enrichment with client")
-            multi_result_enriched = None
-            async for item in process_client(linkedin_client, list_of_urls, "Client 1", start_time):
-                if isinstance(item, str):  # If it's a progress message
-                    yield item
-                else:  # If it's the results
-                    multi_result_enriched = item
+            async def draft_pack(candidate_profiles):
+                if token_usage is not None:
+                    for candidate_profile in candidate_profiles:
+                        measure(candidate_profile)
+                return await draft_emails_packed_async(
+                    dispatcher,
+                    user_profile_prompt,
+                    candidate_profiles,
+                    request.keyword_industry,
+                    request.email_template,
+                    exclude=(),
+                    token_budget=PACKED_DRAFT_TOKEN_BUDGET,
+                    max_per_pack=request.pack_size,
+                    usage=token_usage
+                )
             
-            yield json.dumps({"status": "progress", "message": f"Successfully enriched {len(multi_result_enriched)} profiles (t={int(time.time() - start_time)}s)"}) + "\n"
+            # Each profile is drafted as soon as it is enriched, and each email streamed as it lands
+            logger.info("Starting pipelined enrichment and email drafting")
+            all_emails = [""] * len(list_of_urls)
+            total_profiles = len(list_of_urls)
+            enriched = 0
+            drafted = 0
+            async for event in run_email_pipeline(
+                account_pool,
+                list_of_urls,
+                draft,
+                draft_concurrency=DRAFT_CONCURRENCY,
+                draft_pack=draft_pack if request.pack_size > 1 else None,
+                pack_size=request.pack_size
+            ):
+                elapsed = int(time.time() - start_time)
+                if event.kind == "enriched":
+                    enriched += 1
+                    yield dumps_line({"status": "progress", "message": f"{event.account} enriched {enriched}/{total_profiles} profiles (t={elapsed}s)"})
+                elif event.kind == "enrich_failed":
+                    yield dumps_line({"status": "progress", "message": f"Failed to enrich {event.value}: {event.error} (t={elapsed}s)"})
+                elif event.kind == "account_dropped":
+                    yield dumps_line({"status": "progress", "message": f"Dropped LinkedIn {event.account}: {event.error} (t={elapsed}s)"})
+                else:
+                    drafted += 1
+                    all_emails[event.index] = event.email
+                    yield dumps_line({
+                        "status": "email",
+                        "index": event.index,
+                        "url": event.value,
+                        "email": event.email,
+                        "error": event.error,
+                        "message": f"Completed {drafted}/{total_profiles} emails (t={elapsed}s)"
+                    })
             
-            # Send checkpoint before email drafting
-            yield json.dumps({"status": "drafting", "message": f"Starting email drafting (t={int(time.time() - start_time)}s)"}) + "\n"
-            
-            # Process emails using batch processing
-            logger.info("Starting batch email drafting")
-            
-            all_emails = []
-            total_profiles = len(multi_result_enriched)
-            batch_size = 10
-            
-            for i in range(0, total_profiles, batch_size):
-                batch = multi_result_enriched[i:i + batch_size]
-                current_batch_size = len(batch)
-                logger.info(f"Processing batch {i//batch_size + 1} with {current_batch_size} profiles")
-                yield json.dumps({
-                    "status": "progress", 
-                    "message": f"Processing email batch {i//batch_size + 1}/{(total_profiles + batch_size - 1)//batch_size} (t={int(time.time() - start_time)}s)"
-                }) + "\n"
-                
-                # Create tasks for the batch
-                tasks = []
-                for candidate_profile in batch:
-                    messages = [
-                        {"role": "system", "content": EMAIL_SYSTEM_PROMPT},
-                        {"role": "user", "content": f"""
-                            User Profile:
-                        {json.dumps(user_profile, indent=2)}
-
-                        Candidate Profile:
-                        {json.dumps(candidate_profile, indent=2)}
-
-                        Num: 1
-                        Role: {request.keyword_industry}
-                        Email template:
-                        {request.email_template}
-                        """}
-                    ]
-                    
-                    tasks.append(
-                        openai_client.chat.completions.create(
-                            model="gpt-4o-mini",
-                            messages=messages,
-                            temperature=0.3,
-                            max_tokens=500
-                        )
-                    )
-                
-                # Process batch concurrently
-                batch_responses = await asyncio.gather(*tasks)
-                batch_emails = [response.choices[0].message.content for response in batch_responses]
-                all_emails.extend(batch_emails)
-                
-                logger.info(f"Completed batch {i//batch_size + 1}, total emails: {len(all_emails)}/{total_profiles}")
-                yield json.dumps({
-                    "status": "progress",
-                    "message": f"Completed {len(all_emails)}/{total_profiles} emails (t={int(time.time() - start_time)}s)"
-                }) + "\n"
+            logger.info(f"Completed pipeline, total emails: {drafted}/{total_profiles}")
+            if token_usage is not None:
+                yield dumps_line({"status": "progress", "message": "Token usage", "token_usage": token_usage_report(token_usage, drafted, prompt_tokens, legacy_prompt_tokens)})
             
             emails = all_emails
             
             # Send checkpoint before email drafting
-            yield json.dumps({"status": "drafting", "message": f"Adding enriched data to CSV (t={int(time.time() - start_time)}s)"}) + "\n"
+            yield dumps_line({"status": "drafting", "message": f"Adding enriched data to CSV (t={int(time.time() - start_time)}s)"})
             
             # Add enriched data to CSV
             logger.info("Adding enriched data to CSV")
@@ -927,7 +1359,7 @@ async def process_data(request: ProcessDataRequest):
                 email_data = emails[i]
                 csv_data_list[i+1][6] = email_data
             
-            yield json.dumps({"status": "drafting", "message": f"Preparing final CSV (t={int(time.time() - start_time)}s)"}) + "\n"
+            yield dumps_line({"status": "drafting", "message": f"Preparing final CSV (t={int(time.time() - start_time)}s)"})
             
             # Prepare final CSV response
             output_csv = StringIO()
@@ -935,18 +1367,18 @@ async def process_data(request: ProcessDataRequest):
             csv_writer.writerows(csv_data_list)
             
             # Send final CSV data
-            yield json.dumps({
+            yield dumps_line({
                 "status": "completed",
                 "message": f"Process completed (t={int(time.time() - start_time)}s)",
                 "csv_data": output_csv.getvalue()
-            }) + "\n"
+            })
             
         except Exception as e:
             logger.error(f"Error in process_data: {str(e)}", exc_info=True)
-            yield json.dumps({
+            yield dumps_line({
                 "status": "error",
                 "message": f"Error (t={int(time.time() - start_time)}s): {str(e)}"
-            }) + "\n"
+            })
     
     return StreamingResponse(
         generate_response(),
@@ -956,3 +1388,5 @@ async def process_data(request: ProcessDataRequest):
 @app.get("/")
 async def root():
     return {"message": "Lisa AI Model is running"}
+
+startup_report.finish()
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import asyncio
+import glob
+import json
+import logging
+import os
+from collections import deque
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from custom_lib.automail_ai_craft import EnrichmentResult, enrich_person_async
+from custom_lib.client_pool import cookie_set_key
+from custom_lib.linkedin_errors import ChallengeException, ThrottledException, UnauthorizedException
+
+if TYPE_CHECKING:
+    from custom_lib.linkedin_wrapper_async import LinkedinWrapperAsync
+
+logger = logging.getLogger(__name__)
+
+# Errors that say the account is unusable, not that the profile is bad
+ACCOUNT_ERRORS = (UnauthorizedException, ChallengeException, ThrottledException)
+
+
+def load_cookie_sets(cookies_dir: str) -> List[List[Dict[str, Any]]]:
+    """
+    Load every cookie file (*.json, list of cookie dicts) from a directory.
+
+    Args:
+        cookies_dir: Directory holding one cookie export per LinkedIn account
+
+    Returns:
+        List of cookie sets, unreadable files are skipped
+    """
+    cookie_sets = []
+    for path in sorted(glob.glob(os.path.join(cookies_dir, "*.json"))):
+        try:
+            with open(path, "r") as f:
+                cookies = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Skipping cookie file %s: %s", path, str(e))
+            continue
+        if isinstance(cookies, list) and cookies:
+            cookie_sets.append(cookies)
+    logger.info("Loaded %d cookie set(s) from %s", len(cookie_sets), cookies_dir)
+    return cookie_sets
+
+
+def unique_cookie_sets(cookie_sets: List[List[Dict[str, Any]]]) -> List[List[Dict[str, Any]]]:
+    """Drop cookie sets that point at the same LinkedIn session, keeping the first."""
+    seen = set()
+    unique = []
+    for cookies in cookie_sets:
+        key = cookie_set_key(cookies)
+        if key not in seen:
+            seen.add(key)
+            unique.append(cookies)
+    return unique
+
+
+class _Account:
+    __slots__ = ("name", "client", "queue", "dropped")
+
+    def __init__(self, name: str, client: LinkedinWrapperAsync):
+        self.name = name
+        self.client = client
+        self.queue: Deque[Tuple[int, str]] = deque()
+        self.dropped: Optional[str] = None
+
+
+class AccountPool:
+    """
+    Shards a profile list across several LinkedIn accounts.
+
+    Each account starts with an even share of the work and runs up to
+    max_concurrency fetches at once (its own rate_limiter still applies). An
+    account that runs dry steals from the back of the busiest queue, and an
+    account that gets throttled or logged out is dropped: the profile it was
+    working on goes back to the other accounts instead of failing.
+    """
+
+    def __init__(self, clients: List[LinkedinWrapperAsync], max_concurrency: int = 5):
+        if not clients:
+            raise ValueError("AccountPool needs at least one client")
+        self.accounts = [_Account(f"account {i + 1}", client) for i, client in enumerate(clients)]
+        self.max_concurrency = max_concurrency
+
+    def __len__(self) -> int:
+        return len(self.accounts)
+
+    @property
+    def active_accounts(self) -> List[_Account]:
+        return [account for account in self.accounts if account.dropped is None]
+
+    @property
+    def dropped_accounts(self) -> List[_Account]:
+        return [account for account in self.accounts if account.dropped is not None]
+
+    def _next_item(self, account: _Account) -> Optional[Tuple[int, str]]:
+        if account.queue:
+            return account.queue.popleft()
+        # Work stealing: take from the tail of the longest queue still being worked
+        victims = [other for other in self.active_accounts if other.queue]
+        if not victims:
+            # Queues left by dropped accounts are fair game too
+            victims = [other for other in self.accounts if other.queue]
+        if not victims:
+            return None
+        return max(victims, key=lambda other: len(other.queue)).queue.pop()
+
+    def _drop(self, account: _Account, reason: str):
+        if account.dropped is None:
+            account.dropped = reason
+            logger.warning("Dropping LinkedIn %s: %s", account.name, reason)
+
+    async def iter_enrich(
+        self,
+        values: List[str],
+        url_value: bool = False,
+        enrich: Callable[..., Awaitable[dict]] = enrich_person_async
+    ) -> AsyncIterator[EnrichmentResult]:
+        """
+        Enrich profiles across all accounts, yielding results as they complete.
+
+        Args:
+            values: Profile URLs or URN IDs
+            url_value: Whether values are profile URLs
+            enrich: Per-profile coroutine, enrich_person_async by default
+
+        Yields:
+            EnrichmentResult in completion order, carrying its input index and account
+        """
+        for index, value in enumerate(values):
+            self.accounts[index % len(self.accounts)].queue.append((index, value))
+        results: "asyncio.Queue[EnrichmentResult]" = asyncio.Queue()
+
+        async def worker(account: _Account):
+            while account.dropped is None:
+                item = self._next_item(account)
+                if item is None:
+                    return
+                index, value = item
+                try:
+                    profile = await enrich(account.client, value, url_value)
+                except ACCOUNT_ERRORS as e:
+                    self._drop(account, f"{type(e).__name__}: {str(e)}")
+                    # Hand the profile to whoever is still up
+                    account.queue.appendleft(item)
+                    return
+                except Exception as e:
+                    logger.error("Failed to enrich %s: %s", value, str(e))
+                    await results.put(EnrichmentResult(index, value, {}, str(e), account.name))
+                    continue
+                await results.put(EnrichmentResult(index, value, profile, None, account.name))
+
+        async def run_workers():
+            # Loop again if an account was dropped after the others had already run dry
+            while self.active_accounts and any(account.queue for account in self.accounts):
+                await asyncio.gather(*(
+                    worker(account) for account in self.active_accounts for _ in range(self.max_concurrency)
+                ))
+            # Every account was dropped: report what is left instead of hanging
+            for account in self.accounts:
+                while account.queue:
+                    index, value = account.queue.popleft()
+                    await results.put(EnrichmentResult(index, value, {}, "No LinkedIn account available"))
+
+        runner = asyncio.create_task(run_workers())
+        try:
+            for _ in range(len(values)):
+                yield await results.get()
+        finally:
+            runner.cancel()
@@ -1,11 +1,30 @@
-from typing import List, Tuple, Optional
-from custom_lib.linkedin_wrapper import LinkedinWrapper
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable, List, Tuple, Optional, Union
+from dataclasses import dataclass
+from custom_lib.profile_model import Education, Experience, Personal, Profile
 import logging
 import json
 import os
-from openai import OpenAI
+from custom_lib.llm_dispatcher import CHARS_PER_TOKEN, LLMDispatcher, TokenUsage
 import asyncio
 
+# Type-only: the LinkedIn clients and OpenAI pull in heavy dependencies at import time
+if TYPE_CHECKING:
+    from openai import OpenAI
+    from custom_lib.linkedin_wrapper import LinkedinWrapper
+    from custom_lib.linkedin_wrapper_async import LinkedinWrapperAsync
+
+def __getattr__(name: str):
+    # Scripts still do `from custom_lib.automail_ai_craft import LinkedinWrapper`
+    if name == "LinkedinWrapper":
+        from custom_lib.linkedin_wrapper import LinkedinWrapper
+        return LinkedinWrapper
+    if name == "LinkedinWrapperAsync":
+        from custom_lib.linkedin_wrapper_async import LinkedinWrapperAsync
+        return LinkedinWrapperAsync
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Configure logging
 logging.basicConfig(
@@ -16,15 +35,11 @@ logger = logging.getLogger(__name__)
 
 from prompt.email import EMAIL_SYSTEM_PROMPT, EMAIL_TEMPLATE
 
-# function to enrich each person in a json, toggle for urn_id or url
-def enrich_person(
-    linkedin: LinkedinWrapper,
-    value: str,
-    url_value: bool = False
-) -> dict:
-    logger.info("Starting profile enrichment for value: %s (url_value=%s)", value, url_value)
-    
-    # Create a cleaned person dictionary with relevant fields
+# Profile sections read by clean_person / clean_person_more, see PROFILE_SECTIONS
+ENRICH_SECTIONS = ("experience", "education")
+ENRICH_MORE_SECTIONS = ("experience", "education", "skills")
+
+def _profile_id_from_value(value: str, url_value: bool) -> str:
     if url_value:
         url = value.split('?')[0].rstrip('/')
         id = url.split('/')[-1]
@@ -32,76 +47,131 @@ def enrich_person(
     else:
         id = value
         logger.info("Extracting profile using urn_id: %s", value)
-    
-    person = linkedin.get_profile(id)
+    return id
+
+def _get_urn_from_school_urn_list(raw_string: str) -> str:
+    """
+    Return the URN of a raw group update
+
+    Example: urn:li:fs_miniProfile:<id>
+    Example: urn:li:fs_updateV2:(<urn>,GROUP_FEED,EMPTY,DEFAULT,false)
+    """
+    string = raw_string.split("(")[1].split(",")[1]
+    return string[:len(string)-1]
+
+def person_to_profile(person: dict, value: str, url_value: bool = False, more: bool = False) -> Optional[Profile]:
+    """
+    Reduce a get_profile result to the fields used for search and drafting.
+
+    Args:
+        person: Profile dict from get_profile
+        value: Profile URL or URN ID the profile was requested with (for logging)
+        url_value: Identify the profile by public_id instead of profile_urn
+        more: Also keep skills and company public ids (enrich_person_more)
+
+    Returns:
+        Profile, or None when LinkedIn returned nothing
+    """
     if not person:
         logger.warning("No profile data returned for value: %s", value)
-        return {}
+        return None
     
     logger.info("Successfully retrieved profile for %s %s", 
                 person.get("firstName", "Unknown"), 
                 person.get("lastName", "Unknown"))
     
-    cleaned_person = {
-        "personal": {
-            "first_name": person.get("firstName"),
-            "last_name": person.get("lastName"),
-            "headline": person.get("headline"),
-            "location": person.get("locationName"),
-            "city": person.get("geoLocationName"),
-            "industry": person.get("industryName")
-        },
-        "experiences": [],
-        "education": []
-    }
+    profile = Profile(
+        personal=Personal(
+            first_name=person.get("firstName"),
+            last_name=person.get("lastName"),
+            headline=person.get("headline"),
+            location=person.get("locationName"),
+            city=person.get("geoLocationName"),
+            industry=person.get("industryName")
+        ),
+        skills=[skill['name'] for skill in person.get("skills", [])] if more else None
+    )
     
     # Add experiences
     experience_count = len(person.get("experience", []))
     logger.info("Processing %d experiences", experience_count)
     for exp in person.get("experience", []):
-        cleaned_exp = {
-            "title": exp.get("title"),
-            "company": exp.get("companyName"),
-            "description": exp.get("description"),
-            "start_date": exp.get("startDate"),
-            "end_date": exp.get("endDate")
-        }
-        cleaned_person["experiences"].append(cleaned_exp)
-    
-    def get_urn_from_school_urn_list(raw_string: str) -> str:
-        """
-        Return the URN of a raw group update
-
-        Example: urn:li:fs_miniProfile:<id>
-        Example: urn:li:fs_updateV2:(<urn>,GROUP_FEED,EMPTY,DEFAULT,false)
-        """
-        string = raw_string.split("(")[1].split(",")[1]
-        return string[:len(string)-1]
+        profile.experiences.append(Experience(
+            title=exp.get("title"),
+            company=exp.get("companyName"),
+            description=exp.get("description"),
+            start_date=exp.get("startDate"),
+            end_date=exp.get("endDate"),
+            company_public_id=exp.get("companyPublicId") if more else None
+        ))
     
     # Add education
     education_count = len(person.get("education", []))
     logger.info("Processing %d education entries", education_count)
     for edu in person.get("education", []):
-        cleaned_edu = {
-            "school_urn_id": get_urn_from_school_urn_list(edu.get("entityUrn")),
-            "school": edu.get("schoolName"),
-            "activities": edu.get("activities"),
-            "grade": edu.get("grade"),
-            "start_date": edu.get("timePeriod", {}).get("startDate"),
-            "end_date": edu.get("timePeriod", {}).get("endDate")
-        }
-        cleaned_person["education"].append(cleaned_edu)
+        profile.education.append(Education(
+            school=edu.get("schoolName"),
+            activities=edu.get("activities"),
+            grade=edu.get("grade"),
+            start_date=edu.get("timePeriod", {}).get("startDate"),
+            end_date=edu.get("timePeriod", {}).get("endDate"),
+            school_urn_id=None if more else _get_urn_from_school_urn_list(edu.get("entityUrn"))
+        ))
     
     # Add identifier based on parameter
     if url_value:
-        cleaned_person["id"] = person.get("public_id")
+        profile.id = person.get("public_id")
         logger.info("Added public_id to profile")
     else:
-        cleaned_person["id"] = person.get("profile_urn")
+        profile.id = person.get("profile_urn")
         logger.info("Added profile_urn to profile")
     
     logger.info("Successfully enriched profile data")
-    return cleaned_person
+    return profile
+
+def clean_person(person: dict, value: str, url_value: bool = False) -> dict:
+    """
+    Reduce a get_profile result to the API dict used for search and drafting.
+    """
+    profile = person_to_profile(person, value, url_value)
+    return profile.to_api() if profile else {}
+
+# function to enrich each person in a json, toggle for urn_id or url
+def enrich_person(
+    linkedin: LinkedinWrapper,
+    value: str,
+    url_value: bool = False,
+    sections: Iterable[str] = ENRICH_SECTIONS
+) -> dict:
+    logger.info("Starting profile enrichment for value: %s (url_value=%s)", value, url_value)
+    id = _profile_id_from_value(value, url_value)
+    person = linkedin.get_profile(id, sections=sections)
+    return clean_person(person, value, url_value)
+
+async def enrich_person_async(
+    linkedin: LinkedinWrapperAsync,
+    value: str,
+    url_value: bool = False,
+    sections: Iterable[str] = ENRICH_SECTIONS
+) -> dict:
+    logger.info("Starting profile enrichment for value: %s (url_value=%s)", value, url_value)
+    id = _profile_id_from_value(value, url_value)
+    person = await linkedin.get_profile(id, sections=sections)
+    return clean_person(person, value, url_value)
+
+async def enrich_profile_async(
+    linkedin: LinkedinWrapperAsync,
+    value: str,
+    url_value: bool = False,
+    sections: Iterable[str] = ENRICH_SECTIONS
+) -> Optional[Profile]:
+    """
+    Like enrich_person_async, returning a Profile instead of the API dict.
+    """
+    logger.info("Starting profile enrichment for value: %s (url_value=%s)", value, url_value)
+    id = _profile_id_from_value(value, url_value)
+    person = await linkedin.get_profile(id, sections=sections)
+    return person_to_profile(person, value, url_value)
 
 def multi_enrich_persons(
     linkedin: LinkedinWrapper,
@@ -110,68 +180,281 @@ def multi_enrich_persons(
 ) -> List[dict]:
     return [enrich_person(linkedin, value, url_value) for value in values]
 
+@dataclass
+class EnrichmentResult:
+    index: int
+    value: str
+    profile: Union[dict, Profile]
+    error: Optional[str] = None
+    account: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+def _profile_prompt(profile: Union[dict, Profile]) -> str:
+    if isinstance(profile, Profile):
+        return profile.to_prompt()
+    return json.dumps(profile, separators=(",", ":"), ensure_ascii=False)
+
 async def draft_emails_batch(
-    openai: OpenAI,
-    user_profile: dict,
-    candidate_profiles: List[dict],
+    dispatcher: LLMDispatcher,
+    user_profile: Union[dict, Profile],
+    candidate_profiles: List[Union[dict, Profile]],
     keyword_industry: str,
     email_template: str,
-    batch_size: int = 5
+    max_per_pack: int = 1
 ) -> List[str]:
-    async def process_batch(batch):
-        tasks = []
-        for candidate_profile in batch:
-            messages = [
-                {"role": "system", "content": EMAIL_SYSTEM_PROMPT},
-                {"role": "user", "content": f"""
-                        User Profile:
-                {json.dumps(user_profile, indent=2)}
-
-                Candidate Profile:
-                {json.dumps(candidate_profile, indent=2)}
-
-                Num: 1
-                Role: {keyword_industry}
-                Email template:
-                {email_template}
-                """}
-            ]
-            
-            tasks.append(
-                openai.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=messages,
-                    temperature=0.7,
-                    max_tokens=500
-                )
-            )
-        
-        responses = await asyncio.gather(*tasks)
-        return [response.choices[0].message.content for response in responses]
-
-    all_emails = []
-    for i in range(0, len(candidate_profiles), batch_size):
-        batch = candidate_profiles[i:i + batch_size]
-        emails = await process_batch(batch)
-        all_emails.extend(emails)
-    
-    return all_emails
+    """
+    Draft one email per candidate through the dispatcher's sliding window. Order follows candidate_profiles.
+
+    With max_per_pack > 1 (Profile candidates only), up to that many
+    candidates share a completion, see draft_emails_packed_async.
+    """
+    user_profile_prompt = _profile_prompt(user_profile)
+    if max_per_pack > 1:
+        return await draft_emails_packed_async(
+            dispatcher,
+            user_profile_prompt,
+            candidate_profiles,
+            keyword_industry,
+            email_template,
+            max_per_pack=max_per_pack,
+            temperature=0.7
+        )
+    return await dispatcher.map(
+        dict(
+            model="gpt-4o-mini",
+            messages=build_email_messages(
+                user_profile_prompt,
+                _profile_prompt(candidate_profile),
+                keyword_industry,
+                email_template
+            ),
+            temperature=0.7,
+            max_tokens=500
+        )
+        for candidate_profile in candidate_profiles
+    )
 
-def draft_email(
-    openai: OpenAI,
-    user_profile: dict,
-    candidate_profile: dict,
+def build_email_messages(
+    user_profile_prompt: str,
+    candidate_profile_prompt: str,
     keyword_industry: str,
     email_template: str
-) -> str:
-    messages = [
+) -> List[dict]:
+    """
+    Build the drafting messages with every request-wide part first.
+
+    The system prompt, user profile, role and template are byte-identical for
+    all candidates of a request, so the provider can serve that prefix from
+    its prompt cache; only the trailing candidate profile changes.
+    """
+    return [
+        {"role": "system", "content": EMAIL_SYSTEM_PROMPT},
+        {"role": "user", "content": (
+            f"User Profile:\n{user_profile_prompt}\n\n"
+            f"Role: {keyword_industry}\n"
+            f"Email template:\n{email_template}\n\n"
+            f"Num: 1\n"
+            f"Candidate Profile:\n{candidate_profile_prompt}"
+        )}
+    ]
+
+# Output tokens reserved per email when packing several candidates into one completion
+EMAIL_OUTPUT_TOKENS = 500
+
+PACKED_EMAIL_INSTRUCTIONS = """Write one email for EACH candidate above, following the same rules as for a single candidate.
+Return ONLY a JSON array with one object per candidate, in any order: [{"id": "<candidate id>", "email": "<email text>"}]
+Do not include any explanations or additional text."""
+
+def build_packed_email_messages(
+    user_profile_prompt: str,
+    candidate_prompts: List[Tuple[str, str]],
+    keyword_industry: str,
+    email_template: str
+) -> List[dict]:
+    """
+    Like build_email_messages for several candidates at once.
+
+    Args:
+        candidate_prompts: (candidate id, serialized profile) pairs
+    """
+    candidates = "\n".join(f"Candidate {candidate_id}:\n{prompt}" for candidate_id, prompt in candidate_prompts)
+    return [
+        {"role": "system", "content": EMAIL_SYSTEM_PROMPT},
+        {"role": "user", "content": (
+            f"User Profile:\n{user_profile_prompt}\n\n"
+            f"Role: {keyword_industry}\n"
+            f"Email template:\n{email_template}\n\n"
+            f"Num: {len(candidate_prompts)}\n"
+            f"{candidates}\n\n"
+            f"{PACKED_EMAIL_INSTRUCTIONS}"
+        )}
+    ]
+
+def parse_packed_emails(content: str, candidate_ids: Iterable[str]) -> dict:
+    """
+    Validate a packed drafting response.
+
+    Returns:
+        Mapping of candidate id to email for every well formed item; unknown
+        ids, duplicates and empty emails are dropped so callers can fall back
+        for whatever is missing.
+    """
+    json_str = content.strip()
+    if "```json" in json_str:
+        json_str = json_str.split("```json")[1].split("```")[0].strip()
+    elif "```" in json_str:
+        json_str = json_str.split("```")[1].strip()
+    try:
+        items = json.loads(json_str)
+    except ValueError:
+        logger.warning("Packed drafting response is not valid JSON")
+        return {}
+    if not isinstance(items, list):
+        return {}
+
+    wanted = set(candidate_ids)
+    emails = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        candidate_id, email = str(item.get("id", "")), item.get("email")
+        if candidate_id in wanted and candidate_id not in emails and isinstance(email, str) and email.strip():
+            emails[candidate_id] = email
+    return emails
+
+def plan_candidate_packs(candidate_prompts: List[str], token_budget: int, max_per_pack: int = 8) -> List[List[int]]:
+    """
+    Group candidates into packs whose estimated candidate + output tokens fit token_budget.
+
+    The shared prefix is not counted: it is the same for every pack.
+
+    Returns:
+        Lists of indices into candidate_prompts, in order
+    """
+    packs = []
+    current, current_tokens = [], 0
+    for index, prompt in enumerate(candidate_prompts):
+        tokens = len(prompt) // CHARS_PER_TOKEN + EMAIL_OUTPUT_TOKENS
+        if current and (current_tokens + tokens > token_budget or len(current) >= max_per_pack):
+            packs.append(current)
+            current, current_tokens = [], 0
+        current.append(index)
+        current_tokens += tokens
+    if current:
+        packs.append(current)
+    return packs
+
+async def draft_emails_packed_async(
+    dispatcher: LLMDispatcher,
+    user_profile_prompt: str,
+    candidate_profiles: List[Profile],
+    keyword_industry: str,
+    email_template: str,
+    exclude: Iterable[str] = (),
+    token_budget: int = 6000,
+    max_per_pack: int = 8,
+    temperature: float = 0.3,
+    usage: Optional[TokenUsage] = None
+) -> List[str]:
+    """
+    Draft emails for several candidates with as few completions as the token budget allows.
+
+    Candidates are packed into completions that return a JSON array of
+    emails keyed by candidate id. Any candidate missing from a pack's
+    response (bad JSON, dropped item, failed call) is redrafted on its own
+    with draft_email_async.
+
+    Args:
+        dispatcher: Shared LLMDispatcher
+        user_profile_prompt: Sender profile, already serialized with Profile.to_prompt
+        candidate_profiles: Candidates to write to
+        keyword_industry: Role the sender is reaching out about
+        email_template: Template the drafts must follow
+        exclude: Candidate sections left out of the prompt
+        token_budget: Estimated candidate + output tokens allowed per completion
+        max_per_pack: Upper bound on candidates per completion
+        usage: Optional TokenUsage to record token counts into
+
+    Returns:
+        Emails in the same order as candidate_profiles
+    """
+    exclude = tuple(exclude)
+    candidate_prompts = [profile.to_prompt(exclude=exclude) for profile in candidate_profiles]
+    packs = plan_candidate_packs(candidate_prompts, token_budget, max_per_pack)
+
+    async def draft_pack(pack: List[int]) -> dict:
+        if len(pack) == 1:
+            return {}
+        messages = build_packed_email_messages(
+            user_profile_prompt,
+            [(f"c{index}", candidate_prompts[index]) for index in pack],
+            keyword_industry,
+            email_template
+        )
+        content = await dispatcher.complete(
+            usage=usage,
+            model="gpt-4o-mini",
+            messages=messages,
+            temperature=temperature,
+            max_tokens=EMAIL_OUTPUT_TOKENS * len(pack)
+        )
+        return parse_packed_emails(content, (f"c{index}" for index in pack))
+
+    pack_results = await asyncio.gather(*(draft_pack(pack) for pack in packs), return_exceptions=True)
+
+    emails: List[Optional[str]] = [None] * len(candidate_profiles)
+    for pack, result in zip(packs, pack_results):
+        if isinstance(result, Exception):
+            logger.warning("Packed drafting failed for %d candidates: %s", len(pack), str(result))
+            continue
+        for index in pack:
+            emails[index] = result.get(f"c{index}")
+
+    missing = [index for index, email in enumerate(emails) if email is None]
+    if missing:
+        logger.info("Drafting %d candidates individually", len(missing))
+        fallbacks = await asyncio.gather(*(
+            draft_email_async(
+                dispatcher,
+                user_profile_prompt,
+                candidate_profiles[index],
+                keyword_industry,
+                email_template,
+                exclude=exclude,
+                temperature=temperature,
+                usage=usage
+            )
+            for index in missing
+        ))
+        for index, email in zip(missing, fallbacks):
+            emails[index] = email
+    return emails
+
+def legacy_email_messages(
+    user_profile: Union[dict, Profile],
+    candidate_profile: Union[dict, Profile],
+    keyword_industry: str,
+    email_template: str
+) -> List[dict]:
+    """
+    Drafting messages in the original per-candidate layout (indented JSON, candidate first).
+
+    Only used to measure prompt size against build_email_messages.
+    """
+    def indented(profile):
+        return json.dumps(profile.to_api() if isinstance(profile, Profile) else profile, indent=2)
+
+    return [
         {"role": "system", "content": EMAIL_SYSTEM_PROMPT},
         {"role": "user", "content": f"""
                 User Profile:
-        {json.dumps(user_profile, indent=2)}
+        {indented(user_profile)}
 
         Candidate Profile:
-        {json.dumps(candidate_profile, indent=2)}
+        {indented(candidate_profile)}
 
         Num: 1
         Role: {keyword_industry}
@@ -179,6 +462,59 @@ def draft_email(
         {email_template}
         """}
     ]
+
+async def draft_email_async(
+    dispatcher: LLMDispatcher,
+    user_profile_prompt: str,
+    candidate_profile: Profile,
+    keyword_industry: str,
+    email_template: str,
+    exclude: Iterable[str] = (),
+    temperature: float = 0.3,
+    usage: Optional[TokenUsage] = None
+) -> str:
+    """
+    Draft one email for a candidate.
+
+    Args:
+        dispatcher: Shared LLMDispatcher
+        user_profile_prompt: Sender profile, already serialized with Profile.to_prompt
+        candidate_profile: Candidate to write to
+        keyword_industry: Role the sender is reaching out about
+        email_template: Template the draft must follow
+        exclude: Candidate sections left out of the prompt
+        usage: Optional TokenUsage to record the response's token counts into
+
+    Returns:
+        Drafted email text
+    """
+    messages = build_email_messages(
+        user_profile_prompt,
+        candidate_profile.to_prompt(exclude=exclude),
+        keyword_industry,
+        email_template
+    )
+    return await dispatcher.complete(
+        usage=usage,
+        model="gpt-4o-mini",
+        messages=messages,
+        temperature=temperature,
+        max_tokens=500
+    )
+
+def draft_email(
+    openai: OpenAI,
+    user_profile: Union[dict, Profile],
+    candidate_profile: Union[dict, Profile],
+    keyword_industry: str,
+    email_template: str
+) -> str:
+    messages = build_email_messages(
+        _profile_prompt(user_profile),
+        _profile_prompt(candidate_profile),
+        keyword_industry,
+        email_template
+    )
     
     response = openai.chat.completions.create(
         model="gpt-4o-mini",
@@ -189,83 +525,34 @@ def draft_email(
 
     return response.choices[0].message.content  
 
+def clean_person_more(person: dict, value: str, url_value: bool = False) -> dict:
+    """
+    Like clean_person, with skills and company public ids for the profile view.
+    """
+    profile = person_to_profile(person, value, url_value, more=True)
+    return profile.to_api() if profile else {}
+
 def enrich_person_more(
     linkedin: LinkedinWrapper,
     value: str,
-    url_value: bool = False
+    url_value: bool = False,
+    sections: Iterable[str] = ENRICH_MORE_SECTIONS
 ) -> dict:
     logger.info("Starting profile enrichment for value: %s (url_value=%s)", value, url_value)
-    
-    # Create a cleaned person dictionary with relevant fields
-    if url_value:
-        url = value.split('?')[0].rstrip('/')
-        id = url.split('/')[-1]
-        logger.info("Extracting profile using public_id: %s", id)
-    else:
-        id = value
-        logger.info("Extracting profile using urn_id: %s", value)
-    
-    person = linkedin.get_profile(id)
+    id = _profile_id_from_value(value, url_value)
+    person = linkedin.get_profile(id, sections=sections)
+    return clean_person_more(person, value, url_value)
 
-    if not person:
-        logger.warning("No profile data returned for value: %s", value)
-        return {}
-    
-    logger.info("Successfully retrieved profile for %s %s", 
-                person.get("firstName", "Unknown"), 
-                person.get("lastName", "Unknown"))
-    
-    cleaned_person = {
-        "personal": {
-            "first_name": person.get("firstName"),
-            "last_name": person.get("lastName"),
-            "headline": person.get("headline"),
-            "location": person.get("locationName"),
-            "city": person.get("geoLocationName"),
-            "industry": person.get("industryName")
-        },
-        "experiences": [],
-        "education": [],
-        "skills": [skill['name'] for skill in person.get("skills", [])]
-    }
-    
-    # Add experiences
-    experience_count = len(person.get("experience", []))
-    logger.info("Processing %d experiences", experience_count)
-    for exp in person.get("experience", []):
-        cleaned_exp = {
-            "title": exp.get("title"),
-            "company": exp.get("companyName"),
-            "company_public_id": exp.get("companyPublicId"),
-            "description": exp.get("description"),
-            "start_date": exp.get("startDate"),
-            "end_date": exp.get("endDate")
-        }
-        cleaned_person["experiences"].append(cleaned_exp)
-    
-    # Add education
-    education_count = len(person.get("education", []))
-    logger.info("Processing %d education entries", education_count)
-    for edu in person.get("education", []):
-        cleaned_edu = {
-            "school": edu.get("schoolName"),
-            "activities": edu.get("activities"),
-            "grade": edu.get("grade"),
-            "start_date": edu.get("timePeriod", {}).get("startDate"),
-            "end_date": edu.get("timePeriod", {}).get("endDate")
-        }
-        cleaned_person["education"].append(cleaned_edu)
-    
-    # Add identifier based on parameter
-    if url_value:
-        cleaned_person["id"] = person.get("public_id")
-        logger.info("Added public_id to profile")
-    else:
-        cleaned_person["id"] = person.get("profile_urn")
-        logger.info("Added profile_urn to profile")
-    
-    logger.info("Successfully enriched profile data")
-    return cleaned_person
+async def enrich_person_more_async(
+    linkedin: LinkedinWrapperAsync,
+    value: str,
+    url_value: bool = False,
+    sections: Iterable[str] = ENRICH_MORE_SECTIONS
+) -> dict:
+    logger.info("Starting profile enrichment for value: %s (url_value=%s)", value, url_value)
+    id = _profile_id_from_value(value, url_value)
+    person = await linkedin.get_profile(id, sections=sections)
+    return clean_person_more(person, value, url_value)
 
 
 if __name__ == "__main__":
@@ -274,6 +561,8 @@ if __name__ == "__main__":
     from pprint import pprint
 
     from dotenv import load_dotenv
+    from openai import OpenAI
+    from custom_lib.linkedin_wrapper import LinkedinWrapper
     load_dotenv()
     openai = OpenAI(
         api_key=os.getenv("OPENAI_API_KEY")
@@ -3,6 +3,7 @@ from typing import List, Tuple, Optional
 
 from httpx import Limits
 from custom_lib.linkedin_wrapper import LinkedinWrapper
+from custom_lib.school_registry import get_school_registry
 import math
 import logging
 import traceback
@@ -427,16 +428,9 @@ def _handle_cad_school_search(
         logger.info("Starting CAD school search with keyword='%s', school_urn_id='%s'", 
                    search_keyword, school_urn_id)
         
-        # Load and process CAD schools
-        logger.debug("Loading CAD schools from data/cad_schools.json")
-        cad_schools = json.loads(open("data/cad_schools.json", "r").read())
-        cad_school_values = list(cad_schools.values())
-        logger.info("Loaded %d CAD schools", len(cad_school_values))
-        
-        if school_urn_id in cad_school_values:
-            cad_school_values.remove(school_urn_id)
-            logger.info("Removed current school_urn_id from CAD schools list. Remaining: %d", 
-                        len(cad_school_values))
+        # CAD schools, minus the current school
+        cad_school_values = get_school_registry().group("cad").without(school_urn_id)
+        logger.info("Searching %d CAD schools", len(cad_school_values))
         
         final_results = []
         logger.info("Processing %d company results from initial search", len(search_results))
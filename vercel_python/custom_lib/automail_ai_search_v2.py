@@ -1,18 +1,26 @@
+from __future__ import annotations
+
 from re import search
-from typing import List, Tuple, Optional
+from typing import TYPE_CHECKING, Awaitable, Callable, List, Tuple, Optional, Union
 
-from httpx import Limits
-from custom_lib.linkedin_wrapper import LinkedinWrapper
+import asyncio
 import math
 import logging
 import traceback
 import json
-import pandas as pd
 import os
-from openai import OpenAI
+from custom_lib.llm_dispatcher import LLMDispatcher
+from custom_lib.exclusion import BloomFilter, ExclusionSet
+from custom_lib.school_registry import get_school_registry
 from dataclasses import dataclass, asdict
 from pathlib import Path
 
+# Type-only: the LinkedIn clients and OpenAI pull in heavy dependencies at import time
+if TYPE_CHECKING:
+    from openai import OpenAI
+    from custom_lib.linkedin_wrapper import LinkedinWrapper
+    from custom_lib.linkedin_wrapper_async import LinkedinWrapperAsync
+
 # Configure logging
 # logging.basicConfig(
 #     level=logging.INFO,
@@ -22,59 +30,84 @@ logger = logging.getLogger(__name__)
 
 from prompt.extraction import OPENAI_EXTRACTION_PROMPT, POST_PROMPT_INSTR
 
+# Most result pages a single search call pulls while filling its target
+MAX_SEARCH_PAGES = 5
+
+EXTRACTION_SYSTEM_PROMPT = "You are a helpful assistant that extracts structured information from a given text, and checks to ensure that the following requirements listed are met. "
+
+def _extraction_request(prompt: str) -> dict:
+    # Create the complete prompt for OpenAI
+    full_prompt = f"{OPENAI_EXTRACTION_PROMPT}\n\nInput text:\n{prompt}\n\n{POST_PROMPT_INSTR}"
+    return dict(
+        model="gpt-4o-mini",  # or "gpt-3.5-turbo" for faster, cheaper results
+        messages=[
+            {"role": "system", "content": EXTRACTION_SYSTEM_PROMPT},
+            {"role": "user", "content": full_prompt}
+        ],
+        temperature=0.1  # Low temperature for more consistent results
+    )
+
+def _parse_extraction_response(content: str) -> dict:
+    # Extract the JSON response
+    json_str = content.strip()
+    # Clean up the response if it contains markdown formatting
+    if "```json" in json_str:
+        json_str = json_str.split("```json")[1].split("```")[0].strip()
+    elif "```" in json_str:
+        json_str = json_str.split("```")[1].strip()
+        
+    return json.loads(json_str)
+
+def _default_search_params() -> dict:
+    return {
+        "target_total": 10,
+        "keyword_industry": "investment banking",
+        "companies": [
+            {
+                "name": "Moelis",
+                "locations": [
+                    {
+                        "location": "New York",
+                        "target_per_location": 10
+                    }
+                ]
+            }
+        ],
+        "additional_filters": {
+            "positions": ["analyst", "associate", "vp"],
+            "include_cad_schools_on_fill_search": True
+        }
+    }
+
 def parse_input_prompt(prompt: str, openai_client: OpenAI) -> dict:
     """
     Parse the input prompt using OpenAI to extract search parameters
     Example prompt: "Find 10 Canadian investment banking analysts in NY for Moelis"
     """
     try:
-        # Create the complete prompt for OpenAI
-        full_prompt = f"{OPENAI_EXTRACTION_PROMPT}\n\nInput text:\n{prompt}\n\n{POST_PROMPT_INSTR}"
-        
         # Call OpenAI API
-        response = openai_client.chat.completions.create(
-            model="gpt-4o-mini",  # or "gpt-3.5-turbo" for faster, cheaper results
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that extracts structured information from a given text, and checks to ensure that the following requirements listed are met. "},
-                {"role": "user", "content": full_prompt}
-            ],
-            temperature=0.1  # Low temperature for more consistent results
-        )
-        
-        # Extract the JSON response
-        json_str = response.choices[0].message.content.strip()
-        # Clean up the response if it contains markdown formatting
-        if "```json" in json_str:
-            json_str = json_str.split("```json")[1].split("```")[0].strip()
-        elif "```" in json_str:
-            json_str = json_str.split("```")[1].strip()
-            
-        parsed_data = json.loads(json_str)
+        response = openai_client.chat.completions.create(**_extraction_request(prompt))
+        parsed_data = _parse_extraction_response(response.choices[0].message.content)
         # logger.info("Successfully parsed prompt with OpenAI")
         return parsed_data
         
     except Exception as e:
         logger.error(f"Error parsing prompt with OpenAI: {str(e)}")
         logger.info("Falling back to default parsing")
-        return {
-            "target_total": 10,
-            "keyword_industry": "investment banking",
-            "companies": [
-                {
-                    "name": "Moelis",
-                    "locations": [
-                        {
-                            "location": "New York",
-                            "target_per_location": 10
-                        }
-                    ]
-                }
-            ],
-            "additional_filters": {
-                "positions": ["analyst", "associate", "vp"],
-                "include_cad_schools_on_fill_search": True
-            }
-        }
+        return _default_search_params()
+
+async def parse_input_prompt_async(prompt: str, dispatcher: LLMDispatcher) -> dict:
+    """
+    Async parse_input_prompt, routed through the shared LLMDispatcher.
+    """
+    try:
+        content = await dispatcher.complete(**_extraction_request(prompt))
+        return _parse_extraction_response(content)
+
+    except Exception as e:
+        logger.error(f"Error parsing prompt with OpenAI: {str(e)}")
+        logger.info("Falling back to default parsing")
+        return _default_search_params()
 
 def convert_parms_to_targets(
     parsed_data: dict
@@ -175,20 +208,16 @@ def get_company_locations_id(
     try:
         # Search for company using LinkedIn API
         logger.info("Searching LinkedIn for company: %s", company_name)
-        search_results = linkedin.search_companies(
-            keywords=[company_name],
-            limit=10,
-            offset=0
-        )
+        company = linkedin.resolve_company(company_name)
         
-        if not search_results:
+        if not company:
             logger.warning("No results found for company: %s, using original name", company_name)
             company_id = ''
             return (company_id, [], company_name)
         else:
             # Use the first result's URN ID
-            company_id = search_results[0]["urn_id"]
-            company_found_name = search_results[0]["name"]
+            company_id = company["urn_id"]
+            company_found_name = company["name"]
             logger.info("Found company ID for %s (matched with: %s): %s", 
                         company_name, company_found_name, company_id)
             
@@ -202,6 +231,130 @@ def get_company_locations_id(
         # Return original company name and locations if there's an error
         return ("Error finding company", locations, company_name)
 
+async def _bounded(semaphore: Optional[asyncio.Semaphore], coro: Awaitable):
+    if semaphore is None:
+        return await coro
+    async with semaphore:
+        return await coro
+
+async def _resolve_location_async(
+    linkedin: LinkedinWrapperAsync,
+    location_name: str,
+    target_count: int,
+    semaphore: Optional[asyncio.Semaphore] = None
+) -> Optional[Tuple[str, int]]:
+    if location_name == "any":
+        logger.info("Location is 'any', skipping search")
+        return ("any", target_count)
+
+    # Search for location using LinkedIn API
+    logger.info("Searching LinkedIn for location: %s", location_name)
+    try:
+        location_id = await _bounded(semaphore, linkedin.search_geo(keywords=location_name))
+    except Exception as e:
+        logger.error("Error searching for location %s: %s", location_name, str(e))
+        return None
+    if not location_id:
+        logger.warning("No results found for location: %s", location_name)
+        return None
+    logger.info("Found location ID for %s: %s", location_name, location_id)
+    return (location_id, target_count)
+
+async def get_location_ids_async(
+    linkedin: LinkedinWrapperAsync,
+    locations: List[Tuple[str, int]],
+    semaphore: Optional[asyncio.Semaphore] = None
+) -> List[Tuple[str, int]]:
+    """
+    Async version of get_location_ids. All locations are resolved concurrently.
+
+    Args:
+        linkedin: LinkedinWrapperAsync instance
+        locations: List of (location_name, target_count)
+        semaphore: Bounds the LinkedIn lookups in flight, shared with the caller
+
+    Returns:
+        List of (location_id, target_count), in input order, without unresolved locations
+    """
+    logger.info("Starting location ID resolution for %d locations", len(locations))
+    resolved = await asyncio.gather(*(
+        _resolve_location_async(linkedin, location_name, target_count, semaphore)
+        for location_name, target_count in locations
+    ))
+    adjusted_locations = [location for location in resolved if location is not None]
+    logger.info("Completed location ID resolution. Final adjusted locations: %s", adjusted_locations)
+    return adjusted_locations
+
+async def get_company_locations_id_async(
+    linkedin: LinkedinWrapperAsync,
+    search_target: Tuple[str, List[Tuple[str, int]]],
+    semaphore: Optional[asyncio.Semaphore] = None
+) -> Tuple[str, List[Tuple[str, int]], str]:
+    """
+    Async version of get_company_locations_id.
+
+    The company and its locations are resolved concurrently rather than one
+    after the other; semaphore bounds the lookups in flight.
+    """
+    company_name, locations = search_target
+    logger.info("Processing company: %s with locations: %s", company_name, locations)
+
+    # Handle 'any' company case
+    if company_name == "any":
+        logger.info("Company is 'any', skipping search")
+        adjusted_locations = await get_location_ids_async(linkedin, locations, semaphore)
+        return ("any", adjusted_locations, company_name)
+
+    # Search for company using LinkedIn API
+    logger.info("Searching LinkedIn for company: %s", company_name)
+    company, adjusted_locations = await asyncio.gather(
+        _bounded(semaphore, linkedin.resolve_company(company_name)),
+        get_location_ids_async(linkedin, locations, semaphore),
+        return_exceptions=True
+    )
+
+    if isinstance(company, Exception):
+        logger.error(f"Error processing company {company_name}: {str(company)}")
+        # Return original company name and locations if there's an error
+        return ("Error finding company", locations, company_name)
+
+    if not company:
+        logger.warning("No results found for company: %s, using original name", company_name)
+        return ('', [], company_name)
+
+    # Use the first result's URN ID
+    company_id = company["urn_id"]
+    company_found_name = company["name"]
+    logger.info("Found company ID for %s (matched with: %s): %s", 
+                company_name, company_found_name, company_id)
+    return (company_id, adjusted_locations, company_found_name)
+
+async def get_company_ids_async(
+    linkedin: LinkedinWrapperAsync,
+    search_targets: List[Tuple[str, List[Tuple[str, int]]]],
+    max_concurrency: int = 5,
+    semaphore: Optional[asyncio.Semaphore] = None
+) -> List[Tuple[str, List[Tuple[str, int]], str]]:
+    """
+    Resolve every company and location of convert_parms_to_targets output at once.
+
+    Args:
+        linkedin: LinkedinWrapperAsync instance (one account)
+        search_targets: List of (company_name, [(location, target_count)])
+        max_concurrency: LinkedIn lookups in flight, when no semaphore is given
+        semaphore: Bounds the lookups across calls, e.g. the client's resolve_semaphore
+
+    Returns:
+        get_company_locations_id_async results, in the same order as search_targets
+    """
+    logger.info("Starting company ID resolution for %d targets", len(search_targets))
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max_concurrency)
+    return list(await asyncio.gather(*(
+        get_company_locations_id_async(linkedin, search_target, semaphore)
+        for search_target in search_targets
+    )))
+
 def get_company_ids(
     linkedin: LinkedinWrapper,
     search_targets: List[Tuple[str, List[Tuple[str, int]]]],
@@ -232,19 +385,14 @@ def get_company_ids(
             
         # Search for company using LinkedIn API
         logger.info("Searching LinkedIn for company: %s", company_name)
-        search_results = linkedin.search_companies(
-            keywords=[company_name],
-            limit=10,
-            offset=0
-        )
-        logger.info("Search returned %d results", len(search_results) if search_results else 0)
-        if not search_results:
+        company = linkedin.resolve_company(company_name)
+        if not company:
             logger.warning("No results found for company: %s", company_name)
             continue
             
         # Use the first result's URN ID
-        company_id = search_results[0]["urn_id"]
-        company_found_name = search_results[0]["name"]
+        company_id = company["urn_id"]
+        company_found_name = company["name"]
         logger.info("Found company ID for %s (matched with: %s): %s", 
                    company_name, company_found_name, company_id)
         
@@ -281,7 +429,7 @@ def execute_search(
         List of (company_urn, [(location_urn, target_count, actual_count, people_list)])
     """
     logger.info("Starting search execution with targets: %s", search_targets)
-    existing_urn_ids = existing_urn_ids or []
+    existing_urn_ids = ExclusionSet(existing_urn_ids)
     search_results = []
     total_target = sum(sum(target for _, target in company_targets) 
                       for _, company_targets in search_targets)
@@ -323,29 +471,24 @@ def execute_search(
                 if company_urn != "any":
                     search_params["current_company"] = [company_urn]
                 
+                people_found = []
                 try:
                     logger.info("Executing LinkedIn search with params: %s", search_params)
-                    results = linkedin.search_people(**search_params)
-                    
-                    people_found = []
-                    for person in results:
-                        if len(people_found) >= adjusted_target:
-                            break
-                        if person.get("urn_id") not in existing_urn_ids:
-                            people_found.append((person, school_urn_id))
-                    
-                    found_count = len(people_found)
-                    company_total_found += found_count
-                    
-                    logger.info("Found %d/%d people for location '%s'", 
-                              found_count, adjusted_target, loc_urn)
-                    
-                    company_results.append((loc_urn, adjusted_target, found_count, people_found))
-                    
+                    _collect_pages(
+                        linkedin, search_params, school_urn_id, existing_urn_ids, people_found, adjusted_target,
+                        key=_urn_id
+                    )
                 except Exception as e:
                     logger.error("Error searching location '%s': %s", loc_urn, str(e))
                     logger.error(traceback.format_exc())
-                    company_results.append((loc_urn, adjusted_target, 0, []))
+
+                found_count = len(people_found)
+                company_total_found += found_count
+
+                logger.info("Found %d/%d people for location '%s'", 
+                          found_count, adjusted_target, loc_urn)
+
+                company_results.append((loc_urn, adjusted_target, found_count, people_found))
             else:
                 company_results.append((loc_urn, 0, 0, []))
             
@@ -368,6 +511,212 @@ def execute_search(
     
     return search_results
 
+def _single_search_params(
+    company_urn: str,
+    location_urn: str,
+    search_keyword: str,
+    school_urn_id: str,
+    offset: int
+) -> dict:
+    return {
+        "keywords": search_keyword,
+        "schools": [school_urn_id] if school_urn_id else None,
+        "regions": [location_urn] if location_urn != "any" else None,
+        "current_company": [company_urn] if company_urn != "any" else None,
+        "limit": 10,
+        "offset": offset
+    }
+
+def _fill_search_params(
+    company_urn: str,
+    location_urn: str,
+    search_keyword: str,
+    school_urn_id: str,
+    offset: int,
+    use_cad: bool
+) -> Tuple[dict, bool]:
+    """
+    Build the Step 2 fill search params. Returns the params and whether the CAD school filter is applied.
+    """
+    # Initialize fill_params with default non-CAD configuration
+    fill_params = {
+        "keywords": search_keyword,
+        "regions": [location_urn] if location_urn != "any" else None,
+        "current_company": [company_urn] if company_urn != "any" else None,
+        "limit": 10,
+        "offset": offset
+    }
+    
+    if use_cad:
+        # CAD schools for fill search, minus the candidate's own school
+        try:
+            cad_school_values = get_school_registry().group("cad").without(school_urn_id)
+            
+            # Update fill_params with CAD schools configuration
+            fill_params.update({
+                "schools": cad_school_values,
+                "or_schools": True
+            })
+        except Exception as e:
+            logger.error(f"Error loading CAD schools: {str(e)}")
+            logger.error("Falling back to non-CAD search")
+            use_cad = False
+    else:
+        fill_params.update({
+            "schools": None,
+        })
+    return fill_params, use_cad
+
+def _same_search(params: dict, other: dict) -> bool:
+    # Without a school filter or CAD schools, the fill search is Step 1 again at another offset
+    return {**params, "offset": None} == {**other, "offset": None}
+
+def _public_id(person: dict) -> str:
+    return person.get("url").split('?')[0].split('/')[4]
+
+def _urn_id(person: dict) -> str:
+    return person.get("urn_id")
+
+def _collect_new_people(
+    results: List[dict],
+    tag: Optional[str],
+    exclusion: ExclusionSet,
+    all_results: list,
+    target_count: int,
+    key: Callable[[dict], str] = _public_id
+) -> int:
+    """
+    Append people not in exclusion to all_results until target_count is reached.
+
+    Returns:
+        How many of results were looked at, so a search can resume right after them
+    """
+    for position, person in enumerate(results):
+        if len(all_results) >= target_count:
+            return position
+        # "LinkedIn Member": out of network, no public ID to enrich or exclude by
+        if person.get("distance") == "OUT_OF_NETWORK":
+            continue
+        person_id = key(person)
+        if person_id not in exclusion:
+            all_results.append((person, tag))
+            exclusion.add(person_id)
+    return len(results)
+
+def _page_end(offset: int, page_size: int, consumed: int, results: List[dict]) -> int:
+    # A partly used page resumes after the last person looked at
+    return offset + consumed if consumed < len(results) else offset + page_size
+
+def _page_params(params: dict, offset: int) -> dict:
+    # Private profiles are kept so an all-private page is not mistaken for the end of results;
+    # _collect_new_people skips them
+    return {**params, "offset": offset, "include_private_profiles": True}
+
+def _collect_pages(
+    linkedin: LinkedinWrapper,
+    params: dict,
+    tag: Optional[str],
+    exclusion: ExclusionSet,
+    all_results: list,
+    target_count: int,
+    key: Callable[[dict], str] = _public_id,
+    max_pages: int = MAX_SEARCH_PAGES
+) -> Optional[int]:
+    """
+    Page through a people search until target_count new people are collected.
+
+    Args:
+        linkedin: LinkedinWrapper instance
+        params: search_people params; "offset" is the first page, "limit" the page size
+        tag: Tag stored next to each person collected
+        exclusion: IDs to skip, collected people are added to it
+        all_results: List the (person, tag) pairs are appended to
+        target_count: Stop once all_results holds this many people
+        key: Returns the ID of a person checked against exclusion
+        max_pages: Most pages fetched in one call
+
+    Returns:
+        Offset to resume the search from, or None once LinkedIn has no more results
+    """
+    offset, page_size = params["offset"], params["limit"]
+    for _ in range(max_pages):
+        results = linkedin.search_people(**_page_params(params, offset))
+        if not results:
+            return None
+        consumed = _collect_new_people(results, tag, exclusion, all_results, target_count, key)
+        offset = _page_end(offset, page_size, consumed, results)
+        if len(all_results) >= target_count:
+            break
+    return offset
+
+def _discard(task: Optional[asyncio.Future]):
+    if task is None:
+        return
+    if task.done():
+        if not task.cancelled():
+            # Retrieve the result so a failed prefetch isn't reported as never retrieved
+            task.exception()
+    else:
+        task.cancel()
+
+async def _collect_pages_async(
+    linkedin: LinkedinWrapperAsync,
+    params: dict,
+    tag: Optional[str],
+    exclusion: ExclusionSet,
+    all_results: list,
+    target_count: int,
+    key: Callable[[dict], str] = _public_id,
+    max_pages: int = MAX_SEARCH_PAGES,
+    first_page: Optional[asyncio.Future] = None
+) -> Optional[int]:
+    """
+    Async version of _collect_pages.
+
+    first_page may be an already running search_people call for the first
+    page (see the speculative fill search), used instead of fetching it again.
+
+    Most searches stop after the first page, so page 1 is only requested
+    once page 0 has come back short of the target. From then on the next
+    page is requested while the current one is awaited and filtered, so
+    pages decimated by exclusions don't cost a full round trip each. When
+    the target is met, the lookahead is cancelled; while it is still in the
+    account's rate limit or evade delay, no request goes out.
+    """
+    offset, page_size = params["offset"], params["limit"]
+
+    def fetch(page: int) -> Optional[asyncio.Future]:
+        if page >= max_pages:
+            return None
+        return asyncio.ensure_future(linkedin.search_people(**_page_params(params, offset + page * page_size)))
+
+    current = first_page if first_page is not None else fetch(0)
+    lookahead = None
+    end = offset
+    try:
+        page = 0
+        while current is not None:
+            results = await current
+            if not results:
+                return None
+            consumed = _collect_new_people(results, tag, exclusion, all_results, target_count, key)
+            end = _page_end(offset + page * page_size, page_size, consumed, results)
+            if len(all_results) >= target_count:
+                return end
+            page += 1
+            current = lookahead if lookahead is not None else fetch(page)
+            lookahead = fetch(page + 1)
+        return end
+    finally:
+        _discard(current)
+        _discard(lookahead)
+
+def _format_single_search_results(all_results: list, company_name_for_passthrough: str) -> list:
+    # Format results in the same way as execute_search
+    # return (company_urn, [(location_urn, target_count, total_found, all_results)])
+    logger.info(all_results)
+    return [[person['name'], person['url'], company_name_for_passthrough, person['location']] for person, _ in all_results]
+
 def execute_single_search(
     linkedin: LinkedinWrapper,
     company_urn: str,
@@ -378,10 +727,16 @@ def execute_single_search(
     existing_public_ids: List[str] = None,
     offset: int = 0,
     target_count: int = 10,
-    use_cad: bool = False
+    use_cad: bool = False,
+    existing_public_ids_bloom: Union[str, BloomFilter, None] = None,
+    fill_offset: Optional[int] = None,
+    max_pages: int = MAX_SEARCH_PAGES
 ) -> list:
     """
     Execute LinkedIn search for a single company-location pair, with intelligent fallback searches.
+
+    Each step pages through results until target_count new people are found,
+    LinkedIn runs out, or max_pages pages were read.
     
     Args:
         linkedin: LinkedinWrapper instance
@@ -393,108 +748,174 @@ def execute_single_search(
         offset: Search offset
         target_count: Number of results to target
         use_cad: Whether to use Canadian schools for fill search
+        existing_public_ids_bloom: BloomFilter (or its to_string encoding) of further PUBLIC IDs to exclude
+        fill_offset: Offset of the fill search, defaults to offset
+        max_pages: Most pages read per step
     
     Returns:
-        Tuple of (company_urn, [(location_urn, target_count, actual_count, people_list)])
+        List of [name, url, company_name, location] rows
     """
     logger.info(f"Starting single search execution for company: {company_urn}, location: {location_urn}")
-    existing_public_ids = existing_public_ids or []
+    exclusion = ExclusionSet(
+        existing_public_ids,
+        BloomFilter.parse(existing_public_ids_bloom)
+    )
     all_results = []
-    total_found = 0
 
     # Step 1: Normal search with all filters
-    search_params = {
-        "keywords": search_keyword,
-        "schools": [school_urn_id] if school_urn_id else None,
-        "regions": [location_urn] if location_urn != "any" else None,
-        "current_company": [company_urn] if company_urn != "any" else None,
-        "limit": 10,
-        "offset": offset
-    }
+    search_params = _single_search_params(company_urn, location_urn, search_keyword, school_urn_id, offset)
 
     try:
         logger.info("Step 1 - Executing normal search with params: %s", search_params)
-        results = linkedin.search_people(**search_params)
-        
-        for person in results:
-            public_id = person.get("url").split('?')[0].split('/')[4]
-            if total_found >= target_count:
-                break
-            if public_id not in existing_public_ids:
-                all_results.append((person, school_urn_id))
-                existing_public_ids.append(public_id)
-                total_found += 1
-        
-        logger.info(f"Step 1 - Found {total_found} people")
+        _collect_pages(linkedin, search_params, school_urn_id, exclusion, all_results, target_count, max_pages=max_pages)
+        logger.info(f"Step 1 - Found {len(all_results)} people")
     except Exception as e:
         logger.error(f"Error in normal search: {str(e)}")
         logger.error(traceback.format_exc())
 
     # Step 2: If target not met, do fill search
-    if total_found < target_count:
-        remaining_count = target_count - total_found
-        
-        # Initialize fill_params with default non-CAD configuration
-        fill_params = {
-            "keywords": search_keyword,
-            "regions": [location_urn] if location_urn != "any" else None,
-            "current_company": [company_urn] if company_urn != "any" else None,
-            "limit": 10,
-            "offset": offset
-        }
-        
-        if use_cad:
-            # Load CAD schools for fill search
-            try:
-                logger.debug("Loading CAD schools from custom_lib/cad_schools.json")
-                cad_schools = json.loads(open("custom_lib/cad_schools.json", "r").read())
-                cad_school_values = list(cad_schools.values())
-                if school_urn_id in cad_school_values:
-                    cad_school_values.remove(school_urn_id)
-                
-                # Update fill_params with CAD schools configuration
-                fill_params.update({
-                    "schools": cad_school_values,
-                    "or_schools": True
-                })
-            except Exception as e:
-                logger.error(f"Error loading CAD schools: {str(e)}")
-                logger.error("Falling back to non-CAD search")
-                use_cad = False
-        else:
-            fill_params.update({
-                "schools": None,
-            })
+    if len(all_results) < target_count:
+        fill_params, use_cad = _fill_search_params(
+            company_urn, location_urn, search_keyword, school_urn_id,
+            offset if fill_offset is None else fill_offset, use_cad
+        )
+        if _same_search(search_params, fill_params):
+            logger.info("Step 2 - Skipped, the fill search has the same filters as Step 1")
+            return _format_single_search_results(all_results, company_name_for_passthrough)
+        try:
+            logger.info(f"Step 2 - Executing {'CAD' if use_cad else 'general'} fill search with params: {fill_params}")
+            _collect_pages(
+                linkedin, fill_params, "from_cad_school" if use_cad else None, exclusion, all_results, target_count,
+                max_pages=max_pages
+            )
+            logger.info(f"Step 2 - Found {len(all_results)} people total after fill search")
+        except Exception as e:
+            logger.error(f"Error in fill search: {str(e)}")
+            logger.error(traceback.format_exc())
+
+    return _format_single_search_results(all_results, company_name_for_passthrough)
+
+@dataclass
+class SingleSearchPage:
+    """
+    Rows found by one single search, plus the cursors to resume it from.
+
+    A cursor is None once LinkedIn has no more results for that step.
+    """
+    rows: list
+    next_offset: Optional[int]
+    next_fill_offset: Optional[int]
+
+async def execute_single_search_paged_async(
+    linkedin: LinkedinWrapperAsync,
+    company_urn: str,
+    company_name_for_passthrough: str,
+    location_urn: str,
+    search_keyword: str = "",
+    school_urn_id: str = "",
+    existing_public_ids: List[str] = None,
+    offset: int = 0,
+    target_count: int = 10,
+    use_cad: bool = False,
+    existing_public_ids_bloom: Union[str, BloomFilter, None] = None,
+    fill_offset: Optional[int] = None,
+    max_pages: int = MAX_SEARCH_PAGES,
+    speculative: bool = False
+) -> SingleSearchPage:
+    """
+    Async version of execute_single_search, also returning where each step stopped.
+
+    Pages are prefetched one ahead (see _collect_pages_async). Passing
+    next_offset and next_fill_offset back as offset and fill_offset resumes
+    both steps without re-reading pages.
+
+    With speculative, the first fill search page is requested alongside Step 1
+    instead of after it, so a too narrow school filter costs one round trip
+    rather than two. Step 1 people still come first and the fill page is
+    deduplicated against them; if Step 1 meets the target, the fill request
+    is cancelled (or its result dropped).
+
+    Without a school filter or CAD schools the fill search would repeat Step
+    1, so it is skipped (never started speculatively) and next_fill_offset is None.
+    """
+    logger.info(f"Starting single search execution for company: {company_urn}, location: {location_urn}")
+    exclusion = ExclusionSet(
+        existing_public_ids,
+        BloomFilter.parse(existing_public_ids_bloom)
+    )
+    all_results = []
+    fill_offset = offset if fill_offset is None else fill_offset
+    # On errors the cursors stay put; re-read people are dropped by the exclusion list
+    next_offset, next_fill_offset = offset, fill_offset
 
+    # Step 1: Normal search with all filters
+    search_params = _single_search_params(company_urn, location_urn, search_keyword, school_urn_id, offset)
+    fill_params, use_cad = _fill_search_params(
+        company_urn, location_urn, search_keyword, school_urn_id, fill_offset, use_cad
+    )
+    if _same_search(search_params, fill_params):
+        # Step 1 already pages through this search: no fill step, and no fill cursor
+        fill_params, next_fill_offset = None, None
+    fill_page = None
+    if speculative and fill_params is not None and target_count > 0:
+        logger.info("Speculatively starting fill search alongside Step 1")
+        fill_page = asyncio.ensure_future(linkedin.search_people(**_page_params(fill_params, fill_params["offset"])))
+
+    try:
+        logger.info("Step 1 - Executing normal search with params: %s", search_params)
+        next_offset = await _collect_pages_async(
+            linkedin, search_params, school_urn_id, exclusion, all_results, target_count, max_pages=max_pages
+        )
+        logger.info(f"Step 1 - Found {len(all_results)} people")
+    except Exception as e:
+        logger.error(f"Error in normal search: {str(e)}")
+        logger.error(traceback.format_exc())
+
+    # Step 2: If target not met, do fill search
+    if fill_params is None:
+        logger.info("Step 2 - Skipped, the fill search has the same filters as Step 1")
+    elif len(all_results) < target_count:
         try:
             logger.info(f"Step 2 - Executing {'CAD' if use_cad else 'general'} fill search with params: {fill_params}")
-            results = linkedin.search_people(**fill_params)
-            
-            for person in results:
-                public_id = person.get("url").split('?')[0].split('/')[4]
-                if total_found >= target_count:
-                    break
-                if public_id not in existing_public_ids:
-                    all_results.append((person, "from_cad_school" if use_cad else None))
-                    existing_public_ids.append(public_id)
-                    total_found += 1
-            
-            logger.info(f"Step 2 - Found {total_found} people total after fill search")
+            next_fill_offset = await _collect_pages_async(
+                linkedin, fill_params, "from_cad_school" if use_cad else None, exclusion, all_results, target_count,
+                max_pages=max_pages, first_page=fill_page
+            )
+            logger.info(f"Step 2 - Found {len(all_results)} people total after fill search")
         except Exception as e:
             logger.error(f"Error in fill search: {str(e)}")
             logger.error(traceback.format_exc())
+    elif fill_page is not None:
+        logger.info("Step 1 met the target, dropping speculative fill search")
+        _discard(fill_page)
 
-    # Format results in the same way as execute_search
-    # return (company_urn, [(location_urn, target_count, total_found, all_results)])
-    logger.info(all_results)
-    return [[person['name'], person['url'], company_name_for_passthrough, person['location']] for person, _ in all_results]
+    return SingleSearchPage(
+        rows=_format_single_search_results(all_results, company_name_for_passthrough),
+        next_offset=next_offset,
+        next_fill_offset=next_fill_offset
+    )
+
+async def execute_single_search_async(
+    linkedin: LinkedinWrapperAsync,
+    company_urn: str,
+    company_name_for_passthrough: str,
+    location_urn: str,
+    **kwargs
+) -> list:
+    """
+    Async version of execute_single_search.
+    """
+    page = await execute_single_search_paged_async(
+        linkedin, company_urn, company_name_for_passthrough, location_urn, **kwargs
+    )
+    return page.rows
 
 def _handle_cad_school_search(
     linkedin: LinkedinWrapper,
     search_results: List[Tuple[str, List[Tuple[str, int, int, List[dict]]]]],
     search_keyword: str,
     school_urn_id: str,
-    existing_urn_ids: List[str],
+    existing_urn_ids: ExclusionSet,
     offset: int
 ) -> List[Tuple[str, List[Tuple[str, int, int, List[dict]]]]]:
     """
@@ -504,16 +925,9 @@ def _handle_cad_school_search(
         logger.info("Starting CAD school search with keyword='%s', school_urn_id='%s'", 
                    search_keyword, school_urn_id)
         
-        # Load and process CAD schools
-        logger.debug("Loading CAD schools from data/cad_schools.json")
-        cad_schools = json.loads(open("data/cad_schools.json", "r").read())
-        cad_school_values = list(cad_schools.values())
-        logger.info("Loaded %d CAD schools", len(cad_school_values))
-        
-        if school_urn_id in cad_school_values:
-            cad_school_values.remove(school_urn_id)
-            logger.info("Removed current school_urn_id from CAD schools list. Remaining: %d", 
-                        len(cad_school_values))
+        # CAD schools, minus the current school
+        cad_school_values = get_school_registry().group("cad").without(school_urn_id)
+        logger.info("Searching %d CAD schools", len(cad_school_values))
         
         final_results = []
         logger.info("Processing %d company results from initial search", len(search_results))
@@ -643,6 +1057,9 @@ def search_people(
         raise
 
 def extract_linkedin_data(results: list):
+    # Only the CLI writes spreadsheets; keep pandas off the API's import path
+    import pandas as pd
+
     # Lists to store the data
     data = []
     accumulator = []
@@ -718,6 +1135,8 @@ If they went to the University of Waterloo, please use template 2. If they went
     # ==================================================================
 
     from dotenv import load_dotenv
+    from openai import OpenAI
+    from custom_lib.linkedin_wrapper import LinkedinWrapper
     load_dotenv()
     openai = OpenAI(
         api_key=os.getenv("OPENAI_API_KEY")
@@ -0,0 +1,225 @@
+import abc
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(abc.ABC):
+    """
+    Key/value store for cached strings with a per-entry expiry.
+
+    Backends store plain strings; callers handle (de)serialisation. A ttl of
+    None means the entry never expires.
+
+    The *_async methods are what coroutines call. They run the plain methods
+    inline; backends doing blocking I/O override them to run in a thread.
+    """
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        ...
+
+    @abc.abstractmethod
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        ...
+
+    @abc.abstractmethod
+    def delete(self, key: str):
+        ...
+
+    @abc.abstractmethod
+    def clear(self):
+        ...
+
+    async def get_async(self, key: str) -> Optional[str]:
+        return self.get(key)
+
+    async def set_async(self, key: str, value: str, ttl: Optional[float] = None):
+        self.set(key, value, ttl)
+
+    async def delete_async(self, key: str):
+        self.delete(key)
+
+
+class MemoryLRUBackend(CacheBackend):
+    """In-process LRU, bounded to max_size entries."""
+
+    def __init__(self, max_size: int = 1024, clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.clock = clock
+        self._entries: "OrderedDict[str, Tuple[str, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= self.clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        expires_at = self.clock() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    On-disk store shared by every worker on the machine and kept across restarts.
+
+    sqlalchemy is imported when the first SQLiteBackend is created, not with
+    this module, so memory-only caches never load it.
+
+    Args:
+        path: SQLite file, created if missing
+        table: Table name, so several caches can share one file
+    """
+
+    def __init__(self, path: str, table: str = "cache", clock: Callable[[], float] = time.time):
+        from sqlalchemy import Column, Float, MetaData, String, Table, Text, create_engine
+
+        self.clock = clock
+        self.engine = create_engine(f"sqlite:///{path}")
+        metadata = MetaData()
+        self.table = Table(
+            table,
+            metadata,
+            Column("key", String, primary_key=True),
+            Column("value", Text, nullable=False),
+            Column("expires_at", Float, nullable=True),
+        )
+        metadata.create_all(self.engine)
+
+    def get(self, key: str) -> Optional[str]:
+        from sqlalchemy import delete, select
+
+        with self.engine.begin() as conn:
+            row = conn.execute(
+                select(self.table.c.value, self.table.c.expires_at).where(self.table.c.key == key)
+            ).first()
+            if row is None:
+                return None
+            if row.expires_at is not None and row.expires_at <= self.clock():
+                conn.execute(delete(self.table).where(self.table.c.key == key))
+                return None
+            return row.value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+        expires_at = self.clock() + ttl if ttl is not None else None
+        statement = sqlite_insert(self.table).values(key=key, value=value, expires_at=expires_at)
+        statement = statement.on_conflict_do_update(
+            index_elements=[self.table.c.key],
+            set_={"value": value, "expires_at": expires_at},
+        )
+        with self.engine.begin() as conn:
+            conn.execute(statement)
+
+    def delete(self, key: str):
+        from sqlalchemy import delete
+
+        with self.engine.begin() as conn:
+            conn.execute(delete(self.table).where(self.table.c.key == key))
+
+    def clear(self):
+        from sqlalchemy import delete
+
+        with self.engine.begin() as conn:
+            conn.execute(delete(self.table))
+
+    async def get_async(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self.get, key)
+
+    async def set_async(self, key: str, value: str, ttl: Optional[float] = None):
+        await asyncio.to_thread(self.set, key, value, ttl)
+
+    async def delete_async(self, key: str):
+        await asyncio.to_thread(self.delete, key)
+
+    def purge_expired(self) -> int:
+        """Delete expired rows. Returns the number of rows removed."""
+        from sqlalchemy import delete
+
+        with self.engine.begin() as conn:
+            result = conn.execute(delete(self.table).where(self.table.c.expires_at <= self.clock()))
+            return result.rowcount
+
+
+class TieredBackend(CacheBackend):
+    """
+    Memory LRU in front of a slower backend.
+
+    Reads try the memory tier first and copy disk hits into it; writes go to both.
+    """
+
+    def __init__(self, memory: CacheBackend, disk: CacheBackend, memory_ttl: Optional[float] = 300):
+        self.memory = memory
+        self.disk = disk
+        self.memory_ttl = memory_ttl
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.memory.get(key)
+        if value is None:
+            value = self.disk.get(key)
+            if value is not None:
+                # Never outlive the disk entry by much: keep memory copies short lived
+                self.memory.set(key, value, self.memory_ttl)
+        return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        self.memory.set(key, value, self._memory_ttl(ttl))
+        self.disk.set(key, value, ttl)
+
+    def delete(self, key: str):
+        self.memory.delete(key)
+        self.disk.delete(key)
+
+    async def get_async(self, key: str) -> Optional[str]:
+        value = await self.memory.get_async(key)
+        if value is None:
+            value = await self.disk.get_async(key)
+            if value is not None:
+                await self.memory.set_async(key, value, self.memory_ttl)
+        return value
+
+    async def set_async(self, key: str, value: str, ttl: Optional[float] = None):
+        await self.memory.set_async(key, value, self._memory_ttl(ttl))
+        await self.disk.set_async(key, value, ttl)
+
+    async def delete_async(self, key: str):
+        await self.memory.delete_async(key)
+        await self.disk.delete_async(key)
+
+    def _memory_ttl(self, ttl: Optional[float]) -> Optional[float]:
+        if ttl is not None and (self.memory_ttl is None or ttl < self.memory_ttl):
+            return ttl
+        return self.memory_ttl
+
+    def clear(self):
+        self.memory.clear()
+        self.disk.clear()
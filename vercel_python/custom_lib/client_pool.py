@@ -0,0 +1,188 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Cookies that identify a LinkedIn session. Other cookies (lidc, __cf_bm, ...)
+# rotate on every response, so they are left out of the pool key.
+SESSION_COOKIE_NAMES = ("li_at", "JSESSIONID")
+
+
+def cookie_set_key(cookies: List[Dict[str, Any]]) -> str:
+    """
+    Build a stable hash for a cookie set in EditThisCookie/playwright format.
+
+    Args:
+        cookies: List of cookie dicts with at least "name" and "value"
+
+    Returns:
+        Hex digest identifying the LinkedIn session behind the cookies
+    """
+    session_cookies = sorted(
+        (cookie["name"], cookie["value"])
+        for cookie in cookies
+        if cookie.get("name") in SESSION_COOKIE_NAMES
+    )
+    if not session_cookies:
+        session_cookies = sorted(
+            (cookie.get("name", ""), cookie.get("value", ""), cookie.get("domain", ""))
+            for cookie in cookies
+        )
+    return hashlib.sha256(json.dumps(session_cookies).encode("utf-8")).hexdigest()
+
+
+class _PoolEntry:
+    __slots__ = ("client", "last_used")
+
+    def __init__(self, client: Any, last_used: float):
+        self.client = client
+        self.last_used = last_used
+
+
+class LinkedinClientPool:
+    """
+    Process-level pool of LinkedIn clients keyed by cookie set.
+
+    Back-to-back calls made with the same cookies reuse the same client, and so
+    the same warm HTTP session. Entries are dropped when the pool grows past
+    max_size (least recently used first), when they sit idle longer than
+    idle_ttl seconds, or when the client flags its session as invalid.
+
+    on_evict runs as soon as an entry is dropped, while callers may still hold
+    the client, so it must not cut their requests short:
+    LinkedinWrapperAsync.close_nowait waits for in-flight requests to finish.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[List[Dict[str, Any]]], Any],
+        max_size: int = 32,
+        idle_ttl: float = 600,
+        on_evict: Optional[Callable[[Any], None]] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.factory = factory
+        self.max_size = max_size
+        self.idle_ttl = idle_ttl
+        self.on_evict = on_evict
+        self.clock = clock
+        self._entries: "OrderedDict[str, _PoolEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, cookies: List[Dict[str, Any]], key: Optional[str] = None) -> Any:
+        """
+        Return a warm client for the cookie set, creating one if needed.
+
+        Args:
+            cookies: Cookie set to build the client from on a miss
+            key: cookie_set_key(cookies), when the caller already has it
+        """
+        key = key or cookie_set_key(cookies)
+        now = self.clock()
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._entries.get(key)
+            if entry is not None and getattr(entry.client, "session_invalid", False):
+                logger.info("Evicting LinkedIn client %s after auth failure", key[:12])
+                self._drop(key)
+                entry = None
+            if entry is not None:
+                entry.last_used = now
+                self._entries.move_to_end(key)
+                logger.debug("Reusing pooled LinkedIn client %s", key[:12])
+                return entry.client
+
+        client = self.factory(cookies)
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None:
+                # Another caller built the same client meanwhile, keep theirs
+                self._close(client)
+                existing.last_used = now
+                self._entries.move_to_end(key)
+                return existing.client
+            self._entries[key] = _PoolEntry(client, now)
+            while len(self._entries) > self.max_size:
+                oldest_key = next(iter(self._entries))
+                logger.debug("Pool full, evicting LinkedIn client %s", oldest_key[:12])
+                self._drop(oldest_key)
+        logger.info("Created pooled LinkedIn client %s (pool size: %d)", key[:12], len(self._entries))
+        return client
+
+    def peek(self, key: str) -> Optional[Any]:
+        """Return the pooled client for a cookie_set_key without creating or touching it."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.client if entry is not None else None
+
+    def replace(self, old_key: str, cookies: List[Dict[str, Any]]) -> Optional[Any]:
+        """
+        Swap the client for old_key over to a refreshed cookie set.
+
+        The new client is built first; dropping the old entry and adding the
+        new one then happens under one lock, so callers see one or the other.
+        Nothing is built when no client was pooled for old_key.
+
+        Returns:
+            The new client, or None if old_key was not pooled
+        """
+        with self._lock:
+            if old_key not in self._entries:
+                return None
+        key = cookie_set_key(cookies)
+        client = self.factory(cookies)
+        now = self.clock()
+        with self._lock:
+            for stale_key in {old_key, key}:
+                if stale_key in self._entries:
+                    self._drop(stale_key)
+            self._entries[key] = _PoolEntry(client, now)
+            while len(self._entries) > self.max_size:
+                self._drop(next(iter(self._entries)))
+        logger.info("Swapped LinkedIn client %s for refreshed %s", old_key[:12], key[:12])
+        return client
+
+    def evict(self, cookies: List[Dict[str, Any]]) -> bool:
+        """
+        Drop the client for a cookie set, e.g. after a 401 or a challenge.
+
+        Returns:
+            True if a client was evicted
+        """
+        key = cookie_set_key(cookies)
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._drop(key)
+            return True
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._entries):
+                self._drop(key)
+
+    def _evict_idle(self, now: float):
+        expired = [key for key, entry in self._entries.items() if now - entry.last_used > self.idle_ttl]
+        for key in expired:
+            logger.debug("Evicting idle LinkedIn client %s", key[:12])
+            self._drop(key)
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key)
+        self._close(entry.client)
+
+    def _close(self, client: Any):
+        if self.on_evict is None:
+            return
+        try:
+            self.on_evict(client)
+        except Exception as e:
+            logger.warning(f"Error closing evicted LinkedIn client: {str(e)}")
@@ -0,0 +1,185 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from custom_lib.cache_backends import CacheBackend, MemoryLRUBackend
+from custom_lib.client_pool import SESSION_COOKIE_NAMES, cookie_set_key
+from custom_lib.linkedin_errors import ChallengeException, ThrottledException, UnauthorizedException
+
+logger = logging.getLogger(__name__)
+
+# Verdict statuses. DEAD_STATUSES will not recover without a fresh cookie export
+HEALTHY = "healthy"
+UNCHECKED = "unchecked"
+EXPIRED = "expired"
+MISSING = "missing"
+INVALID = "invalid"
+THROTTLED = "throttled"
+UNKNOWN = "unknown"
+DEAD_STATUSES = frozenset({EXPIRED, MISSING, INVALID})
+
+DEFAULT_HEALTHY_TTL = 300
+DEFAULT_DEAD_TTL = 3600
+DEFAULT_THROTTLED_TTL = 60
+
+
+class CookieVerdict:
+    """
+    Health of one LinkedIn cookie set.
+
+    Args:
+        status: One of the statuses above
+        reason: Human readable explanation, shown to the frontend
+        expires_at: Earliest expiry (epoch seconds) of the session cookies, None for session-only cookies
+        checked_at: When the verdict was reached (epoch seconds)
+        probed: Whether LinkedIn was asked, rather than only the cookie fields read
+    """
+
+    __slots__ = ("status", "reason", "expires_at", "checked_at", "probed")
+
+    def __init__(self, status: str, reason: str = "", expires_at: Optional[float] = None, checked_at: Optional[float] = None, probed: bool = False):
+        self.status = status
+        self.reason = reason
+        self.expires_at = expires_at
+        self.checked_at = checked_at if checked_at is not None else time.time()
+        self.probed = probed
+
+    @property
+    def usable(self) -> bool:
+        return self.status not in DEAD_STATUSES
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "usable": self.usable,
+            "reason": self.reason,
+            "expires_at": self.expires_at,
+            "checked_at": self.checked_at,
+            "probed": self.probed,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CookieVerdict":
+        return cls(data["status"], data["reason"], data["expires_at"], data["checked_at"], data["probed"])
+
+
+def _cookie_expiry(cookie: Dict[str, Any]) -> Optional[float]:
+    # EditThisCookie exports expirationDate, playwright exports expires (-1 for session cookies)
+    expiry = cookie.get("expirationDate", cookie.get("expires"))
+    if expiry is None or cookie.get("session") or float(expiry) < 0:
+        return None
+    return float(expiry)
+
+
+def inspect_cookies(cookies: List[Dict[str, Any]], now: Optional[float] = None) -> CookieVerdict:
+    """
+    Judge a cookie set from its fields alone, without touching LinkedIn.
+
+    Returns:
+        MISSING if li_at or JSESSIONID is absent, EXPIRED if either is past
+        its expiry, UNCHECKED otherwise
+    """
+    now = now if now is not None else time.time()
+    session_cookies = {cookie.get("name"): cookie for cookie in cookies if cookie.get("name") in SESSION_COOKIE_NAMES}
+    missing = [name for name in SESSION_COOKIE_NAMES if not session_cookies.get(name, {}).get("value")]
+    if missing:
+        return CookieVerdict(MISSING, f"Missing {', '.join(missing)} cookie", checked_at=now)
+
+    expiries = {name: _cookie_expiry(cookie) for name, cookie in session_cookies.items()}
+    known = [expiry for expiry in expiries.values() if expiry is not None]
+    expires_at = min(known) if known else None
+    expired = [name for name, expiry in expiries.items() if expiry is not None and expiry <= now]
+    if expired:
+        return CookieVerdict(EXPIRED, f"{', '.join(expired)} cookie expired", expires_at, now)
+    return CookieVerdict(UNCHECKED, "Cookie fields look valid", expires_at, now)
+
+
+class CookieHealthChecker:
+    """
+    Cached health verdicts per cookie set, keyed by cookie_set_key.
+
+    quick_check() only reads the cookie fields and the cache, so endpoints can
+    turn away a dead session before any network call. check() also runs the
+    probe (a cheap authenticated LinkedIn request) when no verdict is cached;
+    concurrent checks of one cookie set share a single probe. Dead verdicts
+    are kept for dead_ttl, healthy ones for ttl, throttled ones for
+    throttled_ttl; probe errors other than an auth failure are not cached.
+
+    Args:
+        probe: Coroutine function (cookies, key) raising the linkedin_errors exceptions on failure
+        backend: Where verdicts live, in-memory LRU by default
+    """
+
+    def __init__(
+        self,
+        probe: Callable[[List[Dict[str, Any]], str], Awaitable[Any]],
+        backend: Optional[CacheBackend] = None,
+        ttl: float = DEFAULT_HEALTHY_TTL,
+        dead_ttl: float = DEFAULT_DEAD_TTL,
+        throttled_ttl: float = DEFAULT_THROTTLED_TTL,
+        clock: Callable[[], float] = time.time
+    ):
+        self.probe = probe
+        self.backend = backend if backend is not None else MemoryLRUBackend(max_size=4096)
+        self.ttl = ttl
+        self.dead_ttl = dead_ttl
+        self.throttled_ttl = throttled_ttl
+        self.clock = clock
+        self._inflight: Dict[str, "asyncio.Task[CookieVerdict]"] = {}
+
+    def cached(self, key: str) -> Optional[CookieVerdict]:
+        raw = self.backend.get(key)
+        return CookieVerdict.from_dict(json.loads(raw)) if raw is not None else None
+
+    def record(self, key: str, verdict: CookieVerdict):
+        """Cache a verdict, e.g. after an endpoint saw LinkedIn reject the session."""
+        if verdict.status in DEAD_STATUSES:
+            ttl = self.dead_ttl
+        elif verdict.status == THROTTLED:
+            ttl = self.throttled_ttl
+        elif verdict.status == HEALTHY:
+            ttl = self.ttl
+        else:
+            return
+        self.backend.set(key, json.dumps(verdict.to_dict()), ttl=ttl)
+
+    def quick_check(self, cookies: List[Dict[str, Any]], key: Optional[str] = None) -> CookieVerdict:
+        """Verdict from the cookie fields and the cache, without a network call."""
+        verdict = inspect_cookies(cookies, self.clock())
+        if not verdict.usable:
+            return verdict
+        cached = self.cached(key or cookie_set_key(cookies))
+        return cached if cached is not None else verdict
+
+    async def check(self, cookies: List[Dict[str, Any]], key: Optional[str] = None, probe: bool = True) -> CookieVerdict:
+        """
+        Verdict from the cookie fields, the cache and, if neither settles it, the probe.
+        """
+        key = key or cookie_set_key(cookies)
+        verdict = self.quick_check(cookies, key)
+        if verdict.status != UNCHECKED or not probe:
+            return verdict
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._probe(cookies, key, verdict.expires_at))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _probe(self, cookies: List[Dict[str, Any]], key: str, expires_at: Optional[float]) -> CookieVerdict:
+        try:
+            await self.probe(cookies, key)
+            verdict = CookieVerdict(HEALTHY, "LinkedIn accepted the session", expires_at, self.clock(), probed=True)
+        except (UnauthorizedException, ChallengeException) as e:
+            verdict = CookieVerdict(INVALID, f"LinkedIn rejected the session: {str(e)}", expires_at, self.clock(), probed=True)
+        except ThrottledException as e:
+            verdict = CookieVerdict(THROTTLED, str(e), expires_at, self.clock(), probed=True)
+        except Exception as e:
+            logger.warning("Cookie health probe for %s failed: %s", key[:12], str(e))
+            return CookieVerdict(UNKNOWN, f"Probe failed: {str(e)}", expires_at, self.clock(), probed=True)
+        logger.info("Cookie set %s is %s", key[:12], verdict.status)
+        self.record(key, verdict)
+        return verdict
@@ -0,0 +1,284 @@
+import asyncio
+import json
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from custom_lib.client_pool import cookie_set_key
+from custom_lib.cookie_health import inspect_cookies
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PLAYWRIGHT_LOGIN_URL = "http://trylisa.vercel.app/chat/api/playwright"
+
+# Refresh this long before li_at/JSESSIONID expire, and at least this often when they carry no expiry
+DEFAULT_REFRESH_MARGIN = 24 * 3600
+DEFAULT_MAX_COOKIE_AGE = 7 * 24 * 3600
+
+
+class LoginError(Exception):
+    pass
+
+
+class PlaywrightLoginProvider:
+    """
+    Logs in through the playwright endpoint of the web app, which returns a fresh cookie export.
+
+    Args:
+        url: Endpoint taking email and password query parameters
+        timeout: Seconds to wait for the browser login to finish
+    """
+
+    def __init__(self, url: str = DEFAULT_PLAYWRIGHT_LOGIN_URL, timeout: float = 120):
+        self.url = url
+        self.timeout = timeout
+
+    async def login(self, email: str, password: str) -> List[Dict[str, Any]]:
+        """
+        Returns:
+            Cookie list in EditThisCookie/playwright format
+
+        Raises:
+            LoginError: If the endpoint reports an error or returns no cookies
+        """
+        import aiohttp
+
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
+            async with session.get(self.url, params={"email": email, "password": password}) as res:
+                try:
+                    data = await res.json(content_type=None)
+                except ValueError as e:
+                    raise LoginError(f"Login endpoint returned status {res.status} without JSON") from e
+        if not isinstance(data, dict) or "error" in data or not data.get("cookies"):
+            raise LoginError(f"Login failed: {data.get('error') if isinstance(data, dict) else data}")
+        return data["cookies"]
+
+
+class StaticLoginProvider:
+    """
+    Login provider answering from preset cookie exports, for tests and local runs.
+
+    Args:
+        cookies_by_email: Cookie list returned for each email; other emails fail
+    """
+
+    def __init__(self, cookies_by_email: Dict[str, List[Dict[str, Any]]]):
+        self.cookies_by_email = cookies_by_email
+        self.logins: List[str] = []
+
+    async def login(self, email: str, password: str) -> List[Dict[str, Any]]:
+        self.logins.append(email)
+        if email not in self.cookies_by_email:
+            raise LoginError(f"No cookies for {email}")
+        return self.cookies_by_email[email]
+
+
+class ManagedAccount:
+    """A LinkedIn account whose cookies the CookieRefreshManager keeps fresh."""
+
+    __slots__ = (
+        "name", "email", "password", "cookies", "cookies_path", "expires_at",
+        "refreshed_at", "refresh_at", "failures", "last_error",
+    )
+
+    def __init__(self, name: str, email: str, password: str, cookies: Optional[List[Dict[str, Any]]] = None, cookies_path: Optional[str] = None):
+        self.name = name
+        self.email = email
+        self.password = password
+        self.cookies = cookies
+        self.cookies_path = cookies_path
+        self.expires_at: Optional[float] = None
+        self.refreshed_at: Optional[float] = None
+        self.refresh_at = 0.0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+    @property
+    def key(self) -> Optional[str]:
+        return cookie_set_key(self.cookies) if self.cookies else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        # Never the cookies or the password
+        return {
+            "name": self.name,
+            "expires_at": self.expires_at,
+            "refreshed_at": self.refreshed_at,
+            "refresh_at": self.refresh_at,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
+
+
+class CookieRefreshManager:
+    """
+    Refreshes account cookies in the background before li_at/JSESSIONID expire.
+
+    Each account is due refresh_margin seconds before its earliest session
+    cookie expiry, minus a random jitter of up to jitter seconds so accounts
+    loaded together do not log in together. Cookies without an expiry are
+    refreshed max_cookie_age seconds after they were obtained (or at once when
+    that is unknown). At most max_concurrency logins run at a time; a failed
+    login is retried with exponential backoff up to max_retry_delay.
+
+    on_refresh(account, old_cookies, new_cookies) runs after each successful
+    login, before account.cookies changes, so it can swap pooled clients and
+    sessions over to the new cookies.
+
+    Args:
+        provider: Object with an async login(email, password) -> cookies method
+        on_refresh: Callback receiving the swap, may be a coroutine function
+    """
+
+    def __init__(
+        self,
+        provider: Any,
+        on_refresh: Optional[Callable[[ManagedAccount, Optional[List[Dict[str, Any]]], List[Dict[str, Any]]], Optional[Awaitable[None]]]] = None,
+        refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+        max_cookie_age: float = DEFAULT_MAX_COOKIE_AGE,
+        jitter: float = 600,
+        max_concurrency: int = 2,
+        check_interval: float = 300,
+        retry_delay: float = 60,
+        max_retry_delay: float = 3600,
+        clock: Callable[[], float] = time.time
+    ):
+        self.provider = provider
+        self.on_refresh = on_refresh
+        self.refresh_margin = refresh_margin
+        self.max_cookie_age = max_cookie_age
+        self.jitter = jitter
+        self.check_interval = check_interval
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.clock = clock
+        self.accounts: Dict[str, ManagedAccount] = {}
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._inflight: Dict[str, "asyncio.Task[bool]"] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def add_account(self, account: ManagedAccount):
+        self.accounts[account.name] = account
+        self._schedule(account)
+
+    def _schedule(self, account: ManagedAccount):
+        if not account.cookies:
+            account.refresh_at = self.clock()
+            return
+        account.expires_at = inspect_cookies(account.cookies, self.clock()).expires_at
+        deadlines = []
+        if account.expires_at is not None:
+            deadlines.append(account.expires_at - self.refresh_margin)
+        if account.refreshed_at is not None:
+            deadlines.append(account.refreshed_at + self.max_cookie_age)
+        if not deadlines:
+            deadlines.append(self.clock())
+        account.refresh_at = min(deadlines) - random.uniform(0, self.jitter)
+
+    def due(self) -> List[ManagedAccount]:
+        now = self.clock()
+        return [account for account in self.accounts.values() if account.refresh_at <= now]
+
+    def refresh(self, account: ManagedAccount) -> "asyncio.Task[bool]":
+        """Start (or join) a refresh of one account; the task returns True on success."""
+        task = self._inflight.get(account.name)
+        if task is None:
+            task = asyncio.ensure_future(self._refresh(account))
+            self._inflight[account.name] = task
+            task.add_done_callback(lambda _: self._inflight.pop(account.name, None))
+        return task
+
+    async def _refresh(self, account: ManagedAccount) -> bool:
+        async with self._semaphore:
+            try:
+                cookies = await self.provider.login(account.email, account.password)
+                if self.on_refresh is not None:
+                    result = self.on_refresh(account, account.cookies, cookies)
+                    if asyncio.iscoroutine(result):
+                        await result
+            except Exception as e:
+                account.failures += 1
+                account.last_error = str(e)
+                delay = min(self.retry_delay * 2 ** (account.failures - 1), self.max_retry_delay)
+                account.refresh_at = self.clock() + delay
+                logger.warning("Cookie refresh for %s failed (%d in a row), retrying in %.0fs: %s", account.name, account.failures, delay, str(e))
+                return False
+
+        account.cookies = cookies
+        account.refreshed_at = self.clock()
+        account.failures = 0
+        account.last_error = None
+        self._schedule(account)
+        if account.cookies_path:
+            try:
+                with open(account.cookies_path, "w") as f:
+                    json.dump(cookies, f, indent=4)
+            except OSError as e:
+                logger.warning("Could not save refreshed cookies for %s to %s: %s", account.name, account.cookies_path, str(e))
+        logger.info("Refreshed cookies for %s, next refresh in %.0fs", account.name, account.refresh_at - self.clock())
+        return True
+
+    async def run_once(self) -> int:
+        """
+        Refresh every due account.
+
+        Returns:
+            Number of accounts refreshed successfully
+        """
+        due = self.due()
+        if not due:
+            return 0
+        results = await asyncio.gather(*(self.refresh(account) for account in due))
+        return sum(results)
+
+    async def _run(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error("Cookie refresh pass failed: %s", str(e))
+            await asyncio.sleep(self.check_interval)
+
+    def start(self):
+        """Run refresh passes every check_interval seconds on the running loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def status(self) -> List[Dict[str, Any]]:
+        return [account.to_dict() for account in self.accounts.values()]
+
+
+def load_accounts(path: str) -> List[ManagedAccount]:
+    """
+    Load accounts to keep fresh from a JSON file.
+
+    The file is a list of {"name", "email", "password", "cookies_path"}
+    objects; cookies_path, when given, is read now and rewritten after each
+    refresh. Unreadable cookie files leave the account due at once.
+
+    Raises:
+        OSError, ValueError: If the accounts file cannot be read
+    """
+    with open(path, "r") as f:
+        entries = json.load(f)
+    accounts = []
+    for entry in entries:
+        cookies = None
+        cookies_path = entry.get("cookies_path")
+        if cookies_path:
+            try:
+                with open(cookies_path, "r") as f:
+                    cookies = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning("No usable cookies for %s at %s: %s", entry["name"], cookies_path, str(e))
+        accounts.append(ManagedAccount(entry["name"], entry["email"], entry["password"], cookies, cookies_path))
+    return accounts
@@ -1,8 +1,19 @@
 from requests.cookies import RequestsCookieJar, create_cookie
 import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from custom_lib.client_pool import cookie_set_key
 
 logger = logging.getLogger(__name__)
 
+# Parsed jars kept by cookie_jar_from_json_cached, least recently used dropped first
+JAR_CACHE_MAX_SIZE = 256
+
+_jar_cache: "OrderedDict[str, RequestsCookieJar]" = OrderedDict()
+_jar_cache_lock = threading.Lock()
+
 def cookie_extractor_from_json(cookies_json: dict) -> RequestsCookieJar:
     """
     Creates a cookie jar from JSON cookie data for LinkedIn API use.
@@ -37,4 +48,31 @@ def cookie_extractor_from_json(cookies_json: dict) -> RequestsCookieJar:
 
     except Exception as e:
         logger.error(f"Failed to process cookies: {str(e)}")
-        raise
\ No newline at end of file
+        raise
+
+
+def cookie_jar_from_json_cached(cookies_json: List[Dict[str, Any]], key: Optional[str] = None) -> RequestsCookieJar:
+    """
+    Same as cookie_extractor_from_json, but each LinkedIn session is parsed only once.
+
+    Args:
+        cookies_json: JSON cookie data in EditThisCookie format
+        key: cookie_set_key(cookies_json), when the caller already has it
+
+    Returns:
+        A copy of the memoized jar; clients update their jar from response
+        cookies, so they never share one
+    """
+    key = key or cookie_set_key(cookies_json)
+    with _jar_cache_lock:
+        jar = _jar_cache.get(key)
+        if jar is not None:
+            _jar_cache.move_to_end(key)
+            return jar.copy()
+
+    jar = cookie_extractor_from_json(cookies_json)
+    with _jar_cache_lock:
+        _jar_cache[key] = jar
+        while len(_jar_cache) > JAR_CACHE_MAX_SIZE:
+            _jar_cache.popitem(last=False)
+    return jar.copy()
@@ -0,0 +1,149 @@
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Local part used when a name is too incomplete to apply a pattern ("Nathan B.", "Jane")
+VERIFYING = "verifying"
+
+# Letters NFKD does not decompose into ASCII
+_TRANSLITERATIONS = str.maketrans({
+    "ß": "ss", "æ": "ae", "Æ": "Ae", "œ": "oe", "Œ": "Oe", "ø": "o", "Ø": "O",
+    "ł": "l", "Ł": "L", "đ": "d", "Đ": "D", "ð": "d", "Ð": "D", "þ": "th", "Þ": "Th", "ı": "i",
+})
+
+# Lowercase words that belong to the surname that follows ("van Beethoven", "de la Cruz")
+_SURNAME_PARTICLES = frozenset({
+    "al", "bin", "da", "das", "de", "del", "della", "der", "di", "dos", "du", "el",
+    "la", "le", "st", "van", "von",
+})
+
+# Trailing name suffixes and credentials left out of every pattern
+_SUFFIXES = frozenset({
+    "jr", "sr", "ii", "iii", "iv", "cfa", "cpa", "mba", "phd", "md", "esq", "pmp", "cfp", "frm",
+})
+
+_PARENTHESES = re.compile(r"\([^)]*\)")
+_NON_ALNUM = re.compile(r"[^a-z0-9]")
+_PATTERN_TOKEN = re.compile(r"\[([a-z_]+)\]|([._\-]+)")
+_REPEATED_SEPARATORS = re.compile(r"([._\-])[._\-]+")
+
+
+def transliterate(text: str) -> str:
+    """Fold text to ASCII ("José Ñúñez" -> "Jose Nunez", "Weiß" -> "Weiss")."""
+    if text.isascii():
+        return text
+    text = unicodedata.normalize("NFKD", text.translate(_TRANSLITERATIONS))
+    return "".join(char for char in text if not unicodedata.combining(char)).encode("ascii", "ignore").decode("ascii")
+
+
+def _clean(part: str) -> str:
+    return _NON_ALNUM.sub("", part.lower())
+
+
+@lru_cache(maxsize=8192)
+def parse_name(name: str) -> Optional[Tuple[str, str, str]]:
+    """
+    Split a full name into ASCII (first, middle, last) parts for email patterns.
+
+    Credentials after a comma or in parentheses and suffixes (Jr, CFA, ...) are
+    dropped. Hyphenated surnames and surname particles are kept as one part
+    ("Garcia-Lopez" -> "garcialopez", "Ludwig van Beethoven" -> "vanbeethoven");
+    every other word between first and last goes into middle.
+
+    Returns:
+        (first, middle, last), or None when the name is incomplete: a single
+        word, or a first or last name that is only an initial ("Nathan B.")
+    """
+    name = transliterate(name)
+    if "(" in name:
+        name = _PARENTHESES.sub(" ", name)
+    # (original word, cleaned word) pairs; particles are matched on the original casing
+    words = [(word, cleaned) for word, cleaned in ((word, _clean(word)) for word in name.split(",")[0].split()) if cleaned]
+    while len(words) > 2 and words[-1][1] in _SUFFIXES:
+        words.pop()
+    if len(words) < 2 or len(words[0][1]) < 2 or len(words[-1][1]) < 2:
+        return None
+
+    # The surname starts at the first particle after the first name, else it is the last word.
+    # A capitalised particle is usually a middle name ("Kim Le Nguyen"), unless another
+    # particle follows it ("Maria De La Cruz")
+    start = len(words) - 1
+    for i in range(1, len(words) - 1):
+        word = words[i][0]
+        if word in _SURNAME_PARTICLES or (word.lower() in _SURNAME_PARTICLES and words[i + 1][0].lower() in _SURNAME_PARTICLES):
+            start = i
+            break
+    first = words[0][1]
+    middle = "".join(cleaned for _, cleaned in words[1:start])
+    last = "".join(cleaned for _, cleaned in words[start:])
+    return first, middle, last
+
+
+_TOKENS: Dict[str, Callable[[Tuple[str, str, str]], str]] = {
+    "first": lambda parts: parts[0],
+    "middle": lambda parts: parts[1],
+    "last": lambda parts: parts[2],
+    "first_initial": lambda parts: parts[0][:1],
+    "middle_initial": lambda parts: parts[1][:1],
+    "last_initial": lambda parts: parts[2][:1],
+}
+# Spellings seen on RocketReach pages
+for _alias, _token in (("first_name", "first"), ("last_name", "last"), ("middle_name", "middle"), ("firstname", "first"), ("lastname", "last")):
+    _TOKENS[_alias] = _TOKENS[_token]
+
+
+@lru_cache(maxsize=256)
+def compile_pattern(pattern: str) -> Optional[Callable[[Tuple[str, str, str]], str]]:
+    """
+    Compile a RocketReach pattern such as "[first].[last]" or "[first_initial][last]".
+
+    Returns:
+        Function from parse_name parts to the email local part, or None if the
+        pattern has anything besides known [tokens] and . _ - separators
+    """
+    pattern = pattern.strip().lower().split("@")[0]
+    pieces: List[Callable[[Tuple[str, str, str]], str]] = []
+    position = 0
+    uses_middle = False
+    for match in _PATTERN_TOKEN.finditer(pattern):
+        if match.start() != position:
+            return None
+        token, separator = match.groups()
+        if token is not None:
+            if token not in _TOKENS:
+                return None
+            pieces.append(_TOKENS[token])
+            uses_middle = uses_middle or token.startswith("middle")
+        else:
+            pieces.append(lambda parts, separator=separator: separator)
+        position = match.end()
+    if position != len(pattern) or not any(piece in _TOKENS.values() for piece in pieces):
+        return None
+
+    def format_local_part(parts: Tuple[str, str, str]) -> str:
+        local_part = "".join(piece(parts) for piece in pieces)
+        if uses_middle and not parts[1]:
+            # "[first].[middle].[last]" for a name without a middle name
+            local_part = _REPEATED_SEPARATORS.sub(r"\1", local_part).strip("._-")
+        return local_part
+
+    return format_local_part
+
+
+def format_emails(pattern: str, names: List[str]) -> Optional[List[str]]:
+    """
+    Apply a pattern to every name.
+
+    Returns:
+        Email local parts in the order of names (VERIFYING for incomplete
+        names), or None if compile_pattern cannot parse the pattern
+    """
+    formatter = compile_pattern(pattern)
+    if formatter is None:
+        return None
+    local_parts = []
+    for name in names:
+        parts = parse_name(name)
+        local_parts.append(formatter(parts) if parts is not None else VERIFYING)
+    return local_parts
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+
+from custom_lib.account_pool import AccountPool
+from custom_lib.automail_ai_craft import enrich_profile_async
+from custom_lib.profile_model import Profile
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PipelineEvent:
+    """
+    One step of the enrich -> draft pipeline.
+
+    kind is "enriched", "enrich_failed", "account_dropped", "email",
+    "draft_failed" or "error". index and value refer to the input URL list.
+    """
+    kind: str
+    index: Optional[int] = None
+    value: Optional[str] = None
+    email: Optional[str] = None
+    error: Optional[str] = None
+    account: Optional[str] = None
+
+
+async def run_email_pipeline(
+    account_pool: AccountPool,
+    values: List[str],
+    draft: Callable[[Profile], Awaitable[str]],
+    url_value: bool = True,
+    draft_concurrency: int = 10,
+    draft_pack: Optional[Callable[[List[Profile]], Awaitable[List[str]]]] = None,
+    pack_size: int = 1
+) -> AsyncIterator[PipelineEvent]:
+    """
+    Enrich profiles and draft their emails as a producer/consumer pipeline.
+
+    Every profile is queued for drafting the moment it is enriched, and
+    draft_concurrency workers pull from that queue, so emails start flowing
+    before enrichment has finished and a slow profile only holds up itself.
+    A profile that cannot be enriched is not sent to the LLM: it gets a
+    draft_failed event with an empty email, so every input still gets
+    exactly one "email" or "draft_failed" event.
+
+    Args:
+        account_pool: Accounts to enrich with
+        values: Profile URLs or URN IDs
+        draft: Coroutine drafting the email for one Profile
+        url_value: Whether values are profile URLs
+        draft_concurrency: Number of drafts in flight at once
+        draft_pack: Coroutine drafting several Profiles in one go, used
+            instead of draft when set; results must follow input order, and
+            profiles past the end of a short result are reported as draft_failed
+        pack_size: Most profiles handed to draft_pack at once. Workers take
+            whatever is already enriched up to this size, so packing never
+            waits on a slow profile
+
+    Yields:
+        PipelineEvent in completion order
+    """
+    # Bounded so enrichment never runs far ahead of drafting
+    to_draft: "asyncio.Queue[Optional[tuple]]" = asyncio.Queue(maxsize=draft_concurrency * 2)
+    # None once the producer and every worker have finished
+    events: "asyncio.Queue[Optional[PipelineEvent]]" = asyncio.Queue()
+
+    async def produce():
+        dropped = 0
+        try:
+            async for result in account_pool.iter_enrich(values, url_value=url_value, enrich=enrich_profile_async):
+                for account in account_pool.dropped_accounts[dropped:]:
+                    await events.put(PipelineEvent("account_dropped", error=account.dropped, account=account.name))
+                dropped = len(account_pool.dropped_accounts)
+                if not result.ok:
+                    await events.put(PipelineEvent("enrich_failed", result.index, result.value, error=result.error))
+                    await events.put(PipelineEvent("draft_failed", result.index, result.value, email="", error=result.error))
+                    continue
+                await events.put(PipelineEvent("enriched", result.index, result.value, account=result.account))
+                await to_draft.put((result.index, result.value, result.profile or Profile()))
+        except Exception as e:
+            logger.error("Enrichment pipeline failed: %s", str(e))
+            await events.put(PipelineEvent("error", error=str(e)))
+        finally:
+            for _ in range(draft_concurrency):
+                await to_draft.put(None)
+
+    async def consume():
+        finished = False
+        while not finished:
+            item = await to_draft.get()
+            if item is None:
+                return
+            items = [item]
+            while draft_pack is not None and len(items) < pack_size and not to_draft.empty():
+                item = to_draft.get_nowait()
+                if item is None:
+                    finished = True
+                    break
+                items.append(item)
+            try:
+                if draft_pack is not None:
+                    emails = await draft_pack([profile for _, _, profile in items])
+                else:
+                    emails = [await draft(items[0][2])]
+            except Exception as e:
+                for index, value, _ in items:
+                    logger.error("Failed to draft email for %s: %s", value, str(e))
+                    await events.put(PipelineEvent("draft_failed", index, value, email="", error=str(e)))
+                continue
+            for (index, value, _), email in zip(items, emails):
+                await events.put(PipelineEvent("email", index, value, email=email))
+            for index, value, _ in items[len(emails):]:
+                logger.error("Packed draft returned no email for %s", value)
+                await events.put(PipelineEvent("draft_failed", index, value, email="", error="No email returned for this profile"))
+
+    async def finish(workers: List[asyncio.Task]):
+        # Workers only return once the producer is done, so this fires after the last event
+        await asyncio.gather(*workers, return_exceptions=True)
+        await events.put(None)
+
+    tasks = [asyncio.create_task(produce())]
+    tasks += [asyncio.create_task(consume()) for _ in range(draft_concurrency)]
+    tasks.append(asyncio.create_task(finish(list(tasks))))
+    try:
+        while True:
+            event = await events.get()
+            if event is None:
+                return
+            if event.kind == "error":
+                raise RuntimeError(event.error)
+            yield event
+    finally:
+        for task in tasks:
+            task.cancel()
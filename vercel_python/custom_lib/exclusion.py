@@ -0,0 +1,130 @@
+import base64
+import binascii
+import hashlib
+import math
+from typing import Iterable, Iterator, Optional, Union
+
+# Filters arrive from clients, so their cost per membership test and their size are bounded:
+# 32 hashes is past the optimum for any sane error rate, 1 MiB holds ~900k IDs at 0.1%
+MAX_NUM_HASHES = 32
+MAX_FILTER_BYTES = 1024 * 1024
+# Base64 length of MAX_FILTER_BYTES, checked before decoding
+_MAX_ENCODED_LENGTH = (MAX_FILTER_BYTES + 2) // 3 * 4
+
+
+class BloomFilter:
+    """
+    Fixed-size bloom filter over string IDs.
+
+    Positions use double hashing on a 16 byte blake2b digest of the UTF-8 ID:
+    h1 and h2 are its two little-endian 64 bit halves (h2 forced odd), and the
+    i-th position is (h1 + i * h2) mod num_bits. Bit p lives in byte p // 8 at
+    bit p % 8 (least significant first). Clients building a filter themselves
+    must use the same scheme.
+
+    Serialized as "<num_hashes>:<base64 bits>", see to_string/from_string.
+    """
+
+    def __init__(self, num_bits: int, num_hashes: int, bits: Optional[bytearray] = None):
+        if num_bits <= 0 or num_hashes <= 0:
+            raise ValueError("num_bits and num_hashes must be positive")
+        if num_hashes > MAX_NUM_HASHES:
+            raise ValueError(f"num_hashes must be at most {MAX_NUM_HASHES}")
+        if num_bits > MAX_FILTER_BYTES * 8:
+            raise ValueError(f"Filter must be at most {MAX_FILTER_BYTES} bytes")
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bits if bits is not None else bytearray((num_bits + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float = 0.001) -> "BloomFilter":
+        """
+        Size a filter for capacity IDs at the given false positive rate.
+
+        Raises:
+            ValueError: If error_rate is not in (0, 1) or the filter would exceed MAX_FILTER_BYTES
+        """
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        capacity = max(capacity, 1)
+        num_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        # Round up to whole bytes so the serialized size fully determines num_bits
+        num_bits = (num_bits + 7) // 8 * 8
+        num_hashes = min(MAX_NUM_HASHES, max(1, round(num_bits / capacity * math.log(2))))
+        return cls(num_bits, num_hashes)
+
+    @classmethod
+    def from_ids(cls, ids: Iterable[str], error_rate: float = 0.001) -> "BloomFilter":
+        ids = list(ids)
+        bloom = cls.for_capacity(len(ids), error_rate)
+        for id_ in ids:
+            bloom.add(id_)
+        return bloom
+
+    def _positions(self, id_: str) -> Iterator[int]:
+        digest = hashlib.blake2b(id_.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, id_: str):
+        for position in self._positions(id_):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, id_: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(id_))
+
+    def to_string(self) -> str:
+        return f"{self.num_hashes}:{base64.b64encode(bytes(self.bits)).decode('ascii')}"
+
+    @classmethod
+    def from_string(cls, encoded: str) -> "BloomFilter":
+        """
+        Parse a filter serialized with to_string.
+
+        Raises:
+            ValueError: If the string is not a valid encoded filter, or its
+                num_hashes or size exceed MAX_NUM_HASHES / MAX_FILTER_BYTES
+        """
+        try:
+            num_hashes, data = encoded.split(":", 1)
+            if len(data) > _MAX_ENCODED_LENGTH:
+                raise ValueError(f"Filter must be at most {MAX_FILTER_BYTES} bytes")
+            bits = bytearray(base64.b64decode(data, validate=True))
+            return cls(len(bits) * 8, int(num_hashes), bits)
+        except (binascii.Error, ValueError) as e:
+            raise ValueError(f"Invalid bloom filter encoding: {str(e)}") from e
+
+    @classmethod
+    def parse(cls, bloom: Union[str, "BloomFilter", None]) -> Optional["BloomFilter"]:
+        """Accept an encoded filter, an already parsed one or None."""
+        if bloom is None or isinstance(bloom, BloomFilter):
+            return bloom
+        return cls.from_string(bloom) if bloom else None
+
+
+class ExclusionSet:
+    """
+    IDs to leave out of search results.
+
+    Membership is checked against a set built from the raw ID list and,
+    optionally, a BloomFilter the client sent instead of (or on top of) the
+    list. A bloom hit may be a false positive, which only ever drops a
+    candidate, never lets an excluded one through. IDs added while collecting
+    results go into a private set, so the caller's list is never modified.
+
+    Args:
+        ids: Raw IDs to exclude
+        bloom: Optional BloomFilter of further IDs to exclude
+    """
+
+    def __init__(self, ids: Optional[Iterable[str]] = None, bloom: Optional[BloomFilter] = None):
+        self.ids = set(ids or ())
+        self.bloom = bloom
+
+    def __contains__(self, id_: str) -> bool:
+        return id_ in self.ids or (self.bloom is not None and id_ in self.bloom)
+
+    def add(self, id_: str):
+        self.ids.add(id_)
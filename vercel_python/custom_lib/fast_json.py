@@ -0,0 +1,51 @@
+import json
+import logging
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+# orjson is optional: it encodes the large enrich/search payloads several times faster,
+# and the stdlib encoder below produces the same bytes starlette's JSONResponse would
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _stdlib_dumps(content: Any) -> bytes:
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode content as compact UTF-8 JSON.
+
+    Uses orjson when installed, falling back to the stdlib for anything it
+    rejects (integers over 64 bits, non-string dict keys, ...).
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return _stdlib_dumps(content)
+
+
+def dumps_line(content: Any) -> str:
+    """Encode one newline-terminated record of a streamed response."""
+    return dumps(content).decode("utf-8") + "\n"
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with dumps(); used as the app's default response class."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,206 @@
+import json
+import logging
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from custom_lib.resolution_cache import normalize_name
+
+logger = logging.getLogger(__name__)
+
+GEO_TYPES = ("MARKET_AREA", "CITY", "ADMIN_DIVISION_1", "COUNTRY_REGION")
+
+# Seed entries shipped with the app, built from captured typeahead payloads
+DEFAULT_SEED_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "geo_seed.json")
+
+
+def infer_geo_type(title: str) -> str:
+    """
+    Guess the LinkedIn geo type from a typeahead title.
+
+    "New York City Metropolitan Area" is a MARKET_AREA, "Brooklyn, New York,
+    United States" a CITY, "New York, United States" an ADMIN_DIVISION_1 and
+    "Canada" a COUNTRY_REGION.
+    """
+    if title.endswith(" Area"):
+        return "MARKET_AREA"
+    parts = title.count(",") + 1
+    if parts >= 3:
+        return "CITY"
+    if parts == 2:
+        return "ADMIN_DIVISION_1"
+    return "COUNTRY_REGION"
+
+
+class GeoEntry:
+    __slots__ = ("geo_id", "title", "geo_type")
+
+    def __init__(self, geo_id: str, title: str, geo_type: str):
+        self.geo_id = geo_id
+        self.title = title
+        self.geo_type = geo_type
+
+    def to_dict(self) -> Dict[str, str]:
+        return {"geo_id": self.geo_id, "title": self.title, "type": self.geo_type}
+
+
+class _TrieNode:
+    __slots__ = ("children", "geo_id", "strength")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.geo_id: Optional[str] = None
+        self.strength = -1
+
+
+class GeoGazetteer:
+    """
+    Offline index of LinkedIn locations: names and aliases -> geo URN IDs.
+
+    Every name is normalized with normalize_name and stored in a character
+    trie, so exact lookups and prefix completion are both a walk down the
+    trie. Three kinds of keys are indexed, strongest first:
+
+    - query: text typed into the typeahead, mapped to its first result
+      (what LinkedinWrapper.search_geo returns live)
+    - title: the full typeahead title ("Brooklyn, New York, United States")
+    - alias: the leading part of the title ("Brooklyn"), owned by the best
+      ranked entry that has it
+
+    A weaker key never overwrites a stronger one. Aliases only feed
+    complete(): "Paris" is the leading word of "Paris, Texas, United States"
+    but not a name for it, so lookup() answers from query and title keys only.
+    """
+
+    _STRENGTH = {"alias": 0, "title": 1, "query": 2}
+
+    def __init__(self):
+        self.entries: Dict[str, GeoEntry] = {}
+        self._root = _TrieNode()
+        self._key_strength: Dict[str, int] = {}
+        self._queries: Dict[str, List[Tuple[str, str]]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _index(self, name: str, geo_id: str, kind: str):
+        key = normalize_name(name)
+        if not key:
+            return
+        strength = self._STRENGTH[kind]
+        if self._key_strength.get(key, -1) >= strength:
+            return
+        self._key_strength[key] = strength
+        node = self._root
+        for char in key:
+            node = node.children.setdefault(char, _TrieNode())
+        node.geo_id = geo_id
+        node.strength = strength
+
+    def _find(self, key: str) -> Optional[_TrieNode]:
+        node = self._root
+        for char in key:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def add(self, geo_id: str, title: str, geo_type: Optional[str] = None):
+        """Index one location under its title and leading alias."""
+        with self._lock:
+            if geo_id not in self.entries:
+                self.entries[geo_id] = GeoEntry(geo_id, title, geo_type or infer_geo_type(title))
+            self._index(title, geo_id, "title")
+            self._index(title.split(",")[0], geo_id, "alias")
+
+    def add_typeahead(self, elements: List[Tuple[str, str]], query: Optional[str] = None):
+        """
+        Index a typeahead response (see geo_typeahead_elements).
+
+        Args:
+            elements: (geo_id, title) pairs in rank order
+            query: Text the typeahead was called with; mapped to the first element
+        """
+        for geo_id, title in elements:
+            self.add(geo_id, title)
+        if query and elements:
+            with self._lock:
+                self._index(query, elements[0][0], "query")
+                self._queries[normalize_name(query)] = list(elements)
+
+    def lookup(self, name: str) -> Optional[str]:
+        """Return the geo ID for an exact (normalized) query or title, or None."""
+        node = self._find(normalize_name(name))
+        if node is None or node.strength < self._STRENGTH["title"]:
+            return None
+        return node.geo_id
+
+    def complete(self, prefix: str, limit: int = 10, geo_type: Optional[str] = None) -> List[GeoEntry]:
+        """
+        Return known locations whose name starts with prefix, shortest name first.
+
+        Args:
+            prefix: Partial location name
+            limit: Maximum entries returned
+            geo_type: Only return entries of this type (see GEO_TYPES)
+        """
+        start = self._find(normalize_name(prefix))
+        if start is None:
+            return []
+        results: List[GeoEntry] = []
+        seen = set()
+        # Breadth first, so shorter (usually broader) names come first
+        level = [start]
+        while level and len(results) < limit:
+            next_level = []
+            for node in level:
+                if node.geo_id is not None and node.geo_id not in seen:
+                    seen.add(node.geo_id)
+                    entry = self.entries.get(node.geo_id)
+                    if entry is not None and (geo_type is None or entry.geo_type == geo_type):
+                        results.append(entry)
+                        if len(results) >= limit:
+                            break
+                next_level.extend(node.children[char] for char in sorted(node.children))
+            level = next_level
+        return results
+
+    def to_seed(self) -> List[Dict]:
+        """Serialize recorded typeahead responses in the geo_seed.json format."""
+        return [
+            {"query": query, "elements": [{"geo_id": geo_id, "title": title} for geo_id, title in elements]}
+            for query, elements in self._queries.items()
+        ]
+
+    def load_seed(self, seed: Iterable[Dict]):
+        for item in seed:
+            elements = [(element["geo_id"], element["title"]) for element in item.get("elements", [])]
+            self.add_typeahead(elements, query=item.get("query"))
+
+    @classmethod
+    def from_seed_file(cls, path: str = DEFAULT_SEED_PATH) -> "GeoGazetteer":
+        gazetteer = cls()
+        try:
+            with open(path, "r") as f:
+                gazetteer.load_seed(json.load(f))
+        except (OSError, ValueError) as e:
+            logger.warning("Could not load geo seed %s: %s", path, str(e))
+        logger.info("Loaded geo gazetteer with %d locations", len(gazetteer))
+        return gazetteer
+
+
+if __name__ == "__main__":
+    # Build or extend the seed file from captured typeahead payloads:
+    #   python -m custom_lib.geo_gazetteer new_york_geo_raw.json "New York"
+    import sys
+
+    from custom_lib.linkedin_wrapper import geo_typeahead_elements
+
+    gazetteer = GeoGazetteer.from_seed_file()
+    for path, query in zip(sys.argv[1::2], sys.argv[2::2]):
+        with open(path, "r") as f:
+            gazetteer.add_typeahead(geo_typeahead_elements(json.load(f)), query=query)
+    with open(DEFAULT_SEED_PATH, "w") as f:
+        json.dump(gazetteer.to_seed(), f, indent=2)
+    print(f"Wrote {len(gazetteer)} locations to {DEFAULT_SEED_PATH}")
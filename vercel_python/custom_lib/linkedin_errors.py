@@ -0,0 +1,19 @@
+# Raised by LinkedinWrapperAsync. Kept free of third-party imports so callers that
+# only catch these (e.g. AccountPool) don't load linkedin_api and aiohttp.
+
+
+class UnauthorizedException(Exception):
+    pass
+
+
+class ChallengeException(Exception):
+    pass
+
+
+class ThrottledException(Exception):
+    pass
+
+
+# A 403 on one resource (private profile or company); the session itself may still be fine
+class ForbiddenException(Exception):
+    pass
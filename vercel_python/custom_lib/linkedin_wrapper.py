@@ -1,11 +1,347 @@
-from typing import List, Dict, Optional, Union, Literal
+from typing import Iterable, List, Dict, Optional, Tuple, Union, Literal
 from linkedin_api import Linkedin as BaseLinkedin
 from operator import itemgetter
 from linkedin_api.utils.helpers import get_id_from_urn, get_urn_from_raw_update 
+from requests.exceptions import TooManyRedirects
+
+# Status codes LinkedIn returns once a session is logged out or challenged
+INVALID_SESSION_STATUS_CODES = (401, 999)
+# Returned for private profiles and companies too, so on its own it says nothing about the session
+FORBIDDEN_STATUS_CODE = 403
+
+GEO_TYPEAHEAD_QUERY_ID = "voyagerSearchDashReusableTypeahead.54529a68d290553c6f24e28ab3448654"
+
+def geo_typeahead_uri(keywords: str) -> str:
+    """Build the typeahead URI used to resolve a location name into geo URNs."""
+    # Convert params to the format expected by the API
+    formatted_params = f"(keywords:{keywords},query:(typeaheadFilterQuery:(geoSearchTypes:List(MARKET_AREA,COUNTRY_REGION,ADMIN_DIVISION_1,CITY))),type:GEO)"
+    return f"/graphql?variables={formatted_params}&queryId={GEO_TYPEAHEAD_QUERY_ID}"
+
+def geo_typeahead_elements(data: Dict) -> List[Tuple[str, str]]:
+    """Return (geo URN ID, title) pairs of a typeahead response, in rank order."""
+    if "included" not in data:
+        return []
+
+    elements = data\
+        .get("data", {})\
+        .get("data", {})\
+        .get("searchDashReusableTypeaheadByType", {})\
+        .get("elements", [])
+    return [
+        (get_id_from_urn(element["trackingUrn"]), element["title"]["text"])
+        for element in elements
+        if element.get("trackingUrn") and (element.get("title") or {}).get("text")
+    ]
+
+def build_people_search_params(
+    keywords: Optional[str] = None,
+    connection_of: Optional[str] = None,
+    network_depths: Optional[
+        List[Union[Literal["F"], Literal["S"], Literal["O"]]]
+    ] = None,
+    current_company: Optional[List[str]] = None,
+    past_companies: Optional[List[str]] = None,
+    or_past_companies: bool = False,
+    nonprofit_interests: Optional[List[str]] = None,
+    profile_languages: Optional[List[str]] = None,
+    regions: Optional[List[str]] = None,
+    or_regions: bool = False,
+    industries: Optional[List[str]] = None,
+    schools: Optional[List[str]] = None,
+    or_schools: bool = False,
+    contact_interests: Optional[List[str]] = None,
+    service_categories: Optional[List[str]] = None,
+    # Keywords filter
+    keyword_first_name: Optional[str] = None,
+    keyword_last_name: Optional[str] = None,
+    # `keyword_title` and `title` are the same. We kept `title` for backward compatibility. Please only use one of them.
+    keyword_title: Optional[str] = None,
+    keyword_company: Optional[str] = None,
+    keyword_school: Optional[str] = None,
+    network_depth: Optional[
+        Union[Literal["F"], Literal["S"], Literal["O"]]
+    ] = None,  # DEPRECATED - use network_depths
+    title: Optional[str] = None,  # DEPRECATED - use keyword_title
+) -> Dict:
+    """Build the `search` params for a people search. See LinkedinWrapper.search_people for the filters."""
+    filters = ["(key:resultType,value:List(PEOPLE))"]
+    if connection_of:
+        filters.append(f"(key:connectionOf,value:List({connection_of}))")
+    if network_depths:
+        stringify = " | ".join(network_depths)
+        filters.append(f"(key:network,value:List({stringify}))")
+    elif network_depth:
+        filters.append(f"(key:network,value:List({network_depth}))")
+    if regions:
+        if or_regions:
+            stringify = ",".join(regions)
+        else:
+            stringify = " | ".join(regions)
+        filters.append(f"(key:geoUrn,value:List({stringify}))")
+    if industries:
+        stringify = " | ".join(industries)
+        filters.append(f"(key:industry,value:List({stringify}))")
+    if current_company:
+        stringify = " | ".join(current_company)
+        filters.append(f"(key:currentCompany,value:List({stringify}))")
+    if past_companies:
+        if or_past_companies:
+            stringify = ",".join(past_companies)
+        else:
+            stringify = " | ".join(past_companies)
+        filters.append(f"(key:pastCompany,value:List({stringify}))")
+    if profile_languages:
+        stringify = " | ".join(profile_languages)
+        filters.append(f"(key:profileLanguage,value:List({stringify}))")
+    if nonprofit_interests:
+        stringify = " | ".join(nonprofit_interests)
+        filters.append(f"(key:nonprofitInterest,value:List({stringify}))")
+    if schools:
+        if or_schools:
+            stringify = ",".join(schools)
+        else:
+            stringify = " | ".join(schools)
+        filters.append(f"(key:schoolFilter,value:List({stringify}))")
+    if service_categories:
+        stringify = " | ".join(service_categories)
+        filters.append(f"(key:serviceCategory,value:List({stringify}))")
+    # `Keywords` filter
+    keyword_title = keyword_title if keyword_title else title
+    if keyword_first_name:
+        filters.append(f"(key:firstName,value:List({keyword_first_name}))")
+    if keyword_last_name:
+        filters.append(f"(key:lastName,value:List({keyword_last_name}))")
+    if keyword_title:
+        filters.append(f"(key:title,value:List({keyword_title}))")
+    if keyword_company:
+        filters.append(f"(key:company,value:List({keyword_company}))")
+    if keyword_school:
+        filters.append(f"(key:school,value:List({keyword_school}))")
+
+    params = {"filters": "List({})".format(",".join(filters))}
+
+    if keywords:
+        params["keywords"] = keywords
+
+    return params
+
+def parse_people_search_results(data: List[Dict], include_private_profiles: bool = False) -> List[Dict]:
+    """Reduce raw people search elements to the minimal profile fields."""
+    results = []
+    for item in data:
+        if (
+            not include_private_profiles
+            and (item.get("entityCustomTrackingInfo") or {}).get(
+                "memberDistance", None
+            )
+            == "OUT_OF_NETWORK"
+        ):
+            continue
+        # results.append(item)
+        results.append(
+            {
+                "urn_id": get_id_from_urn(
+                    get_urn_from_raw_update(item.get("entityUrn", None))
+                ),
+                "distance": (item.get("entityCustomTrackingInfo") or {}).get(
+                    "memberDistance", None
+                ),
+                "jobtitle": (item.get("primarySubtitle") or {}).get("text", None),
+                "location": (item.get("secondarySubtitle") or {}).get("text", None),
+                "name": (item.get("title") or {}).get("text", None),
+                "url": item.get("navigationUrl", None),
+            }
+        )
+
+    return results
+
+def parse_company_search_results(data: List[Dict]) -> List[Dict]:
+    """Reduce raw company search elements to urn_id/name/headline/subline (same shape as search_companies)."""
+    results = []
+    for item in data:
+        if "company" not in item.get("trackingUrn"):
+            continue
+        results.append(
+            {
+                "urn_id": get_id_from_urn(item.get("trackingUrn", None)),
+                "name": (item.get("title") or {}).get("text", None),
+                "headline": (item.get("primarySubtitle") or {}).get("text", None),
+                "subline": (item.get("secondarySubtitle") or {}).get("text", None),
+            }
+        )
+    return results
+
+# Sections of a profileView payload that massage_profile_view can build. The top card
+# (names, headline, location, ids) is always included.
+PROFILE_SECTIONS = (
+    "images",
+    "experience",
+    "education",
+    "languages",
+    "publications",
+    "certifications",
+    "volunteer",
+    "honors",
+    "projects",
+    "skills",
+)
+
+# Top card keys that are never returned
+_DROPPED_PROFILE_KEYS = ("miniProfile", "defaultLocale", "supportedLocales", "versionTag", "showEducationOnProfileTopCard")
+
+# Sections that only need their entityUrn stripped, by payload view
+_SIMPLE_SECTION_VIEWS = {
+    "languages": "languageView",
+    "certifications": "certificationView",
+    "volunteer": "volunteerExperienceView",
+    "honors": "honorView",
+    "projects": "projectView",
+    "skills": "skillView",
+}
+
+def _without_urn(item: Dict) -> Dict:
+    return {key: value for key, value in item.items() if key != "entityUrn"}
+
+def _massage_experience(data: Dict) -> List[Dict]:
+    processed_experience = []
+    for experience in data["positionGroupView"]["elements"]:
+        if "miniCompany" in experience:
+            company_name = experience.get("name", "")
+            company_public_id = experience.get("miniCompany", {}).get("universalName", "")
+
+            # Process each position within the company
+            for position in experience.get("positions", []):
+                experience_entry = {
+                    "title": position.get("title", "No title available"),
+                    "companyName": company_name,
+                    "companyPublicId": company_public_id,
+                    "description": position.get("description", "No description available"),
+                    "startDate": None,
+                    "endDate": None
+                }
+
+                # Extract dates
+                time_period = position.get("timePeriod", {})
+                if "startDate" in time_period:
+                    experience_entry["startDate"] = time_period["startDate"]
+                if "endDate" in time_period:
+                    experience_entry["endDate"] = time_period["endDate"]
+
+                # Get company logo if available
+                if "company" in position and "miniCompany" in position["company"]:
+                    if "logo" in position["company"]["miniCompany"]:
+                        logo = position["company"]["miniCompany"]["logo"].get(
+                            "com.linkedin.common.VectorImage"
+                        )
+                        if logo:
+                            experience_entry["companyLogoUrl"] = logo["rootUrl"]
+
+                processed_experience.append(experience_entry)
+    return processed_experience
+
+def _massage_education(data: Dict) -> List[Dict]:
+    education = []
+    for item in data["educationView"]["elements"]:
+        if "school" in item and "logo" in item["school"]:
+            school = {key: value for key, value in item["school"].items() if key != "logo"}
+            school["logoUrl"] = item["school"]["logo"]["com.linkedin.common.VectorImage"]["rootUrl"]
+            item = {**item, "school": school}
+        education.append(item)
+    return education
+
+def _massage_publications(data: Dict) -> List[Dict]:
+    publications = []
+    for item in data["publicationView"]["elements"]:
+        publication = _without_urn(item)
+        if "authors" in item:
+            publication["authors"] = [_without_urn(author) for author in item["authors"]]
+        publications.append(publication)
+    return publications
+
+def massage_profile_view(data: Dict, sections: Optional[Iterable[str]] = None) -> Dict:
+    """
+    Flatten a raw profileView payload into the profile dict returned by get_profile.
+
+    Only the requested sections are walked and copied; the payload itself is
+    left untouched, so a cached payload can be massaged again.
+
+    Args:
+        data: Raw profileView JSON
+        sections: Subset of PROFILE_SECTIONS to include, all of them by default
+
+    Returns:
+        Profile dict with the top card fields plus one key per requested section
+    """
+    sections = PROFILE_SECTIONS if sections is None else tuple(sections)
+    unknown = set(sections) - set(PROFILE_SECTIONS)
+    if unknown:
+        raise ValueError(f"Unknown profile sections: {sorted(unknown)}")
+
+    # massage [profile] data
+    raw_profile = data["profile"]
+    profile = {key: value for key, value in raw_profile.items() if key not in _DROPPED_PROFILE_KEYS}
+    mini_profile = raw_profile.get("miniProfile")
+    if mini_profile is not None:
+        if "images" in sections and "picture" in mini_profile:
+            vector_image = mini_profile["picture"]["com.linkedin.common.VectorImage"]
+            profile["displayPictureUrl"] = vector_image["rootUrl"]
+            for img in vector_image["artifacts"]:
+                w, h, url_segment = itemgetter(
+                    "width", "height", "fileIdentifyingUrlPathSegment"
+                )(img)
+                profile[f"img_{w}_{h}"] = url_segment
+
+        profile["profile_id"] = get_id_from_urn(mini_profile["entityUrn"])
+        profile["profile_urn"] = mini_profile["entityUrn"]
+        profile["member_urn"] = mini_profile["objectUrn"]
+        profile["public_id"] = mini_profile["publicIdentifier"]
+
+    if "experience" in sections:
+        profile["experience"] = _massage_experience(data)
+    if "education" in sections:
+        profile["education"] = _massage_education(data)
+    if "publications" in sections:
+        profile["publications"] = _massage_publications(data)
+    for section, view in _SIMPLE_SECTION_VIEWS.items():
+        if section in sections:
+            profile[section] = [_without_urn(item) for item in data[view]["elements"]]
+
+    profile["urn_id"] = profile["entityUrn"].replace("urn:li:fs_profile:", "")
+
+    return profile
 
 class LinkedinWrapper(BaseLinkedin):
-    def __init__(self, username, password, *, authenticate=True, refresh_cookies=False, debug=False, proxies={}, cookies=None, cookies_dir: str = ""):
+    def __init__(self, username, password, *, authenticate=True, refresh_cookies=False, debug=False, proxies={}, cookies=None, cookies_dir: str = "", profile_cache=None, resolution_cache=None, gazetteer=None):
         super().__init__(username, password, authenticate=authenticate, refresh_cookies=refresh_cookies, debug=debug, proxies=proxies, cookies=cookies, cookies_dir=cookies_dir)
+        # Optional ProfileCache consulted by get_profile before hitting LinkedIn
+        self.profile_cache = profile_cache
+        # Optional ResolutionCache for company and geo name lookups
+        self.resolution_cache = resolution_cache
+        # Optional GeoGazetteer answering known location names without a request
+        self.gazetteer = gazetteer
+        # Flipped once LinkedIn rejects the session so pooled clients get evicted
+        self.session_invalid = False
+
+    def _check_session(self, res):
+        if res.status_code in INVALID_SESSION_STATUS_CODES or "checkpoint/challenge" in res.url:
+            self.logger.warning("LinkedIn rejected session with status %d", res.status_code)
+            self.session_invalid = True
+        return res
+
+    def _fetch(self, uri: str, *args, **kwargs):
+        try:
+            return self._check_session(super()._fetch(uri, *args, **kwargs))
+        except TooManyRedirects:
+            # Expired cookies make LinkedIn bounce between login redirects
+            self.session_invalid = True
+            raise
+
+    def _post(self, uri: str, *args, **kwargs):
+        try:
+            return self._check_session(super()._post(uri, *args, **kwargs))
+        except TooManyRedirects:
+            self.session_invalid = True
+            raise
     
     def search_geo(self, keywords: str, **kwargs) -> List[Dict]:
         """Search for geographic locations on LinkedIn.
@@ -17,30 +353,39 @@ class LinkedinWrapper(BaseLinkedin):
         Returns:
             List of location results with their details
         """
-        
-        # Convert params to the format expected by the API
-        formatted_params = f"(keywords:{keywords},query:(typeaheadFilterQuery:(geoSearchTypes:List(MARKET_AREA,COUNTRY_REGION,ADMIN_DIVISION_1,CITY))),type:GEO)"
-        
-        uri = f"/graphql?variables={formatted_params}&queryId=voyagerSearchDashReusableTypeahead.54529a68d290553c6f24e28ab3448654"
-        
-        res = self._fetch(uri, headers={"accept": "application/vnd.linkedin.normalized+json+2.1"})
-        data = res.json()
+        if self.gazetteer is not None:
+            geo_id = self.gazetteer.lookup(keywords)
+            if geo_id is not None:
+                return geo_id
+
+        def lookup():
+            res = self._fetch(geo_typeahead_uri(keywords), headers={"accept": "application/vnd.linkedin.normalized+json+2.1"})
+            elements = geo_typeahead_elements(res.json())
+            if self.gazetteer is not None:
+                # Keep every result, so later lookups of nearby places stay offline
+                self.gazetteer.add_typeahead(elements, query=keywords)
+            return elements[0][0] if elements else []
+
+        if self.resolution_cache is None:
+            return lookup()
+        return self.resolution_cache.resolve("geo", keywords, lookup) or []
+
+    def resolve_company(self, name: str) -> Optional[Dict]:
+        """Resolve a company name to its best search match.
 
-        # with open('test.json', 'w') as f:
-        #     import json
-        #     json.dump(data, f, indent=4)
-        
-        if "included" not in data:
-            return []
-            
-        results = []
-        first_location = data\
-            .get("data", [])\
-            .get("data", [])\
-            .get("searchDashReusableTypeaheadByType", [])['elements'][0]
-        geo_urn = get_id_from_urn(first_location['trackingUrn'])
-        
-        return geo_urn
+        Args:
+            name: Company name as typed by the user
+
+        Returns:
+            {"urn_id", "name"} of the first company search result, or None
+        """
+        def lookup():
+            results = self.search_companies(keywords=[name], limit=10, offset=0)
+            return {"urn_id": results[0]["urn_id"], "name": results[0]["name"]} if results else None
+
+        if self.resolution_cache is None:
+            return lookup()
+        return self.resolution_cache.resolve("company", name, lookup)
     
     def search_people(
         self,
@@ -125,98 +470,38 @@ class LinkedinWrapper(BaseLinkedin):
         :return: List of profiles (minimal data only)
         :rtype: list
         """
-        filters = ["(key:resultType,value:List(PEOPLE))"]
-        if connection_of:
-            filters.append(f"(key:connectionOf,value:List({connection_of}))")
-        if network_depths:
-            stringify = " | ".join(network_depths)
-            filters.append(f"(key:network,value:List({stringify}))")
-        elif network_depth:
-            filters.append(f"(key:network,value:List({network_depth}))")
-        if regions:
-            if or_regions:
-                stringify = ",".join(regions)
-            else:
-                stringify = " | ".join(regions)
-            filters.append(f"(key:geoUrn,value:List({stringify}))")
-        if industries:
-            stringify = " | ".join(industries)
-            filters.append(f"(key:industry,value:List({stringify}))")
-        if current_company:
-            stringify = " | ".join(current_company)
-            filters.append(f"(key:currentCompany,value:List({stringify}))")
-        if past_companies:
-            if or_past_companies:
-                stringify = ",".join(past_companies)
-            else:
-                stringify = " | ".join(past_companies)
-            filters.append(f"(key:pastCompany,value:List({stringify}))")
-        if profile_languages:
-            stringify = " | ".join(profile_languages)
-            filters.append(f"(key:profileLanguage,value:List({stringify}))")
-        if nonprofit_interests:
-            stringify = " | ".join(nonprofit_interests)
-            filters.append(f"(key:nonprofitInterest,value:List({stringify}))")
-        if schools:
-            if or_schools:
-                stringify = ",".join(schools)
-            else:
-                stringify = " | ".join(schools)
-            filters.append(f"(key:schoolFilter,value:List({stringify}))")
-        if service_categories:
-            stringify = " | ".join(service_categories)
-            filters.append(f"(key:serviceCategory,value:List({stringify}))")
-        # `Keywords` filter
-        keyword_title = keyword_title if keyword_title else title
-        if keyword_first_name:
-            filters.append(f"(key:firstName,value:List({keyword_first_name}))")
-        if keyword_last_name:
-            filters.append(f"(key:lastName,value:List({keyword_last_name}))")
-        if keyword_title:
-            filters.append(f"(key:title,value:List({keyword_title}))")
-        if keyword_company:
-            filters.append(f"(key:company,value:List({keyword_company}))")
-        if keyword_school:
-            filters.append(f"(key:school,value:List({keyword_school}))")
-
-        params = {"filters": "List({})".format(",".join(filters))}
-
-        if keywords:
-            params["keywords"] = keywords
+        params = build_people_search_params(
+            keywords=keywords,
+            connection_of=connection_of,
+            network_depths=network_depths,
+            current_company=current_company,
+            past_companies=past_companies,
+            or_past_companies=or_past_companies,
+            nonprofit_interests=nonprofit_interests,
+            profile_languages=profile_languages,
+            regions=regions,
+            or_regions=or_regions,
+            industries=industries,
+            schools=schools,
+            or_schools=or_schools,
+            contact_interests=contact_interests,
+            service_categories=service_categories,
+            keyword_first_name=keyword_first_name,
+            keyword_last_name=keyword_last_name,
+            keyword_title=keyword_title,
+            keyword_company=keyword_company,
+            keyword_school=keyword_school,
+            network_depth=network_depth,
+            title=title,
+        )
 
         data = self.search(params, **kwargs)
 
-        results = []
-        from pprint import pprint
-        for item in data:
-            if (
-                not include_private_profiles
-                and (item.get("entityCustomTrackingInfo") or {}).get(
-                    "memberDistance", None
-                )
-                == "OUT_OF_NETWORK"
-            ):
-                continue
-            # results.append(item)
-            results.append(
-                {
-                    "urn_id": get_id_from_urn(
-                        get_urn_from_raw_update(item.get("entityUrn", None))
-                    ),
-                    "distance": (item.get("entityCustomTrackingInfo") or {}).get(
-                        "memberDistance", None
-                    ),
-                    "jobtitle": (item.get("primarySubtitle") or {}).get("text", None),
-                    "location": (item.get("secondarySubtitle") or {}).get("text", None),
-                    "name": (item.get("title") or {}).get("text", None),
-                    "url": item.get("navigationUrl", None),
-                }
-            )
-
-        return results
+        return parse_people_search_results(data, include_private_profiles)
 
     def get_profile(
-        self, public_id: Optional[str] = None, urn_id: Optional[str] = None
+        self, public_id: Optional[str] = None, urn_id: Optional[str] = None,
+        sections: Optional[Iterable[str]] = None
     ) -> Dict:
         """Fetch data for a given LinkedIn profile.
 
@@ -224,13 +509,21 @@ class LinkedinWrapper(BaseLinkedin):
         :type public_id: str, optional
         :param urn_id: LinkedIn URN ID for a profile
         :type urn_id: str, optional
+        :param sections: Subset of PROFILE_SECTIONS to massage, all by default
+        :type sections: iterable of str, optional
 
         :return: Profile data
         :rtype: dict
         """
         # NOTE this still works for now, but will probably eventually have to be converted to
         # https://www.linkedin.com/voyager/api/identity/profiles/ACoAAAKT9JQBsH7LwKaE9Myay9WcX8OVGuDq9Uw
-        res = self._fetch(f"/identity/profiles/{public_id or urn_id}/profileView")
+        profile_id = public_id or urn_id
+        if self.profile_cache is not None:
+            data = self.profile_cache.get(profile_id)
+            if data is not None:
+                return massage_profile_view(data, sections)
+
+        res = self._fetch(f"/identity/profiles/{profile_id}/profileView")
 
         data = res.json()
 
@@ -238,147 +531,10 @@ class LinkedinWrapper(BaseLinkedin):
             self.logger.info("request failed with status %d", data["status"])
             return {}
 
-        # massage [profile] data
-        profile = data["profile"]
-        if "miniProfile" in profile:
-            if "picture" in profile["miniProfile"]:
-                profile["displayPictureUrl"] = profile["miniProfile"]["picture"][
-                    "com.linkedin.common.VectorImage"
-                ]["rootUrl"]
-
-                images_data = profile["miniProfile"]["picture"][
-                    "com.linkedin.common.VectorImage"
-                ]["artifacts"]
-                for img in images_data:
-                    w, h, url_segment = itemgetter(
-                        "width", "height", "fileIdentifyingUrlPathSegment"
-                    )(img)
-                    profile[f"img_{w}_{h}"] = url_segment
-
-            profile["profile_id"] = get_id_from_urn(profile["miniProfile"]["entityUrn"])
-            profile["profile_urn"] = profile["miniProfile"]["entityUrn"]
-            profile["member_urn"] = profile["miniProfile"]["objectUrn"]
-            profile["public_id"] = profile["miniProfile"]["publicIdentifier"]
-
-            del profile["miniProfile"]
-
-        del profile["defaultLocale"]
-        del profile["supportedLocales"]
-        del profile["versionTag"]
-        del profile["showEducationOnProfileTopCard"]
-
-        # massage [experience] data
-        experience = data["positionView"]["elements"]
-        for item in experience:
-            if "company" in item and "miniCompany" in item["company"]:
-                if "logo" in item["company"]["miniCompany"]:
-                    logo = item["company"]["miniCompany"]["logo"].get(
-                        "com.linkedin.common.VectorImage"
-                    )
-                    if logo:
-                        item["companyLogoUrl"] = logo["rootUrl"]
-                del item["company"]["miniCompany"]
-
-        profile["experience"] = experience
-
-        # massage experience position data
-        enriched_experiences = data["positionGroupView"]["elements"]
-        processed_experience = []
-        
-        for experience in enriched_experiences:
-            if "miniCompany" in experience:
-                company_name = experience.get("name", "")
-                company_public_id = experience.get("miniCompany", {}).get("universalName", "")
-            
-                # Process each position within the company
-                for position in experience.get("positions", []):
-                    experience_entry = {
-                        "title": position.get("title", "No title available"),
-                        "companyName": company_name,
-                        "companyPublicId": company_public_id,
-                        "description": position.get("description", "No description available"),
-                        "startDate": None,
-                        "endDate": None
-                    }
-                
-                    # Extract dates     
-                    time_period = position.get("timePeriod", {})
-                    if "startDate" in time_period:
-                        experience_entry["startDate"] = time_period["startDate"]
-                    if "endDate" in time_period:
-                        experience_entry["endDate"] = time_period["endDate"]
-                        
-                    # Get company logo if available
-                    if "company" in position and "miniCompany" in position["company"]:
-                        if "logo" in position["company"]["miniCompany"]:
-                            logo = position["company"]["miniCompany"]["logo"].get(
-                                "com.linkedin.common.VectorImage"
-                            )
-                            if logo:
-                                experience_entry["companyLogoUrl"] = logo["rootUrl"]
-                        
-                    processed_experience.append(experience_entry)
-        
-        profile["experience"] = processed_experience
-
-        # massage [education] data
-        education = data["educationView"]["elements"]
-        for item in education:
-            if "school" in item:
-                if "logo" in item["school"]:
-                    item["school"]["logoUrl"] = item["school"]["logo"][
-                        "com.linkedin.common.VectorImage"
-                    ]["rootUrl"]
-                    del item["school"]["logo"]
-
-        profile["education"] = education
-
-        # massage [languages] data
-        languages = data["languageView"]["elements"]
-        for item in languages:
-            del item["entityUrn"]
-        profile["languages"] = languages
-
-        # massage [publications] data
-        publications = data["publicationView"]["elements"]
-        for item in publications:
-            del item["entityUrn"]
-            for author in item.get("authors", []):
-                del author["entityUrn"]
-        profile["publications"] = publications
-
-        # massage [certifications] data
-        certifications = data["certificationView"]["elements"]
-        for item in certifications:
-            del item["entityUrn"]
-        profile["certifications"] = certifications
-
-        # massage [volunteer] data
-        volunteer = data["volunteerExperienceView"]["elements"]
-        for item in volunteer:
-            del item["entityUrn"]
-        profile["volunteer"] = volunteer
-
-        # massage [honors] data
-        honors = data["honorView"]["elements"]
-        for item in honors:
-            del item["entityUrn"]
-        profile["honors"] = honors
-
-        # massage [projects] data
-        projects = data["projectView"]["elements"]
-        for item in projects:
-            del item["entityUrn"]
-        profile["projects"] = projects
-        # massage [skills] data
-        skills = data["skillView"]["elements"]
-        for item in skills:
-            del item["entityUrn"]
-        profile["skills"] = skills
-
-        profile["urn_id"] = profile["entityUrn"].replace("urn:li:fs_profile:", "")
-
-        return profile
+        if self.profile_cache is not None and res.status_code == 200:
+            self.profile_cache.set(profile_id, res.text)
+
+        return massage_profile_view(data, sections)
 if __name__ == "__main__":
     test = get_id_from_urn("urn:li:fs_normalized_company:3660")
     print(test)
\ No newline at end of file
@@ -1,37 +1,62 @@
-from typing import List, Dict, Optional, Union, Literal
+from typing import Iterable, List, Dict, Optional, Union, Any
 from linkedin_api import Linkedin as BaseLinkedin
-from operator import itemgetter
-from linkedin_api.utils.helpers import get_id_from_urn, get_urn_from_raw_update 
-from asyncio import sleep
+from linkedin_api.utils.helpers import get_id_from_urn, generate_trackingId
+import asyncio
 import random
 import aiohttp
 import logging
 import json
-from bs4 import BeautifulSoup, Tag
-from http.cookies import SimpleCookie
-from typing import Optional, Dict
-from custom_lib.cookies_extractor_async import CookieRepository
 from requests.cookies import RequestsCookieJar
+from custom_lib.linkedin_errors import ChallengeException, ForbiddenException, ThrottledException, UnauthorizedException
+from custom_lib.rate_limiter import AsyncRateLimiter
+from custom_lib.profile_cache import ProfileCache
+from custom_lib.resolution_cache import ResolutionCache
+from custom_lib.geo_gazetteer import GeoGazetteer
+from custom_lib.linkedin_wrapper import (
+    FORBIDDEN_STATUS_CODE,
+    INVALID_SESSION_STATUS_CODES,
+    build_people_search_params,
+    geo_typeahead_elements,
+    geo_typeahead_uri,
+    massage_profile_view,
+    parse_company_search_results,
+    parse_people_search_results,
+)
 
-def default_evade_async():
+logger = logging.getLogger(__name__)
+
+async def default_evade_async():
     """
     A catch-all method to try and evade suspension from Linkedin.
     Currenly, just delays the request by a random (bounded) time
     """
     logger.debug("Evading suspension...")
-    sleep(random.randint(2, 5)) 
-
-logger = logging.getLogger(__name__)
+    await asyncio.sleep(random.randint(2, 5))
 
-class UnauthorizedException(Exception):
+async def _no_evade_async():
     pass
 
-class ChallengeException(Exception):
-    pass
+class AsyncResponse:
+    """
+    Fully read response, exposing the parts of requests.Response the wrapper relies on.
+    """
+    __slots__ = ("status_code", "url", "text")
+
+    def __init__(self, status_code: int, url: str, text: str):
+        self.status_code = status_code
+        self.url = url
+        self.text = text
+
+    def json(self) -> Any:
+        return json.loads(self.text) if self.text else {}
 
 class ClientAsync:
     """
     Async class to act as a client for the Linkedin API.
+
+    Holds one aiohttp session (and so one pool of keep-alive connections) for
+    the lifetime of the client. Authentication is cookie based only: use
+    LinkedinWrapper for username/password logins.
     """
 
     # Settings for general Linkedin API calls
@@ -50,383 +75,362 @@ class ClientAsync:
         "x-restli-protocol-version": "2.0.0",
     }
 
-    # Settings for authenticating with Linkedin
-    AUTH_REQUEST_HEADERS = {
-        "X-Li-User-Agent": "LIAuthLibrary:0.0.3 com.linkedin.android:4.1.881 Asus_ASUS_Z01QD:android_9",
-        "User-Agent": "ANDROID OS",
-        "X-User-Language": "en",
-        "X-User-Locale": "en_US",
-        "Accept-Language": "en-us",
-    }
-
     def __init__(
-        self, *, debug=False, refresh_cookies=False, proxies={}, cookies_dir: str = ""
+        self, *, cookies: Optional[Union[RequestsCookieJar, Dict[str, str]]] = None, debug=False, proxies={},
+        connection_limit: int = 20, timeout: float = 30
     ):
         self.session: Optional[aiohttp.ClientSession] = None
         self.proxies = proxies
         self.logger = logger
         self.metadata = {}
-        self._use_cookie_cache = not refresh_cookies
-        self._cookie_repository = CookieRepository(cookies_dir=cookies_dir)
-        self._cookies = None
-        
+        self.connection_limit = connection_limit
+        self.timeout = timeout
+        self._cookies: Dict[str, str] = {}
+        self._headers: Dict[str, str] = dict(self.REQUEST_HEADERS)
+        if cookies is not None:
+            self._set_session_cookies(cookies)
+
         logging.basicConfig(level=logging.DEBUG if debug else logging.INFO)
 
     async def __aenter__(self):
-        if not self.session:
-            self.session = aiohttp.ClientSession(headers=self.REQUEST_HEADERS)
+        await self._get_session()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
+        await self.close()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        # Created lazily so the session binds to the event loop serving requests
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.connection_limit, ttl_dns_cache=300)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                cookie_jar=aiohttp.DummyCookieJar(),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self.session
+
+    async def close(self):
+        if self.session and not self.session.closed:
             await self.session.close()
-            self.session = None
+        self.session = None
 
-    async def _request_session_cookies(self) -> Dict[str, str]:
-        """
-        Return a new set of session cookies as given by Linkedin.
-        """
-        self.logger.debug("Requesting new cookies.")
-        
-        async with aiohttp.ClientSession(headers=self.AUTH_REQUEST_HEADERS) as session:
-            async with session.get(
-                f"{self.LINKEDIN_BASE_URL}/uas/authenticate",
-                proxy=self.proxies.get('https') if self.proxies else None
-            ) as response:
-                cookies = response.cookies
-                return {key: morsel.value for key, morsel in cookies.items()}
-
-    def _set_session_cookies(self, cookies: Dict[str, str]):
+    def _set_session_cookies(self, cookies: Union[RequestsCookieJar, Dict[str, str]]):
         """
         Set cookies of the current session.
+
+        Cookies are sent as a static header: aiohttp's cookie jar re-quotes
+        values such as JSESSIONID ("ajax:...") which LinkedIn then rejects.
         """
-        self._cookies = cookies
-        if self.session:
-            self.session._cookie_jar.update_cookies(cookies)
-            if 'JSESSIONID' in cookies:
-                self.session._default_headers["csrf-token"] = cookies["JSESSIONID"].strip('"')
+        if isinstance(cookies, RequestsCookieJar):
+            cookies = {cookie.name: cookie.value for cookie in cookies}
+        headers = dict(self.REQUEST_HEADERS)
+        headers["cookie"] = "; ".join(f"{name}={value}" for name, value in cookies.items())
+        if "JSESSIONID" in cookies:
+            headers["csrf-token"] = cookies["JSESSIONID"].strip('"')
+        # Swap both at once so in-flight requests never see a half updated session
+        self._cookies, self._headers = dict(cookies), headers
 
     @property
     def cookies(self):
         return self._cookies
 
-    async def authenticate(self, username: str, password: str):
-        if self._use_cookie_cache:
-            self.logger.debug("Attempting to use cached cookies")
-            cookies = self._cookie_repository.get(username)
-            if cookies:
-                self.logger.debug("Using cached cookies")
-                self._set_session_cookies(cookies)
-                await self._fetch_metadata()
-                return
+    async def request(self, method: str, url: str, **kwargs) -> AsyncResponse:
+        session = await self._get_session()
+        headers = {**self._headers, **(kwargs.pop("headers", None) or {})}
+        proxy = self.proxies.get("https") if self.proxies else None
+        async with session.request(method, url, headers=headers, proxy=proxy, **kwargs) as response:
+            text = await response.text()
+            return AsyncResponse(response.status, str(response.url), text)
 
-        await self._do_authentication_request(username, password)
-        await self._fetch_metadata()
 
-    async def _fetch_metadata(self):
-        """
-        Get metadata about the "instance" of the LinkedIn application.
-        """
-        async with aiohttp.ClientSession(headers=self.AUTH_REQUEST_HEADERS, cookies=self._cookies) as session:
-            async with session.get(
-                f"{self.LINKEDIN_BASE_URL}",
-                proxy=self.proxies.get('https') if self.proxies else None
-            ) as response:
-                text = await response.text()
-                
-                soup = BeautifulSoup(text, "lxml")
-
-                clientApplicationInstanceRaw = soup.find(
-                    "meta", attrs={"name": "applicationInstance"}
-                )
-                if clientApplicationInstanceRaw and isinstance(
-                    clientApplicationInstanceRaw, Tag
-                ):
-                    clientApplicationInstanceRaw = clientApplicationInstanceRaw.attrs.get(
-                        "content", {}
-                    )
-                    clientApplicationInstance = json.loads(clientApplicationInstanceRaw)
-                    self.metadata["clientApplicationInstance"] = clientApplicationInstance
-
-                clientPageInstanceIdRaw = soup.find(
-                    "meta", attrs={"name": "clientPageInstanceId"}
-                )
-                if clientPageInstanceIdRaw and isinstance(clientPageInstanceIdRaw, Tag):
-                    clientPageInstanceId = clientPageInstanceIdRaw.attrs.get("content", {})
-                    self.metadata["clientPageInstanceId"] = clientPageInstanceId
-
-    async def _do_authentication_request(self, username: str, password: str):
-        """
-        Authenticate with Linkedin asynchronously.
-        """
-        cookies = await self._request_session_cookies()
-        self._set_session_cookies(cookies)
+class LinkedinWrapperAsync:
+    """
+    Awaitable counterpart of LinkedinWrapper for use inside async handlers.
 
-        payload = {
-            "session_key": username,
-            "session_password": password,
-            "JSESSIONID": cookies["JSESSIONID"],
-        }
+    Responses are parsed with the same helpers as LinkedinWrapper, so both
+    return identical data.
+    """
+
+    _MAX_SEARCH_COUNT = BaseLinkedin._MAX_SEARCH_COUNT
+    _MAX_REPEATED_REQUESTS = BaseLinkedin._MAX_REPEATED_REQUESTS
 
-        async with aiohttp.ClientSession(headers=self.AUTH_REQUEST_HEADERS, cookies=cookies) as session:
-            async with session.post(
-                f"{self.LINKEDIN_BASE_URL}/uas/authenticate",
-                data=payload,
-                proxy=self.proxies.get('https') if self.proxies else None
-            ) as response:
-                try:
-                    data = await response.json()
-                except:
-                    data = {}
-
-                if response.status == 401:
-                    print(f"Request failed with status {response.status}")
-                    print(f"Response content: {await response.text()}")
-                    raise UnauthorizedException()
-
-                if response.status != 200:
-                    print(f"Request failed with status {response.status}")
-                    print(f"Response content: {await response.text()}")
-                    raise Exception()
-
-                if data and data.get("login_result") != "PASS":
-                    print(f"Request failed with status {response.status}")
-                    print(f"Response content: {await response.text()}")
-                    raise ChallengeException(data.get("login_result"))
-
-                response_cookies = {key: morsel.value for key, morsel in response.cookies.items()}
-                self._set_session_cookies(response_cookies)
-                self._cookie_repository.save(response_cookies, username)
-
-
-class LinkedinWrapperAsync(BaseLinkedin):
-    def __init__(self, username, password, *, authenticate=True, refresh_cookies=False, debug=False, proxies={}, cookies=None, cookies_dir: str = ""):
-        super().__init__(username, password, authenticate=authenticate, refresh_cookies=refresh_cookies, debug=debug, proxies=proxies, cookies=cookies, cookies_dir=cookies_dir)
+    def __init__(
+        self, *, cookies=None, debug=False, proxies={}, connection_limit: int = 20,
+        requests_per_minute: Optional[float] = None, profile_cache: Optional[ProfileCache] = None,
+        resolution_cache: Optional[ResolutionCache] = None, gazetteer: Optional[GeoGazetteer] = None,
+        resolve_concurrency: Optional[int] = None
+    ):
         self.client = ClientAsync(
-            refresh_cookies=refresh_cookies,
+            cookies=cookies,
             debug=debug,
             proxies=proxies,
-            cookies_dir=cookies_dir,
+            connection_limit=connection_limit,
         )
-    
-    def search_geo(self, keywords: str, **kwargs) -> List[Dict]:
+        self.logger = logger
+        # Per-account request budget, shared by every concurrent call on this client
+        self.rate_limiter = AsyncRateLimiter(requests_per_minute) if requests_per_minute else None
+        # Company/location lookups in flight on this account, shared by every request using the client
+        self.resolve_semaphore = asyncio.Semaphore(resolve_concurrency) if resolve_concurrency else None
+        self.profile_cache = profile_cache
+        self.resolution_cache = resolution_cache
+        self.gazetteer = gazetteer
+        # Flipped once LinkedIn rejects the session so pooled clients get evicted
+        self.session_invalid = False
+        # Requests in flight, so an evicted client is only closed once they finish
+        self._inflight = 0
+        self._close_requested = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        await self.client.close()
+
+    def close_nowait(self):
+        """
+        Close the session once in-flight requests finish, for callers that cannot await (e.g. pool eviction).
+
+        A request still holding the client after eviction finishes on the open
+        session; the last one out closes it.
+        """
+        self._close_requested = True
+        if self._inflight:
+            return
+        self._schedule_close()
+
+    def _schedule_close(self):
+        try:
+            asyncio.get_running_loop().create_task(self._close_if_idle())
+        except RuntimeError:
+            # No loop running: the session dies with the process
+            pass
+
+    async def _close_if_idle(self):
+        # A request may have started since the close was scheduled; it closes the session when it ends
+        if not self._inflight:
+            await self.close()
+
+    def _check_session(self, res: AsyncResponse) -> AsyncResponse:
+        if "checkpoint/challenge" in res.url:
+            self.session_invalid = True
+            raise ChallengeException(res.url)
+        if res.status_code in INVALID_SESSION_STATUS_CODES:
+            self.session_invalid = True
+            raise UnauthorizedException(f"LinkedIn rejected session with status {res.status_code}")
+        if res.status_code == FORBIDDEN_STATUS_CODE:
+            # Per resource: probe_session tells a private profile from a dead session
+            raise ForbiddenException(f"LinkedIn refused {res.url} with status 403")
+        if res.status_code == 429:
+            # Account is rate limited, not logged out: keep the session but stop using it for now
+            raise ThrottledException("LinkedIn throttled session with status 429")
+        return res
+
+    async def _request(self, method: str, uri: str, evade=default_evade_async, base_request=False, **kwargs) -> AsyncResponse:
+        self._inflight += 1
+        try:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire()
+            await evade()
+
+            url = f"{self.client.API_BASE_URL if not base_request else self.client.LINKEDIN_BASE_URL}{uri}"
+            try:
+                res = await self.client.request(method, url, **kwargs)
+            except aiohttp.TooManyRedirects as e:
+                # Expired cookies make LinkedIn bounce between login redirects
+                self.session_invalid = True
+                raise UnauthorizedException("LinkedIn session expired") from e
+            return self._check_session(res)
+        finally:
+            self._inflight -= 1
+            if self._close_requested and not self._inflight:
+                self._schedule_close()
+
+    async def _fetch(self, uri: str, evade=default_evade_async, base_request=False, **kwargs) -> AsyncResponse:
+        """GET request to Linkedin API"""
+        return await self._request("GET", uri, evade=evade, base_request=base_request, **kwargs)
+
+    async def _post(self, uri: str, evade=default_evade_async, base_request=False, **kwargs) -> AsyncResponse:
+        """POST request to Linkedin API"""
+        return await self._request("POST", uri, evade=evade, base_request=base_request, **kwargs)
+
+    async def probe_session(self):
+        """
+        Cheapest authenticated request (GET /me), used to check a cookie set is still logged in.
+
+        Raises:
+            UnauthorizedException: Also for a 403, since /me is never private
+            ChallengeException, ThrottledException: As any other request
+        """
+        try:
+            await self._fetch("/me", evade=_no_evade_async)
+        except ForbiddenException as e:
+            self.session_invalid = True
+            raise UnauthorizedException(str(e)) from e
+
+    async def search(self, params: Dict, limit=-1, offset=0) -> List:
+        """Perform a LinkedIn search. Mirrors linkedin_api.Linkedin.search."""
+        count = self._MAX_SEARCH_COUNT
+        if limit is None:
+            limit = -1
+
+        results = []
+        while True:
+            # when we're close to the limit, only fetch what we need to
+            if limit > -1 and limit - len(results) < count:
+                count = limit - len(results)
+            default_params = {
+                "origin": "GLOBAL_SEARCH_HEADER",
+                "q": "all",
+                "partialUpdate": "true",
+            }
+            default_params.update(params)
+
+            keywords = (
+                f"keywords:{default_params['keywords']},"
+                if "keywords" in default_params
+                else ""
+            )
+
+            res = await self._fetch(
+                f"/graphql?variables=(start:{len(results) + offset},origin:{default_params['origin']},"
+                f"query:("
+                f"{keywords}"
+                f"flagshipSearchIntent:SEARCH_SRP,"
+                f"queryParameters:{default_params['filters']},"
+                f"includeFiltersInResponse:false))&queryId=voyagerSearchDashClusters"
+                f".b0928897b71bd00a5a7291755dcd64f0"
+            )
+            data = res.json()
+
+            data_clusters = data.get("data", {}).get("searchDashClustersByAll", [])
+            if not data_clusters:
+                return []
+
+            if not data_clusters.get("_type", []) == "com.linkedin.restli.common.CollectionResponse":
+                return []
+
+            new_elements = []
+            for it in data_clusters.get("elements", []):
+                if not it.get("_type", []) == "com.linkedin.voyager.dash.search.SearchClusterViewModel":
+                    continue
+
+                for el in it.get("items", []):
+                    if not el.get("_type", []) == "com.linkedin.voyager.dash.search.SearchItem":
+                        continue
+
+                    e = el.get("item", {}).get("entityResult", [])
+                    if not e:
+                        continue
+                    if not e.get("_type", []) == "com.linkedin.voyager.dash.search.EntityResultViewModel":
+                        continue
+                    new_elements.append(e)
+
+            results.extend(new_elements)
+
+            # break the loop if we're done searching
+            if (
+                (-1 < limit <= len(results))  # if our results exceed set limit
+                or len(results) / count >= self._MAX_REPEATED_REQUESTS
+            ) or len(new_elements) == 0:
+                break
+
+            self.logger.debug(f"results grew to {len(results)}")
+
+        return results
+
+    async def search_geo(self, keywords: str, **kwargs):
         """Search for geographic locations on LinkedIn.
-        
+
         Args:
             keywords: Search term for location
-            **kwargs: Additional parameters to pass to request
-        
+
         Returns:
-            List of location results with their details
+            Geo URN ID of the best match, or [] when nothing matched
         """
-        
-        # Convert params to the format expected by the API
-        formatted_params = f"(keywords:{keywords},query:(typeaheadFilterQuery:(geoSearchTypes:List(MARKET_AREA,COUNTRY_REGION,ADMIN_DIVISION_1,CITY))),type:GEO)"
-        
-        uri = f"/graphql?variables={formatted_params}&queryId=voyagerSearchDashReusableTypeahead.54529a68d290553c6f24e28ab3448654"
-        
-        res = self._fetch(uri, headers={"accept": "application/vnd.linkedin.normalized+json+2.1"})
-        data = res.json()
+        if self.gazetteer is not None:
+            geo_id = self.gazetteer.lookup(keywords)
+            if geo_id is not None:
+                return geo_id
 
-        with open('test.json', 'w') as f:
-            import json
-            json.dump(data, f, indent=4)
+        async def lookup():
+            res = await self._fetch(geo_typeahead_uri(keywords), headers={"accept": "application/vnd.linkedin.normalized+json+2.1"})
+            elements = geo_typeahead_elements(res.json())
+            if self.gazetteer is not None:
+                self.gazetteer.add_typeahead(elements, query=keywords)
+            return elements[0][0] if elements else []
 
-        if "included" not in data:
-            return []
-            
-        results = []
-        first_location = data\
-            .get("data", [])\
-            .get("data", [])\
-            .get("searchDashReusableTypeaheadByType", [])['elements'][0]
-        geo_urn = get_id_from_urn(first_location['trackingUrn'])
-        
-        return geo_urn
-    
-    def search_people(
-        self,
-        keywords: Optional[str] = None,
-        connection_of: Optional[str] = None,
-        network_depths: Optional[
-            List[Union[Literal["F"], Literal["S"], Literal["O"]]]
-        ] = None,
-        current_company: Optional[List[str]] = None,
-        past_companies: Optional[List[str]] = None,
-        or_past_companies: bool = False,
-        nonprofit_interests: Optional[List[str]] = None,
-        profile_languages: Optional[List[str]] = None,
-        regions: Optional[List[str]] = None,
-        industries: Optional[List[str]] = None,
-        schools: Optional[List[str]] = None,
-        or_schools: bool = False,
-        contact_interests: Optional[List[str]] = None,
-        service_categories: Optional[List[str]] = None,
-        include_private_profiles=False,  # profiles without a public id, "Linkedin Member"
-        # Keywords filter
-        keyword_first_name: Optional[str] = None,
-        keyword_last_name: Optional[str] = None,
-        # `keyword_title` and `title` are the same. We kept `title` for backward compatibility. Please only use one of them.
-        keyword_title: Optional[str] = None,
-        keyword_company: Optional[str] = None,
-        keyword_school: Optional[str] = None,
-        network_depth: Optional[
-            Union[Literal["F"], Literal["S"], Literal["O"]]
-        ] = None,  # DEPRECATED - use network_depths
-        title: Optional[str] = None,  # DEPRECATED - use keyword_title
-        **kwargs,
-    ) -> List[Dict]:
+        if self.resolution_cache is None:
+            return await lookup()
+        return await self.resolution_cache.resolve_async("geo", keywords, lookup) or []
+
+    async def resolve_company(self, name: str) -> Optional[Dict]:
+        """Resolve a company name to its best search match.
+
+        Returns:
+            {"urn_id", "name"} of the first company search result, or None
+        """
+        async def lookup():
+            results = await self.search_companies(keywords=[name], limit=10, offset=0)
+            return {"urn_id": results[0]["urn_id"], "name": results[0]["name"]} if results else None
+
+        if self.resolution_cache is None:
+            return await lookup()
+        return await self.resolution_cache.resolve_async("company", name, lookup)
+
+    async def search_people(self, include_private_profiles=False, limit=-1, offset=0, **filters) -> List[Dict]:
         """Perform a LinkedIn search for people.
 
-        :param keywords: Keywords to search on
-        :type keywords: str, optional
-        :param current_company: A list of company URN IDs (str)
-        :type current_company: list, optional
-        :param past_companies: A list of company URN IDs (str)
-        :type past_companies: list, optional
-        :param or_past_companies: Boolean to determine if you want to search for profiles with any of the companies in the list
-        :type or_past_companies: bool, optional
-        :param regions: A list of geo URN IDs (str)
-        :type regions: list, optional
-        :param industries: A list of industry URN IDs (str)
-        :type industries: list, optional
-        :param schools: A list of school URN IDs (str)
-        :type schools: list, optional
-        :param or_schools: Boolean to determine if you want to search for profiles with any of the schools in the list
-        :type or_schools: bool, optional
-        :param profile_languages: A list of 2-letter language codes (str)
-        :type profile_languages: list, optional
-        :param contact_interests: A list containing one or both of "proBono" and "boardMember"
-        :type contact_interests: list, optional
-        :param service_categories: A list of service category URN IDs (str)
-        :type service_categories: list, optional
-        :param network_depth: Deprecated, use `network_depths`. One of "F", "S" and "O" (first, second and third+ respectively)
-        :type network_depth: str, optional
-        :param network_depths: A list containing one or many of "F", "S" and "O" (first, second and third+ respectively)
-        :type network_depths: list, optional
-        :param include_private_profiles: Include private profiles in search results. If False, only public profiles are included. Defaults to False
-        :type include_private_profiles: boolean, optional
-        :param keyword_first_name: First name
-        :type keyword_first_name: str, optional
-        :param keyword_last_name: Last name
-        :type keyword_last_name: str, optional
-        :param keyword_title: Job title
-        :type keyword_title: str, optional
-        :param keyword_company: Company name
-        :type keyword_company: str, optional
-        :param keyword_school: School name
-        :type keyword_school: str, optional
-        :param connection_of: Connection of LinkedIn user, given by profile URN ID
-        :type connection_of: str, optional
-        :param limit: Maximum length of the returned list, defaults to -1 (no limit)
-        :type limit: int, optional
-
-        :return: List of profiles (minimal data only)
-        :rtype: list
+        Accepts the same filters as LinkedinWrapper.search_people.
+
+        Returns:
+            List of profiles (minimal data only)
         """
-        filters = ["(key:resultType,value:List(PEOPLE))"]
-        if connection_of:
-            filters.append(f"(key:connectionOf,value:List({connection_of}))")
-        if network_depths:
-            stringify = " | ".join(network_depths)
-            filters.append(f"(key:network,value:List({stringify}))")
-        elif network_depth:
-            filters.append(f"(key:network,value:List({network_depth}))")
-        if regions:
-            stringify = " | ".join(regions)
-            filters.append(f"(key:geoUrn,value:List({stringify}))")
-        if industries:
-            stringify = " | ".join(industries)
-            filters.append(f"(key:industry,value:List({stringify}))")
-        if current_company:
-            stringify = " | ".join(current_company)
-            filters.append(f"(key:currentCompany,value:List({stringify}))")
-        if past_companies:
-            if or_past_companies:
-                stringify = ",".join(past_companies)
-            else:
-                stringify = " | ".join(past_companies)
-            filters.append(f"(key:pastCompany,value:List({stringify}))")
-        if profile_languages:
-            stringify = " | ".join(profile_languages)
-            filters.append(f"(key:profileLanguage,value:List({stringify}))")
-        if nonprofit_interests:
-            stringify = " | ".join(nonprofit_interests)
-            filters.append(f"(key:nonprofitInterest,value:List({stringify}))")
-        if schools:
-            if or_schools:
-                stringify = ",".join(schools)
-            else:
-                stringify = " | ".join(schools)
-            filters.append(f"(key:schoolFilter,value:List({stringify}))")
-        if service_categories:
-            stringify = " | ".join(service_categories)
-            filters.append(f"(key:serviceCategory,value:List({stringify}))")
-        # `Keywords` filter
-        keyword_title = keyword_title if keyword_title else title
-        if keyword_first_name:
-            filters.append(f"(key:firstName,value:List({keyword_first_name}))")
-        if keyword_last_name:
-            filters.append(f"(key:lastName,value:List({keyword_last_name}))")
-        if keyword_title:
-            filters.append(f"(key:title,value:List({keyword_title}))")
-        if keyword_company:
-            filters.append(f"(key:company,value:List({keyword_company}))")
-        if keyword_school:
-            filters.append(f"(key:school,value:List({keyword_school}))")
-
-        params = {"filters": "List({})".format(",".join(filters))}
+        params = build_people_search_params(**filters)
+        data = await self.search(params, limit=limit, offset=offset)
+        return parse_people_search_results(data, include_private_profiles)
+
+    async def search_companies(self, keywords: Optional[List[str]] = None, **kwargs) -> List[Dict]:
+        """Perform a LinkedIn search for companies.
 
+        Returns:
+            List of companies (urn_id, name, headline, subline)
+        """
+        filters = ["(key:resultType,value:List(COMPANIES))"]
+        params = {
+            "filters": "List({})".format(",".join(filters)),
+            "queryContext": "List(spellCorrectionEnabled->true)",
+        }
         if keywords:
             params["keywords"] = keywords
 
-        data = self.search(params, **kwargs)
+        data = await self.search(params, **kwargs)
+        return parse_company_search_results(data)
 
-        results = []
-        from pprint import pprint
-        for item in data:
-            if (
-                not include_private_profiles
-                and (item.get("entityCustomTrackingInfo") or {}).get(
-                    "memberDistance", None
-                )
-                == "OUT_OF_NETWORK"
-            ):
-                continue
-            # results.append(item)
-            results.append(
-                {
-                    "urn_id": get_id_from_urn(
-                        get_urn_from_raw_update(item.get("entityUrn", None))
-                    ),
-                    "distance": (item.get("entityCustomTrackingInfo") or {}).get(
-                        "memberDistance", None
-                    ),
-                    "jobtitle": (item.get("primarySubtitle") or {}).get("text", None),
-                    "location": (item.get("secondarySubtitle") or {}).get("text", None),
-                    "name": (item.get("title") or {}).get("text", None),
-                    "url": item.get("navigationUrl", None),
-                }
-            )
-
-        return results
-
-    def get_profile_async(
-        self, public_id: Optional[str] = None, urn_id: Optional[str] = None
+    async def get_profile(
+        self, public_id: Optional[str] = None, urn_id: Optional[str] = None,
+        sections: Optional[Iterable[str]] = None
     ) -> Dict:
         """Fetch data for a given LinkedIn profile.
 
-        :param public_id: LinkedIn public ID for a profile
-        :type public_id: str, optional
-        :param urn_id: LinkedIn URN ID for a profile
-        :type urn_id: str, optional
+        Args:
+            public_id: LinkedIn public ID for a profile
+            urn_id: LinkedIn URN ID for a profile
+            sections: Subset of PROFILE_SECTIONS to massage, all by default
 
-        :return: Profile data
-        :rtype: dict
+        Returns:
+            Profile data, same shape as LinkedinWrapper.get_profile
         """
-        # NOTE this still works for now, but will probably eventually have to be converted to
-        # https://www.linkedin.com/voyager/api/identity/profiles/ACoAAAKT9JQBsH7LwKaE9Myay9WcX8OVGuDq9Uw
-        res = self._fetch(f"/identity/profiles/{public_id or urn_id}/profileView")
+        profile_id = public_id or urn_id
+        if self.profile_cache is not None:
+            data = await self.profile_cache.get_async(profile_id)
+            if data is not None:
+                return massage_profile_view(data, sections)
+
+        res = await self._fetch(f"/identity/profiles/{profile_id}/profileView")
 
         data = res.json()
 
@@ -434,155 +438,64 @@ class LinkedinWrapperAsync(BaseLinkedin):
             self.logger.info("request failed with status %d", data["status"])
             return {}
 
-        # massage [profile] data
-        profile = data["profile"]
-        if "miniProfile" in profile:
-            if "picture" in profile["miniProfile"]:
-                profile["displayPictureUrl"] = profile["miniProfile"]["picture"][
-                    "com.linkedin.common.VectorImage"
-                ]["rootUrl"]
-
-                images_data = profile["miniProfile"]["picture"][
-                    "com.linkedin.common.VectorImage"
-                ]["artifacts"]
-                for img in images_data:
-                    w, h, url_segment = itemgetter(
-                        "width", "height", "fileIdentifyingUrlPathSegment"
-                    )(img)
-                    profile[f"img_{w}_{h}"] = url_segment
-
-            profile["profile_id"] = get_id_from_urn(profile["miniProfile"]["entityUrn"])
-            profile["profile_urn"] = profile["miniProfile"]["entityUrn"]
-            profile["member_urn"] = profile["miniProfile"]["objectUrn"]
-            profile["public_id"] = profile["miniProfile"]["publicIdentifier"]
-
-            del profile["miniProfile"]
-
-        del profile["defaultLocale"]
-        del profile["supportedLocales"]
-        del profile["versionTag"]
-        del profile["showEducationOnProfileTopCard"]
-
-        # massage [experience] data
-        experience = data["positionView"]["elements"]
-        for item in experience:
-            if "company" in item and "miniCompany" in item["company"]:
-                if "logo" in item["company"]["miniCompany"]:
-                    logo = item["company"]["miniCompany"]["logo"].get(
-                        "com.linkedin.common.VectorImage"
-                    )
-                    if logo:
-                        item["companyLogoUrl"] = logo["rootUrl"]
-                del item["company"]["miniCompany"]
-
-        profile["experience"] = experience
-
-        # massage experience position data
-        enriched_experiences = data["positionGroupView"]["elements"]
-        processed_experience = []
-        
-        for experience in enriched_experiences:
-            if "miniCompany" in experience:
-                company_name = experience.get("name", "")
-                company_public_id = experience.get("miniCompany", {}).get("universalName", "")
-            
-                # Process each position within the company
-                for position in experience.get("positions", []):
-                    experience_entry = {
-                        "title": position.get("title", "No title available"),
-                        "companyName": company_name,
-                        "companyPublicId": company_public_id,
-                        "description": position.get("description", "No description available"),
-                        "startDate": None,
-                        "endDate": None
-                    }
-                
-                # Extract dates     
-                time_period = position.get("timePeriod", {})
-                if "startDate" in time_period:
-                    experience_entry["startDate"] = time_period["startDate"]
-                if "endDate" in time_period:
-                    experience_entry["endDate"] = time_period["endDate"]
-                    
-                # Get company logo if available
-                if "company" in position and "miniCompany" in position["company"]:
-                    if "logo" in position["company"]["miniCompany"]:
-                        logo = position["company"]["miniCompany"]["logo"].get(
-                            "com.linkedin.common.VectorImage"
-                        )
-                        if logo:
-                            experience_entry["companyLogoUrl"] = logo["rootUrl"]
-                    
-                processed_experience.append(experience_entry)
-        
-        profile["experience"] = processed_experience
-
-        # massage [education] data
-        education = data["educationView"]["elements"]
-        for item in education:
-            if "school" in item:
-                if "logo" in item["school"]:
-                    item["school"]["logoUrl"] = item["school"]["logo"][
-                        "com.linkedin.common.VectorImage"
-                    ]["rootUrl"]
-                    del item["school"]["logo"]
-
-        profile["education"] = education
-
-        # massage [languages] data
-        languages = data["languageView"]["elements"]
-        for item in languages:
-            del item["entityUrn"]
-        profile["languages"] = languages
-
-        # massage [publications] data
-        publications = data["publicationView"]["elements"]
-        for item in publications:
-            del item["entityUrn"]
-            for author in item.get("authors", []):
-                del author["entityUrn"]
-        profile["publications"] = publications
-
-        # massage [certifications] data
-        certifications = data["certificationView"]["elements"]
-        for item in certifications:
-            del item["entityUrn"]
-        profile["certifications"] = certifications
-
-        # massage [volunteer] data
-        volunteer = data["volunteerExperienceView"]["elements"]
-        for item in volunteer:
-            del item["entityUrn"]
-        profile["volunteer"] = volunteer
-
-        # massage [honors] data
-        honors = data["honorView"]["elements"]
-        for item in honors:
-            del item["entityUrn"]
-        profile["honors"] = honors
-
-        # massage [projects] data
-        projects = data["projectView"]["elements"]
-        for item in projects:
-            del item["entityUrn"]
-        profile["projects"] = projects
-        # massage [skills] data
-        skills = data["skillView"]["elements"]
-        for item in skills:
-            del item["entityUrn"]
-        profile["skills"] = skills
-
-        profile["urn_id"] = profile["entityUrn"].replace("urn:li:fs_profile:", "")
-
-        return profile
-
-    def _fetch(self, uri: str, evade=default_evade_async, base_request=False, **kwargs):
-        """GET request to Linkedin API"""
-        evade()
+        if self.profile_cache is not None and res.status_code == 200:
+            await self.profile_cache.set_async(profile_id, res.text)
+
+        return massage_profile_view(data, sections)
+
+    async def get_company(self, public_id: str) -> Dict:
+        """Fetch data about a given LinkedIn company."""
+        params = {
+            "decorationId": "com.linkedin.voyager.deco.organization.web.WebFullCompanyMain-12",
+            "q": "universalName",
+            "universalName": public_id,
+        }
+
+        res = await self._fetch("/organization/companies", params=params)
+
+        data = res.json()
+
+        if data and "status" in data and data["status"] != 200:
+            self.logger.info("request failed: {}".format(data.get("message")))
+            return {}
+
+        return data["elements"][0]
+
+    async def add_connection(self, profile_public_id: str, message="", profile_urn=None) -> bool:
+        """Send a connection request.
+
+        Returns:
+            True if the request failed (mirrors linkedin_api.Linkedin.add_connection)
+        """
+        # Validating message length (max size is 300 characters)
+        if len(message) > 300:
+            self.logger.info("Message too long. Max size is 300 characters")
+            return False
+
+        if not profile_urn:
+            profile = await self.get_profile(public_id=profile_public_id, sections=())
+            # Of the form 'urn:li:fs_miniProfile:ACoAACX1hoMBvWqTY21JGe0z91mnmjmLy9Wen4w'
+            profile_urn = profile["profile_urn"].split(":")[-1]
+
+        payload = {
+            "trackingId": generate_trackingId(),
+            "message": message,
+            "invitations": [],
+            "excludeInvitations": [],
+            "invitee": {
+                "com.linkedin.voyager.growth.invitation.InviteeProfile": {
+                    "profileId": profile_urn
+                }
+            },
+        }
+        res = await self._post(
+            "/growth/normInvitations",
+            data=json.dumps(payload),
+            headers={"accept": "application/vnd.linkedin.normalized+json+2.1"},
+        )
 
-        url = f"{self.client.API_BASE_URL if not base_request else self.client.LINKEDIN_BASE_URL}{uri}"
-        return self.client.session.get(url, **kwargs)
+        return res.status_code != 201
 
 if __name__ == "__main__":
     test = get_id_from_urn("urn:li:fs_normalized_company:3660")
-    print(test)
\ No newline at end of file
+    print(test)
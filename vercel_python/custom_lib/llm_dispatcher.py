@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+
+from custom_lib.rate_limiter import AsyncRateLimiter
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
+# Rough chars-per-token ratio for English prompts, used to charge the TPM budget up front
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(request: Dict[str, Any]) -> int:
+    """
+    Estimate the tokens a chat completion request will consume (prompt + max output).
+    """
+    prompt_chars = sum(len(message.get("content") or "") for message in request.get("messages", []))
+    return prompt_chars // CHARS_PER_TOKEN + request.get("max_tokens", 500)
+
+
+def _is_retryable(error: Exception) -> bool:
+    # Imported here so the dispatcher module stays cheap to import; by the time a
+    # call has failed, the client has long loaded openai
+    from openai import APIConnectionError, APIStatusError, APITimeoutError, RateLimitError
+
+    if isinstance(error, (RateLimitError, APIConnectionError, APITimeoutError)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code >= 500
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenUsage:
+    """Running totals of the usage blocks returned by chat completions."""
+
+    def __init__(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def record(self, response: Any):
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        self.calls += 1
+        self.prompt_tokens += usage.prompt_tokens or 0
+        self.completion_tokens += usage.completion_tokens or 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "prompt_tokens_per_call": self.prompt_tokens / self.calls if self.calls else 0.0,
+        }
+
+
+class LLMDispatcher:
+    """
+    Shared gateway for every OpenAI chat completion made by the app.
+
+    Calls run through a sliding window of max_concurrency in-flight requests:
+    a new request starts as soon as any running one finishes, rather than
+    waiting for a whole gather batch. An optional tokens-per-minute budget is
+    charged before each call, and 429/5xx/connection errors are retried with
+    jittered exponential backoff.
+
+    Args:
+        client: AsyncOpenAI client
+        max_concurrency: Maximum requests in flight
+        tokens_per_minute: Token budget shared by all calls, unlimited if None
+        max_retries: Retries per request before the error is raised
+        base_delay: First backoff delay in seconds
+        max_delay: Backoff ceiling in seconds
+    """
+
+    def __init__(
+        self,
+        client: AsyncOpenAI,
+        max_concurrency: int = 10,
+        tokens_per_minute: Optional[float] = None,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0
+    ):
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.token_budget = AsyncRateLimiter(tokens_per_minute) if tokens_per_minute else None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        # Full jitter, so retries from a burst of 429s don't line up again
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    async def create(self, usage: Optional[TokenUsage] = None, **request) -> Any:
+        """
+        Run one chat completion through the window, budget and retry policy.
+
+        Takes the same keyword arguments as client.chat.completions.create,
+        plus an optional TokenUsage to record the response's usage into.
+        """
+        if self.token_budget is not None:
+            await self.token_budget.acquire(estimate_tokens(request))
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                try:
+                    response = await self.client.chat.completions.create(**request)
+                    if usage is not None:
+                        usage.record(response)
+                    return response
+                except Exception as e:
+                    if not _is_retryable(e) or attempt >= self.max_retries:
+                        raise
+                    error_name = type(e).__name__
+                    delay = self._backoff(attempt, e)
+            # Sleep outside the window so the slot goes to another request
+            logger.warning("OpenAI call failed (%s), retry %d in %.1fs", error_name, attempt + 1, delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def complete(self, usage: Optional[TokenUsage] = None, **request) -> str:
+        """Like create, returning the first choice's message content."""
+        response = await self.create(usage=usage, **request)
+        return response.choices[0].message.content
+
+    async def map(self, requests: Iterable[Dict[str, Any]], return_exceptions: bool = False) -> List[Any]:
+        """
+        Run many chat completions through the window.
+
+        Args:
+            requests: Keyword arguments for each create call
+            return_exceptions: Return failures in place instead of raising the first one
+
+        Returns:
+            Message contents (or exceptions) in the same order as requests
+        """
+        return await asyncio.gather(
+            *(self.complete(**request) for request in requests),
+            return_exceptions=return_exceptions
+        )
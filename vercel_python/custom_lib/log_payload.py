@@ -0,0 +1,102 @@
+import os
+import random
+import reprlib
+from typing import Any, Optional
+
+# Keys whose values never reach the logs (LinkedIn session cookies, credentials)
+REDACTED_KEYS = frozenset({
+    "cookies",
+    "cookie",
+    "li_at",
+    "jsessionid",
+    "password",
+    "api_key",
+    "authorization",
+    "existing_public_ids_bloom",
+    # Session handles are bearer credentials: SessionStore.get hands back the cookies
+    "session",
+    "sessions",
+})
+
+REDACTED = "<redacted>"
+
+# Longest rendered payload, and the share of payload logs rendered in full
+LOG_PAYLOAD_MAX_CHARS = int(os.getenv("LOG_PAYLOAD_MAX_CHARS", "500"))
+LOG_PAYLOAD_SAMPLE_RATE = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "1.0"))
+
+
+def _to_plain(obj: Any) -> Any:
+    # Pydantic request models log as their fields
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    return obj
+
+
+def redact(obj: Any, max_items: int = 10, max_str: int = 200, depth: int = 4) -> Any:
+    """
+    Copy obj with REDACTED_KEYS masked, long containers cut to max_items and
+    long strings (CSV uploads, templates) cut to max_str characters.
+
+    Cookie dicts (entries with "name", "value" and "domain") are masked wherever they
+    appear, so a cookie list passed under another key is caught too.
+    """
+    obj = _to_plain(obj)
+    if depth <= 0:
+        return reprlib.repr(obj)
+    if isinstance(obj, dict):
+        if "name" in obj and "value" in obj and "domain" in obj:
+            return {"name": obj["name"], "value": REDACTED}
+        items = list(obj.items())
+        redacted = {
+            key: REDACTED if str(key).lower() in REDACTED_KEYS else redact(value, max_items, max_str, depth - 1)
+            for key, value in items[:max_items]
+        }
+        if len(items) > max_items:
+            redacted["..."] = f"+{len(items) - max_items} keys"
+        return redacted
+    if isinstance(obj, (list, tuple, set)):
+        items = list(obj)
+        redacted = [redact(item, max_items, max_str, depth - 1) for item in items[:max_items]]
+        if len(items) > max_items:
+            redacted.append(f"... +{len(items) - max_items} items")
+        return redacted
+    if isinstance(obj, str) and len(obj) > max_str:
+        return f"{obj[:max_str]}... ({len(obj)} chars)"
+    return obj
+
+
+def _summary(obj: Any) -> str:
+    obj = _to_plain(obj)
+    if isinstance(obj, dict):
+        return f"<dict with {len(obj)} keys>"
+    if isinstance(obj, (list, tuple, set)):
+        return f"<{type(obj).__name__} of {len(obj)} items>"
+    return f"<{type(obj).__name__}>"
+
+
+class LogPayload:
+    """
+    Request or result object rendered only when the log record is emitted.
+
+    Pass it as a %s argument (logger.info("Result: %s", LogPayload(result)))
+    and nothing is formatted while the level is disabled. When emitted, the
+    payload is redacted and truncated to max_chars; outside the sample only a
+    one-line summary ("<list of 25 items>") is written.
+    """
+
+    __slots__ = ("obj", "max_chars", "sample_rate")
+
+    def __init__(self, obj: Any, max_chars: Optional[int] = None, sample_rate: Optional[float] = None):
+        self.obj = obj
+        self.max_chars = LOG_PAYLOAD_MAX_CHARS if max_chars is None else max_chars
+        self.sample_rate = LOG_PAYLOAD_SAMPLE_RATE if sample_rate is None else sample_rate
+
+    def __str__(self) -> str:
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return _summary(self.obj)
+        rendered = repr(redact(self.obj))
+        if len(rendered) > self.max_chars:
+            return f"{rendered[:self.max_chars]}... ({len(rendered)} chars)"
+        return rendered
+
+    __repr__ = __str__
@@ -0,0 +1,114 @@
+import json
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from custom_lib.cache_backends import CacheBackend, MemoryLRUBackend
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE_TTL = 7 * 24 * 3600
+
+
+class ProfileCache:
+    """
+    Cache of raw profileView payloads keyed by public_id and urn_id.
+
+    The raw JSON is stored rather than the massaged profile, so every read goes
+    through massage_profile_view exactly like a live response. One payload is
+    stored under every identifier it answers to, so a profile fetched by URL
+    is also a hit when later requested by URN.
+
+    Args:
+        backend: Where payloads live, in-memory LRU by default
+        ttl: Seconds before a cached profile is fetched again
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None, ttl: Optional[float] = DEFAULT_PROFILE_TTL):
+        self.backend = backend if backend is not None else MemoryLRUBackend()
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(profile_id: str) -> str:
+        # Public IDs are case-insensitive on LinkedIn, URN IDs are not
+        if profile_id.startswith("ACo"):
+            return f"profile:{profile_id}"
+        return f"profile:{profile_id.lower()}"
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _decode(self, profile_id: str, raw: Optional[str]) -> Optional[Dict[str, Any]]:
+        # None for a miss or a corrupt entry, which the caller then deletes
+        if raw is None:
+            self._count(False)
+            return None
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            logger.warning("Dropping corrupt cached profile %s", profile_id)
+            self._count(False)
+            return None
+        self._count(True)
+        return data
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the raw profileView payload for a public_id or urn_id, or None.
+        """
+        raw = self.backend.get(self._key(profile_id))
+        data = self._decode(profile_id, raw)
+        if data is None and raw is not None:
+            self.backend.delete(self._key(profile_id))
+        return data
+
+    async def get_async(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        """get() for coroutines: a disk backend is read off the event loop."""
+        raw = await self.backend.get_async(self._key(profile_id))
+        data = self._decode(profile_id, raw)
+        if data is None and raw is not None:
+            await self.backend.delete_async(self._key(profile_id))
+        return data
+
+    def set(self, profile_id: str, raw: str):
+        """
+        Store a raw profileView response body under profile_id and its aliases.
+        """
+        for alias in self._aliases(profile_id, raw):
+            self.backend.set(self._key(alias), raw, self.ttl)
+
+    async def set_async(self, profile_id: str, raw: str):
+        """set() for coroutines: a disk backend is written off the event loop."""
+        for alias in self._aliases(profile_id, raw):
+            await self.backend.set_async(self._key(alias), raw, self.ttl)
+
+    def invalidate(self, profile_id: str):
+        self.backend.delete(self._key(profile_id))
+
+    @staticmethod
+    def _aliases(profile_id: str, raw: str) -> List[str]:
+        from linkedin_api.utils.helpers import get_id_from_urn
+
+        aliases = [profile_id]
+        try:
+            mini_profile = json.loads(raw)["profile"]["miniProfile"]
+            aliases.append(mini_profile["publicIdentifier"])
+            aliases.append(get_id_from_urn(mini_profile["entityUrn"]))
+        except (ValueError, KeyError, TypeError):
+            pass
+        return list(dict.fromkeys(alias for alias in aliases if alias))
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
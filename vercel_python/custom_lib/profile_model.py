@@ -0,0 +1,147 @@
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def _format_date(date: Optional[Dict[str, int]]) -> Optional[str]:
+    """Render a LinkedIn {"year", "month"} date as YYYY or YYYY-MM."""
+    if not date or "year" not in date:
+        return None
+    if "month" in date:
+        return f"{date['year']}-{date['month']:02d}"
+    return str(date["year"])
+
+
+def _compact(values: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in values.items() if value not in (None, "", [], {})}
+
+
+@dataclass(slots=True)
+class Personal:
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    headline: Optional[str] = None
+    location: Optional[str] = None
+    city: Optional[str] = None
+    industry: Optional[str] = None
+
+    def to_api(self) -> Dict[str, Any]:
+        return {
+            "first_name": self.first_name,
+            "last_name": self.last_name,
+            "headline": self.headline,
+            "location": self.location,
+            "city": self.city,
+            "industry": self.industry
+        }
+
+    def to_prompt(self) -> Dict[str, Any]:
+        name = " ".join(part for part in (self.first_name, self.last_name) if part)
+        return _compact({
+            "name": name,
+            "headline": self.headline,
+            "location": self.location,
+            "industry": self.industry
+        })
+
+
+@dataclass(slots=True)
+class Experience:
+    title: Optional[str] = None
+    company: Optional[str] = None
+    description: Optional[str] = None
+    start_date: Optional[Dict[str, int]] = None
+    end_date: Optional[Dict[str, int]] = None
+    company_public_id: Optional[str] = None
+
+    def to_api(self) -> Dict[str, Any]:
+        result = {"title": self.title, "company": self.company}
+        if self.company_public_id is not None:
+            result["company_public_id"] = self.company_public_id
+        result["description"] = self.description
+        result["start_date"] = self.start_date
+        result["end_date"] = self.end_date
+        return result
+
+    def to_prompt(self) -> Dict[str, Any]:
+        return _compact({
+            "title": self.title,
+            "company": self.company,
+            "description": self.description,
+            "start": _format_date(self.start_date),
+            "end": _format_date(self.end_date)
+        })
+
+
+@dataclass(slots=True)
+class Education:
+    school: Optional[str] = None
+    activities: Optional[str] = None
+    grade: Optional[str] = None
+    start_date: Optional[Dict[str, int]] = None
+    end_date: Optional[Dict[str, int]] = None
+    school_urn_id: Optional[str] = None
+
+    def to_api(self) -> Dict[str, Any]:
+        result = {} if self.school_urn_id is None else {"school_urn_id": self.school_urn_id}
+        result["school"] = self.school
+        result["activities"] = self.activities
+        result["grade"] = self.grade
+        result["start_date"] = self.start_date
+        result["end_date"] = self.end_date
+        return result
+
+    def to_prompt(self) -> Dict[str, Any]:
+        return _compact({
+            "school": self.school,
+            "activities": self.activities,
+            "grade": self.grade,
+            "start": _format_date(self.start_date),
+            "end": _format_date(self.end_date)
+        })
+
+
+@dataclass(slots=True)
+class Profile:
+    """
+    Enriched LinkedIn profile, as produced by enrich_person.
+
+    to_api() returns the nested dict the API has always returned; to_prompt()
+    returns a compact JSON string with only the fields an email draft needs.
+    """
+    id: Optional[str] = None
+    personal: Personal = field(default_factory=Personal)
+    experiences: List[Experience] = field(default_factory=list)
+    education: List[Education] = field(default_factory=list)
+    skills: Optional[List[str]] = None
+
+    def to_api(self) -> Dict[str, Any]:
+        result = {
+            "personal": self.personal.to_api(),
+            "experiences": [experience.to_api() for experience in self.experiences],
+            "education": [education.to_api() for education in self.education]
+        }
+        if self.skills is not None:
+            result["skills"] = list(self.skills)
+        result["id"] = self.id
+        return result
+
+    def to_prompt(self, exclude: Iterable[str] = ()) -> str:
+        """
+        Serialize for an LLM prompt.
+
+        Args:
+            exclude: Sections to leave out ("experiences", "education", "skills")
+
+        Returns:
+            Compact JSON without empty fields
+        """
+        exclude = set(exclude)
+        prompt = self.personal.to_prompt()
+        if "experiences" not in exclude:
+            prompt["experiences"] = [experience.to_prompt() for experience in self.experiences]
+        if "education" not in exclude:
+            prompt["education"] = [education.to_prompt() for education in self.education]
+        if "skills" not in exclude:
+            prompt["skills"] = self.skills
+        return json.dumps(_compact(prompt), separators=(",", ":"), ensure_ascii=False)
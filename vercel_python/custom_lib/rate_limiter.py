@@ -0,0 +1,52 @@
+import asyncio
+import time
+from typing import Callable, Optional
+
+
+class AsyncRateLimiter:
+    """
+    Token bucket shared by every coroutine that calls acquire().
+
+    Args:
+        rate: Number of tokens granted per `per` seconds
+        per: Refill window in seconds (default: one minute)
+        capacity: Maximum burst size, defaults to `rate`
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        per: float = 60.0,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.per = per
+        self.capacity = capacity if capacity is not None else rate
+        self.clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate / self.per)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0):
+        """
+        Wait until `amount` tokens are available and take them.
+
+        Requests larger than the bucket are clamped to its capacity so they
+        wait for a full bucket instead of blocking forever.
+        """
+        amount = min(amount, self.capacity)
+        # Holding the lock while sleeping keeps waiters first come, first served
+        async with self._lock:
+            self._refill()
+            while self._tokens < amount:
+                await asyncio.sleep((amount - self._tokens) * self.per / self.rate)
+                self._refill()
+            self._tokens -= amount
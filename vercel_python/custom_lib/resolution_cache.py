@@ -0,0 +1,127 @@
+import json
+import logging
+import re
+import threading
+import unicodedata
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+from custom_lib.cache_backends import CacheBackend, MemoryLRUBackend
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESOLUTION_TTL = 30 * 24 * 3600
+DEFAULT_NEGATIVE_TTL = 24 * 3600
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize a company or place name so spelling variants share one cache key.
+
+    "Moelis & Co.", "moelis and co" and " MOELIS  &  CO " all map to "moelis and co".
+    """
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(char for char in name if not unicodedata.combining(char))
+    name = name.lower().replace("&", " and ")
+    name = _PUNCTUATION.sub(" ", name)
+    return _WHITESPACE.sub(" ", name).strip()
+
+
+class ResolutionCache:
+    """
+    Shared name -> LinkedIn URN cache for company and geo lookups.
+
+    Keys are namespaced by kind ("company", "geo") and normalized with
+    normalize_name. Lookups that find nothing are cached too, for a shorter
+    negative_ttl, so a misspelt name does not hit LinkedIn on every request.
+    Lookups that raise are never cached.
+
+    Args:
+        backend: Where resolutions live, in-memory LRU by default
+        ttl: Seconds a successful resolution is kept
+        negative_ttl: Seconds a miss is kept
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        ttl: Optional[float] = DEFAULT_RESOLUTION_TTL,
+        negative_ttl: Optional[float] = DEFAULT_NEGATIVE_TTL
+    ):
+        self.backend = backend if backend is not None else MemoryLRUBackend(max_size=4096)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(kind: str, name: str) -> str:
+        return f"{kind}:{normalize_name(name)}"
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, kind: str, name: str) -> Tuple[bool, Any]:
+        """
+        Returns:
+            (found, value): value is None for a cached miss
+        """
+        return self._decode(self.backend.get(self._key(kind, name)))
+
+    async def get_async(self, kind: str, name: str) -> Tuple[bool, Any]:
+        """get() for coroutines: a disk backend is read off the event loop."""
+        return self._decode(await self.backend.get_async(self._key(kind, name)))
+
+    def _decode(self, raw: Optional[str]) -> Tuple[bool, Any]:
+        if raw is None:
+            self._count(False)
+            return False, None
+        self._count(True)
+        return True, json.loads(raw)
+
+    def _encode(self, value: Any) -> Tuple[str, Optional[float]]:
+        # An empty value ([], {}, "", None) is cached as a miss
+        if not value:
+            return "null", self.negative_ttl
+        return json.dumps(value), self.ttl
+
+    def set(self, kind: str, name: str, value: Any):
+        """Cache a resolution; an empty value ([], {}, "", None) is cached as a miss."""
+        self.backend.set(self._key(kind, name), *self._encode(value))
+
+    async def set_async(self, kind: str, name: str, value: Any):
+        """set() for coroutines: a disk backend is written off the event loop."""
+        await self.backend.set_async(self._key(kind, name), *self._encode(value))
+
+    def resolve(self, kind: str, name: str, lookup: Callable[[], Any]) -> Any:
+        """Return the cached resolution for name, calling lookup() on a cache miss."""
+        found, value = self.get(kind, name)
+        if found:
+            return value
+        value = lookup()
+        self.set(kind, name, value)
+        return value or None
+
+    async def resolve_async(self, kind: str, name: str, lookup: Callable[[], Awaitable[Any]]) -> Any:
+        """Async resolve, for awaitable lookups; the backend is never read or written on the event loop."""
+        found, value = await self.get_async(kind, name)
+        if found:
+            return value
+        value = await lookup()
+        await self.set_async(kind, name, value)
+        return value or None
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
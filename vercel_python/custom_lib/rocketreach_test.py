@@ -65,9 +65,8 @@ def get_first_google_result_link(query):
     # print(query)
 
     response = requests.get(search_url, headers=headers, params=params)
-    if response.status_code != 200:
-        print(f"Error: Received status code {response.status_code} from Google.")
-        return None
+    # Raise rather than return None: a blocked search is not "no RocketReach page" and must not be cached as one
+    response.raise_for_status()
 
     soup = BeautifulSoup(response.text, "html.parser")
     # with open('google_search_results.txt', 'w', encoding='utf-8') as f:
@@ -162,11 +161,18 @@ def get_top_email_format(url):
     return pattern, example
 
 import os, asyncio
+from typing import Any, Dict, Optional
 from dotenv import load_dotenv
-from openai import AsyncOpenAI
+from custom_lib.llm_dispatcher import LLMDispatcher
+from custom_lib.resolution_cache import ResolutionCache
+from custom_lib.email_patterns import format_emails
 
 load_dotenv()
 
+# A company's email format practically never changes; "nothing found" is retried sooner
+DEFAULT_EMAIL_FORMAT_TTL = 180 * 24 * 3600
+DEFAULT_EMAIL_FORMAT_NEGATIVE_TTL = 7 * 24 * 3600
+
 SYSTEM_PROMPT = """You are an email format expert. Your task is to generate email addresses based on a person's name and a given email pattern format.
 Follow these rules strictly:
 1. Use ONLY the provided pattern format
@@ -192,12 +198,12 @@ Pattern: [first].[last]
 Example response 2:
 ["nathan.beber", "john.smith", "verifying"]"""
 
-async def generate_email_gpt_batch(openai_client: AsyncOpenAI, names: list[str], pattern_info: str, batch_size: int = 10) -> list[str]:
+async def generate_email_gpt_batch(dispatcher: LLMDispatcher, names: list[str], pattern_info: str, batch_size: int = 10) -> list[str]:
     """
-    Generate email addresses in batches using GPT-3.5 Turbo.
+    Generate email addresses in batches of names, all batches in flight through the dispatcher.
     
     Args:
-        openai_client: An instance of the OpenAI client
+        dispatcher: Shared LLMDispatcher
         names: List of full names to process
         pattern_info: String containing pattern and example (e.g., "[first].[last]@company.com")
         batch_size: Size of each batch (default: 10)
@@ -209,88 +215,134 @@ async def generate_email_gpt_batch(openai_client: AsyncOpenAI, names: list[str],
         >>> names = ["Nathan Beber", "John Smith", "Jane Doe"]
         >>> pattern = '''Top Email Format Pattern: [first_initial][last]
         ... Example: jdoe@fb.com'''
-        >>> await generate_email_gpt_batch(names, pattern)
+        >>> await generate_email_gpt_batch(dispatcher, names, pattern)
         ['nbeber@fb.com', 'jsmith@fb.com', 'jdoe@fb.com']
     """
-    all_emails = []
-    
-    # Process names in batches
-    for i in range(0, len(names), batch_size):
-        batch = names[i:i + batch_size]
+    batches = [names[i:i + batch_size] for i in range(0, len(names), batch_size)]
+    batch_requests = []
+    for batch in batches:
+        # Create a single prompt for the entire batch
+        batch_prompt = "\n".join([f"Name {j+1}: {name}" for j, name in enumerate(batch)])
         
+        messages = [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": f"""
+            Email Format Pattern:
+            {pattern_info}
+
+            Names to process:
+            {batch_prompt}
+
+            Generate email addresses for all names using the above pattern format.
+            Return ONLY the email addresses, one per line, in the exact same order as the input names.
+            """}
+        ]
+        batch_requests.append(dict(
+            model="gpt-4o-mini",
+            messages=messages,
+            temperature=0,
+            max_tokens=100
+        ))
+
+    responses = await dispatcher.map(batch_requests, return_exceptions=True)
+
+    all_emails = []
+    for i, (batch, content) in enumerate(zip(batches, responses)):
+        if isinstance(content, Exception):
+            logger.error(f"Error processing batch {i + 1}: {str(content)}")
+            # Add None for each failed email in this batch
+            all_emails.extend([None] * len(batch))
+            continue
         try:
-            # Create a single prompt for the entire batch
-            batch_prompt = "\n".join([f"Name {j+1}: {name}" for j, name in enumerate(batch)])
-            
-            messages = [
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": f"""
-                Email Format Pattern:
-                {pattern_info}
-
-                Names to process:
-                {batch_prompt}
-
-                Generate email addresses for all names using the above pattern format.
-                Return ONLY the email addresses, one per line, in the exact same order as the input names.
-                """}
-            ]
-
-            response = await openai_client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=messages,
-                temperature=0,
-                max_tokens=100
-            )
-            try:
-                emails = json.loads(response.choices[0].message.content)
-            except Exception as e:
-                print(f"Error json formatting batch {i//batch_size + 1}: {str(e)}")
-                # Add None for each failed email in this batch
-                emails = [None] * len(batch)
-            
-            all_emails.extend(emails)
-            
+            emails = json.loads(content)
         except Exception as e:
-            print(f"Error processing batch {i//batch_size + 1}: {str(e)}")
+            logger.error(f"Error json formatting batch {i + 1}: {str(e)}")
             # Add None for each failed email in this batch
-            all_emails.extend([None] * len(batch))
+            emails = [None] * len(batch)
+        
+        all_emails.extend(emails)
     
     return all_emails
 
-async def generate_email_gpt(name: str, pattern_info: str):
+async def generate_email_gpt(dispatcher: LLMDispatcher, name: str, pattern_info: str):
     """Single email generation (wrapper around batch function)"""
-    results = await generate_email_gpt_batch([name], pattern_info)
+    results = await generate_email_gpt_batch(dispatcher, [name], pattern_info)
     return results[0] if results else None
 
-async def search_and_generate_emails(async_openai_client: AsyncOpenAI, company: str, names: list[str]):
+def discover_email_format(company: str) -> Optional[Dict[str, Any]]:
     """
-    Search for the company's top email format pattern and generate emails
+    Find a company's top email format: Bing for its RocketReach page, then RocketReach for the pattern.
+
+    Returns:
+        {"rocketreach_url", "pattern", "example", "domain"}, or None when no
+        RocketReach page or format table was found
+
+    Raises:
+        requests.HTTPError: If Bing or RocketReach refused the request
     """
     query = structure_rocketreach_query(company)
     first_link = get_first_google_result_link(query)
-    if first_link:
-        print("First link found:", first_link)
-        result = get_top_email_format(first_link)
-        if result:
-            pattern, example = result
-            print(f"For URL: {first_link}")
-            print(f"Top Email Format Pattern: {pattern}")
-            print(f"Example: {example}")
-            print("-" * 50)
-
-            email_domain = example.split("@")[1]
-            print(f"Email Domain: {email_domain}")
-
-            emails = await generate_email_gpt_batch(async_openai_client, names, pattern)
-            emails_appended = [f"{email}@{email_domain}" for email in emails]
-            print(f"Generated Emails: {emails_appended}")
-
-            return [(first_link, pattern, example), emails_appended]
+    if not first_link:
+        logger.info(f"No RocketReach page found for {company}")
+        return None
+    logger.info(f"First link found: {first_link}")
+    result = get_top_email_format(first_link)
+    if not result:
+        logger.info(f"Could not find format for {first_link}")
+        return None
+    pattern, example = result
+    return {
+        "rocketreach_url": first_link,
+        "pattern": pattern,
+        "example": example,
+        "domain": example.split("@")[1] if "@" in example else "",
+    }
+
+async def generate_emails(dispatcher: LLMDispatcher, names: list[str], pattern: str) -> list[str]:
+    """
+    Email local parts for names: formatted locally when email_patterns can
+    compile the pattern, otherwise by the LLM (generate_email_gpt_batch).
+    """
+    emails = format_emails(pattern, names)
+    if emails is not None:
+        return emails
+    logger.info("Unknown email pattern %r, generating with the LLM", pattern)
+    return await generate_email_gpt_batch(dispatcher, names, pattern)
+
+async def search_and_generate_emails(dispatcher: LLMDispatcher, company: str, names: list[str], format_cache: Optional[ResolutionCache] = None):
+    """
+    Search for the company's top email format pattern and generate emails
+
+    With format_cache, formats (and misses) are cached under the normalized
+    company name, so repeat lookups skip both scrapes. A blocked scrape
+    (requests.HTTPError) is logged and returns None without being cached.
+    """
+    async def lookup():
+        # The scrapes use blocking requests calls
+        return await asyncio.to_thread(discover_email_format, company)
+
+    try:
+        if format_cache is not None:
+            email_format = await format_cache.resolve_async("email_format", company, lookup)
         else:
-            print("Could not find format for", first_link)
-    else:
-        print("No link found.")
+            email_format = await lookup()
+    except requests.HTTPError as e:
+        # Raised out of resolve_async, so the blocked scrape is not cached as a miss
+        logger.warning(f"Email format lookup for {company} was refused: {str(e)}")
+        return None
+    if not email_format:
+        return None
+
+    logger.info(
+        f"Email format for {company}: {email_format['pattern']} (example {email_format['example']}, "
+        f"domain {email_format['domain']}, from {email_format['rocketreach_url']})"
+    )
+
+    emails = await generate_emails(dispatcher, names, email_format["pattern"])
+    emails_appended = [f"{email}@{email_format['domain']}" for email in emails]
+    logger.info(f"Generated {len(emails_appended)} emails for {company}")
+
+    return [(email_format["rocketreach_url"], email_format["pattern"], email_format["example"]), emails_appended]
 
 if __name__ == "__main__":
     # Example search
@@ -328,9 +380,10 @@ if __name__ == "__main__":
                     "Jane Doe",
                     "Abdullah Chandna"
                 ]
-    client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    from openai import AsyncOpenAI
+    client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0)
     for company in input_companies:
-        asyncio.run(search_and_generate_emails(client, company, names))
+        asyncio.run(search_and_generate_emails(LLMDispatcher(client), company, names))
 
 # if __name__ == "__main__":
 #     # Example search
@@ -0,0 +1,134 @@
+import json
+import logging
+import os
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from custom_lib.resolution_cache import normalize_name
+
+logger = logging.getLogger(__name__)
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Group name -> JSON file of {school public id: school URN ID}
+DEFAULT_GROUP_FILES = {
+    "cad": os.path.join(_HERE, "cad_schools.json"),
+}
+
+_SCHOOL_URL = re.compile(r"linkedin\.com/school/([^/?#]+)")
+
+
+class SchoolGroup:
+    """
+    Named, fixed set of schools searched together (e.g. Canadian schools for fill searches).
+
+    Every "group minus one school" tuple is built at load time, so the
+    per-search exclusion of the candidate's own school is a dict lookup.
+    """
+
+    __slots__ = ("name", "urn_ids", "_without")
+
+    def __init__(self, name: str, urn_ids: Iterable[str]):
+        self.name = name
+        # dict.fromkeys keeps the file order while dropping duplicates
+        self.urn_ids: Tuple[str, ...] = tuple(dict.fromkeys(urn_ids))
+        self._without: Dict[str, Tuple[str, ...]] = {
+            urn_id: tuple(other for other in self.urn_ids if other != urn_id)
+            for urn_id in self.urn_ids
+        }
+
+    def __contains__(self, urn_id: str) -> bool:
+        return urn_id in self._without
+
+    def __len__(self) -> int:
+        return len(self.urn_ids)
+
+    def without(self, urn_id: Optional[str]) -> Tuple[str, ...]:
+        """Return the group's URN IDs minus urn_id."""
+        return self._without.get(urn_id, self.urn_ids)
+
+
+class SchoolRegistry:
+    """
+    School groups and school name -> URN ID lookups, loaded once per process.
+
+    Names are indexed both as the LinkedIn public id ("ivey-business-school")
+    and in normalize_name form ("ivey business school"). Lookups also accept
+    a /school/ URL or a bare URN ID.
+    """
+
+    def __init__(self):
+        self.groups: Dict[str, SchoolGroup] = {}
+        self._names: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def add_group(self, name: str, schools: Dict[str, str]):
+        """
+        Add a group from a {school public id: URN ID} mapping and index its names.
+        """
+        self.groups[name] = SchoolGroup(name, schools.values())
+        for public_id, urn_id in schools.items():
+            self.register(public_id, urn_id)
+
+    def group(self, name: str) -> SchoolGroup:
+        """
+        Raises:
+            KeyError: If no group with that name was loaded
+        """
+        return self.groups[name]
+
+    def register(self, name: str, urn_id: str):
+        """Remember a school name (e.g. from an enriched education entry) for later lookups."""
+        with self._lock:
+            self._names.setdefault(name.lower(), urn_id)
+            key = normalize_name(name)
+            if key:
+                self._names.setdefault(key, urn_id)
+
+    def lookup(self, school: str) -> Optional[str]:
+        """
+        Resolve a school public id, name, /school/ URL or URN ID to a URN ID.
+
+        Returns:
+            The URN ID, or None for an unknown school
+        """
+        school = school.strip()
+        if school.isdigit():
+            return school
+        match = _SCHOOL_URL.search(school)
+        if match:
+            school = match.group(1)
+        return self._names.get(school.lower()) or self._names.get(normalize_name(school))
+
+    def groups_of(self, urn_id: str) -> List[str]:
+        return [name for name, group in self.groups.items() if urn_id in group]
+
+    @classmethod
+    def from_files(cls, group_files: Dict[str, str] = DEFAULT_GROUP_FILES) -> "SchoolRegistry":
+        registry = cls()
+        for name, path in group_files.items():
+            try:
+                with open(path, "r") as f:
+                    registry.add_group(name, json.load(f))
+            except (OSError, ValueError) as e:
+                logger.error("Could not load school group %s from %s: %s", name, path, str(e))
+        logger.info(
+            "Loaded school registry: %s",
+            ", ".join(f"{name} ({len(group)})" for name, group in registry.groups.items())
+        )
+        return registry
+
+
+_default_registry: Optional[SchoolRegistry] = None
+_default_lock = threading.Lock()
+
+
+def get_school_registry() -> SchoolRegistry:
+    """Return the process-wide registry, loading DEFAULT_GROUP_FILES on first use."""
+    global _default_registry
+    if _default_registry is None:
+        with _default_lock:
+            if _default_registry is None:
+                _default_registry = SchoolRegistry.from_files()
+    return _default_registry
@@ -0,0 +1,152 @@
+import logging
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from custom_lib.client_pool import cookie_set_key
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SESSION_TTL = 3600
+
+
+class CookieSession:
+    """
+    A LinkedIn cookie set registered once through POST /session.
+
+    key is the cookie_set_key of the cookies, computed once so pooled
+    clients and jars are found without re-hashing the array on every call.
+    """
+
+    __slots__ = ("handle", "cookies", "key", "expires_at")
+
+    def __init__(self, handle: Optional[str], cookies: List[Dict[str, Any]], key: Optional[str] = None, expires_at: float = 0.0):
+        self.handle = handle
+        self.cookies = cookies
+        self.key = key or cookie_set_key(cookies)
+        self.expires_at = expires_at
+
+    @classmethod
+    def from_cookies(cls, cookies: List[Dict[str, Any]]) -> "CookieSession":
+        """Wrap a cookie array sent inline, for callers that do not use handles."""
+        return cls(None, cookies)
+
+
+class SessionStore:
+    """
+    Bounded, expiring map of opaque handles to cookie sets.
+
+    Clients POST their cookie array once and send only the handle afterwards.
+    Each use pushes the expiry ttl seconds out; the least recently used
+    session is dropped past max_size. Registering cookies for a LinkedIn
+    session that already has a handle returns that handle, so re-registering
+    on every page load does not fill the store.
+
+    Handles live in process memory: a cold start or another instance does
+    not know them, and callers must register again when get() fails.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = DEFAULT_SESSION_TTL, clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._sessions: "OrderedDict[str, CookieSession]" = OrderedDict()
+        self._handles_by_key: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def create(self, cookies: List[Dict[str, Any]]) -> CookieSession:
+        """
+        Register a cookie set and return its session.
+
+        Raises:
+            ValueError: If cookies is empty
+        """
+        if not cookies:
+            raise ValueError("cookies must not be empty")
+        key = cookie_set_key(cookies)
+        now = self.clock()
+        with self._lock:
+            self._evict_expired(now)
+            handle = self._handles_by_key.get(key)
+            if handle is not None:
+                session = self._sessions[handle]
+                # Keep the newest export, its rotating cookies are fresher
+                session.cookies = cookies
+                session.expires_at = now + self.ttl
+                self._sessions.move_to_end(handle)
+                return session
+
+            session = CookieSession(secrets.token_urlsafe(24), cookies, key, now + self.ttl)
+            self._sessions[session.handle] = session
+            self._handles_by_key[key] = session.handle
+            while len(self._sessions) > self.max_size:
+                self._drop(next(iter(self._sessions)))
+        # Never log the handle, it grants the cookies
+        logger.info("Created cookie session for %s (%d sessions)", key[:12], len(self._sessions))
+        return session
+
+    def get(self, handle: str) -> CookieSession:
+        """
+        Look up a session and extend its expiry.
+
+        Raises:
+            KeyError: If the handle is unknown or expired
+        """
+        now = self.clock()
+        with self._lock:
+            session = self._sessions.get(handle)
+            if session is None or session.expires_at <= now:
+                if session is not None:
+                    self._drop(handle)
+                raise KeyError(handle)
+            session.expires_at = now + self.ttl
+            self._sessions.move_to_end(handle)
+            return session
+
+    def replace_cookies(self, old_key: str, cookies: List[Dict[str, Any]]) -> bool:
+        """
+        Point the session registered for old_key at refreshed cookies, keeping its handle.
+
+        Returns:
+            True if a session was registered for old_key
+        """
+        key = cookie_set_key(cookies)
+        with self._lock:
+            handle = self._handles_by_key.pop(old_key, None)
+            if handle is None:
+                return False
+            session = self._sessions[handle]
+            session.cookies = cookies
+            session.key = key
+            self._handles_by_key[key] = handle
+            return True
+
+    def revoke(self, handle: str) -> bool:
+        """
+        Returns:
+            True if the handle existed
+        """
+        with self._lock:
+            if handle not in self._sessions:
+                return False
+            self._drop(handle)
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._evict_expired(self.clock())
+        return {"sessions": len(self._sessions), "max_size": self.max_size, "ttl": self.ttl}
+
+    def _evict_expired(self, now: float):
+        for handle in [handle for handle, session in self._sessions.items() if session.expires_at <= now]:
+            self._drop(handle)
+
+    def _drop(self, handle: str):
+        session = self._sessions.pop(handle)
+        if self._handles_by_key.get(session.key) == handle:
+            del self._handles_by_key[session.key]
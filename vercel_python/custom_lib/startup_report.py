@@ -0,0 +1,117 @@
+import logging
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Dependencies api.index must not load at import time; each is imported by the endpoints that use it
+LAZY_MODULES = ("pandas", "bs4", "openai", "linkedin_api", "requests", "aiohttp", "sqlalchemy")
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+class StartupReport:
+    """
+    Wall-clock timings of the steps a cold start runs through.
+
+    api.index wraps its import groups and one-time setup in measure(); lazy
+    loads done on first use of an endpoint are recorded the same way, so the
+    report shows what a cold request actually paid for.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.ready_ms: Optional[float] = None
+        self.steps: List[Tuple[str, float]] = []
+        self.lazy_steps: List[Tuple[str, float]] = []
+
+    @contextmanager
+    def measure(self, step: str, lazy: bool = False) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            (self.lazy_steps if lazy else self.steps).append((step, elapsed_ms))
+            if lazy:
+                logger.info("Lazy load %s took %.1fms", step, elapsed_ms)
+
+    def finish(self):
+        """Mark the module as imported and log the breakdown."""
+        self.ready_ms = (time.perf_counter() - self.started) * 1000
+        logger.info(
+            "Startup took %.1fms: %s",
+            self.ready_ms,
+            ", ".join(f"{step} {elapsed_ms:.1f}ms" for step, elapsed_ms in self.steps)
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "ready_ms": self.ready_ms,
+            "steps": [{"step": step, "ms": round(elapsed_ms, 1)} for step, elapsed_ms in self.steps],
+            "lazy_steps": [{"step": step, "ms": round(elapsed_ms, 1)} for step, elapsed_ms in self.lazy_steps],
+            "lazy_modules_loaded": [name for name in LAZY_MODULES if name in sys.modules],
+        }
+
+
+def import_time_breakdown(module: str = "api.index", cwd: Optional[str] = None, top: int = 15) -> Dict[str, Any]:
+    """
+    Cold-import module in a fresh interpreter under -X importtime.
+
+    Args:
+        module: Module to import
+        cwd: Directory to run from, the vercel_python root by default
+        top: Number of top-level packages listed in the breakdown
+
+    Returns:
+        total_ms (sum of every module's own import time), packages ([package, ms]
+        pairs, slowest first) and loaded (every module name imported)
+
+    Raises:
+        RuntimeError: If the import fails, with the child's stderr
+    """
+    cwd = cwd or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    total_us = 0
+    packages: Dict[str, int] = defaultdict(int)
+    loaded = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, name = int(match.group(1)), match.group(4)
+        total_us += self_us
+        packages[name.split(".")[0]] += self_us
+        loaded.append(name)
+
+    slowest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+    return {
+        "total_ms": total_us / 1000,
+        "packages": [[name, self_us / 1000] for name, self_us in slowest],
+        "loaded": loaded,
+    }
+
+
+if __name__ == "__main__":
+    # python -m custom_lib.startup_report [module]
+    breakdown = import_time_breakdown(sys.argv[1] if len(sys.argv) > 1 else "api.index")
+    print(f"Cold import: {breakdown['total_ms']:.1f}ms")
+    for name, elapsed_ms in breakdown["packages"]:
+        print(f"  {name:<30} {elapsed_ms:8.1f}ms")
+    eager = sorted({name.split(".")[0] for name in breakdown["loaded"]} & set(LAZY_MODULES))
+    if eager:
+        print(f"Loaded eagerly: {', '.join(eager)}")
@@ -1,9 +1,10 @@
 import sys
-import os, requests
+import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from custom_lib.automail_ai_craft import LinkedinWrapper, enrich_person_more
 from custom_lib.automail_ai_search_v2 import search_people
 from custom_lib.cookies_extractor_async import cookie_extractor_from_json
+from custom_lib.cookie_refresh import PlaywrightLoginProvider
 from dotenv import load_dotenv
 import json
 import os
@@ -16,14 +17,9 @@ import time
 # url = 'http://localhost:3000/chat/api/playwright-local'
 url_main = 'http://trylisa.vercel.app/chat/api/playwright'
 
-res = requests.get(
-        url_main +
-        f'?email={os.getenv("LINKEDIN_USER_1")}&password={os.getenv("LINKEDIN_PASS_1")}',
-    )
-
-json_data = res.json()
+cookies_A1 = asyncio.run(PlaywrightLoginProvider(url_main).login(os.getenv("LINKEDIN_USER_1"), os.getenv("LINKEDIN_PASS_1")))
 with open('multi_cookies/cookies_A1.json', 'w') as f:
-    json.dump(json_data['cookies'], f, indent=4)
+    json.dump(cookies_A1, f, indent=4)
 
 # Test search =========================================================================
 # with open('multi_cookies/cookies_B3.json', 'r') as f:
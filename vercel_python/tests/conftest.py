@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Tests import custom_lib from the vercel_python root: python -m pytest tests
+sys.path.insert(0, str(Path(__file__).parent.parent))
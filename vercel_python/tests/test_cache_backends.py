@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from custom_lib.cache_backends import CacheBackend, MemoryLRUBackend, TieredBackend
+from custom_lib.profile_cache import ProfileCache
+from custom_lib.resolution_cache import ResolutionCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class RecordingBackend(MemoryLRUBackend):
+    """Memory backend that notes which calls came through the async methods."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.async_calls = []
+
+    async def get_async(self, key):
+        self.async_calls.append(("get", key))
+        return self.get(key)
+
+    async def set_async(self, key, value, ttl=None):
+        self.async_calls.append(("set", key))
+        self.set(key, value, ttl)
+
+
+def test_backend_methods_are_abstract():
+    class Incomplete(CacheBackend):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_memory_lru_expiry_and_bound():
+    clock = Clock()
+    backend = MemoryLRUBackend(max_size=2, clock=clock)
+    backend.set("a", "1", ttl=10)
+    backend.set("b", "2")
+    backend.get("a")
+    backend.set("c", "3")
+    assert backend.get("b") is None
+    clock.now = 11
+    assert backend.get("a") is None
+    assert backend.get("c") == "3"
+
+
+def test_tiered_async_reads_disk_once_then_memory():
+    memory, disk = MemoryLRUBackend(), RecordingBackend()
+    tiered = TieredBackend(memory, disk, memory_ttl=300)
+    disk.set("k", "v")
+
+    async def run():
+        return [await tiered.get_async("k"), await tiered.get_async("k")]
+    assert asyncio.run(run()) == ["v", "v"]
+    assert disk.async_calls == [("get", "k")]
+    assert memory.get("k") == "v"
+
+
+def test_async_cache_paths_use_async_backend_calls():
+    backend = RecordingBackend()
+    resolutions = ResolutionCache(backend=backend)
+    profiles = ProfileCache(backend=backend)
+
+    async def lookup():
+        return {"urn_id": "1"}
+
+    async def run():
+        first = await resolutions.resolve_async("company", "Moelis & Co.", lookup)
+        second = await resolutions.resolve_async("company", "moelis and co", lookup)
+        return first, second, await profiles.get_async("Jane-Doe")
+    backend.set("profile:jane-doe", "{}")
+    assert asyncio.run(run()) == ({"urn_id": "1"}, {"urn_id": "1"}, {})
+    assert [call for call, _ in backend.async_calls] == ["get", "set", "get", "get"]
+    assert resolutions.stats()["hits"] == 1
@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+
+from custom_lib.client_pool import LinkedinClientPool, cookie_set_key
+
+
+def cookie_set(value):
+    return [
+        {"name": "li_at", "value": value, "domain": ".linkedin.com"},
+        {"name": "JSESSIONID", "value": f"ajax:{value}", "domain": ".linkedin.com"},
+        {"name": "lidc", "value": "rotates", "domain": ".linkedin.com"},
+    ]
+
+
+class FakeClient:
+    def __init__(self, cookies):
+        self.cookies = cookies
+        self.session_invalid = False
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_pool(**kwargs):
+    evicted = []
+    pool = LinkedinClientPool(FakeClient, on_evict=evicted.append, **kwargs)
+    return pool, evicted
+
+
+def test_key_ignores_rotating_cookies():
+    rotated = cookie_set("a")
+    rotated[2]["value"] = "rotated"
+    assert cookie_set_key(cookie_set("a")) == cookie_set_key(rotated)
+    assert cookie_set_key(cookie_set("a")) != cookie_set_key(cookie_set("b"))
+
+
+def test_same_cookies_reuse_the_client():
+    pool, evicted = make_pool()
+    assert pool.get(cookie_set("a")) is pool.get(cookie_set("a"))
+    assert len(pool) == 1 and evicted == []
+
+
+def test_least_recently_used_is_evicted_past_max_size():
+    pool, evicted = make_pool(max_size=2)
+    a = pool.get(cookie_set("a"))
+    b = pool.get(cookie_set("b"))
+    pool.get(cookie_set("a"))
+    pool.get(cookie_set("c"))
+    assert evicted == [b]
+    assert pool.peek(cookie_set_key(cookie_set("a"))) is a
+
+
+def test_idle_clients_are_evicted():
+    clock = Clock()
+    pool, evicted = make_pool(idle_ttl=60, clock=clock)
+    a = pool.get(cookie_set("a"))
+    clock.now = 61
+    b = pool.get(cookie_set("b"))
+    assert evicted == [a]
+    assert pool.peek(cookie_set_key(cookie_set("b"))) is b
+
+
+def test_invalid_session_is_rebuilt():
+    pool, evicted = make_pool()
+    a = pool.get(cookie_set("a"))
+    a.session_invalid = True
+    assert pool.get(cookie_set("a")) is not a
+    assert evicted == [a]
+
+
+def test_replace_swaps_to_refreshed_cookies():
+    pool, evicted = make_pool()
+    old = pool.get(cookie_set("a"))
+    new = pool.replace(cookie_set_key(cookie_set("a")), cookie_set("fresh"))
+    assert new.cookies == cookie_set("fresh")
+    assert evicted == [old]
+    assert pool.peek(cookie_set_key(cookie_set("a"))) is None
+    assert pool.get(cookie_set("fresh")) is new
+    assert pool.replace(cookie_set_key(cookie_set("unknown")), cookie_set("x")) is None
+
+
+def test_evicted_client_closes_after_in_flight_requests():
+    pytest.importorskip("aiohttp")
+    pytest.importorskip("linkedin_api")
+    from custom_lib.linkedin_wrapper_async import AsyncResponse, LinkedinWrapperAsync, _no_evade_async
+
+    async def run():
+        client = LinkedinWrapperAsync(cookies={"li_at": "a", "JSESSIONID": "ajax:a"})
+        release = asyncio.Event()
+        closed = []
+
+        async def request(method, url, **kwargs):
+            await release.wait()
+            return AsyncResponse(200, url, "{}")
+
+        async def close():
+            closed.append(True)
+        client.client.request = request
+        client.client.close = close
+
+        pending = asyncio.ensure_future(client._fetch("/me", evade=_no_evade_async))
+        await asyncio.sleep(0)
+        client.close_nowait()
+        await asyncio.sleep(0)
+        assert closed == []
+        release.set()
+        assert (await pending).status_code == 200
+        await asyncio.sleep(0)
+        assert closed == [True]
+
+    asyncio.run(run())
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from custom_lib.cookie_refresh import CookieRefreshManager, ManagedAccount, StaticLoginProvider
+
+NOW = 1_000_000.0
+DAY = 24 * 3600
+
+
+def cookies(expires_at, value="token"):
+    return [
+        {"name": "li_at", "value": value, "domain": ".linkedin.com", "expirationDate": expires_at},
+        {"name": "JSESSIONID", "value": f"ajax:{value}", "domain": ".linkedin.com", "expirationDate": expires_at},
+    ]
+
+
+class Clock:
+    def __init__(self, now=NOW):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def manager(provider, clock, **kwargs):
+    return CookieRefreshManager(provider, clock=clock, jitter=0, refresh_margin=DAY, **kwargs)
+
+
+def test_due_a_margin_before_expiry():
+    clock = Clock()
+    refresh = manager(StaticLoginProvider({}), clock)
+    account = ManagedAccount("a", "a@example.com", "pw", cookies(NOW + 3 * DAY))
+    refresh.add_account(account)
+    assert account.refresh_at == NOW + 2 * DAY
+    assert refresh.due() == []
+    clock.now += 2 * DAY
+    assert refresh.due() == [account]
+
+
+def test_accounts_without_cookies_are_due_at_once():
+    refresh = manager(StaticLoginProvider({}), Clock())
+    account = ManagedAccount("a", "a@example.com", "pw")
+    refresh.add_account(account)
+    assert refresh.due() == [account]
+
+
+def test_jitter_only_moves_refreshes_earlier():
+    refresh = CookieRefreshManager(StaticLoginProvider({}), clock=Clock(), jitter=600, refresh_margin=DAY)
+    for i in range(20):
+        account = ManagedAccount(str(i), "a@example.com", "pw", cookies(NOW + 3 * DAY))
+        refresh.add_account(account)
+        assert NOW + 2 * DAY - 600 <= account.refresh_at <= NOW + 2 * DAY
+
+
+def test_refresh_swaps_cookies_and_reschedules():
+    clock = Clock()
+    new_cookies = cookies(NOW + 10 * DAY, "fresh")
+    swaps = []
+    refresh = manager(
+        StaticLoginProvider({"a@example.com": new_cookies}), clock,
+        on_refresh=lambda account, old, new: swaps.append((old, new))
+    )
+    old_cookies = cookies(NOW + DAY / 2)
+    account = ManagedAccount("a", "a@example.com", "pw", old_cookies)
+    refresh.add_account(account)
+
+    assert asyncio.run(refresh.run_once()) == 1
+    assert swaps == [(old_cookies, new_cookies)]
+    assert account.cookies is new_cookies
+    assert account.refresh_at == NOW + 7 * DAY  # max_cookie_age after the login, before expiry - margin
+    assert refresh.due() == []
+
+
+def test_failed_login_backs_off_exponentially():
+    clock = Clock()
+    refresh = manager(StaticLoginProvider({}), clock, retry_delay=60, max_retry_delay=200)
+    account = ManagedAccount("a", "a@example.com", "pw")
+    refresh.add_account(account)
+
+    delays = []
+    for _ in range(4):
+        assert asyncio.run(refresh.run_once()) == 0
+        delays.append(account.refresh_at - clock.now)
+        clock.now = account.refresh_at
+    assert delays == [60, 120, 200, 200]
+    assert account.failures == 4
+
+
+@pytest.mark.parametrize("concurrent", [2, 5])
+def test_concurrent_refreshes_share_one_login(concurrent):
+    provider = StaticLoginProvider({"a@example.com": cookies(NOW + 10 * DAY)})
+    refresh = manager(provider, Clock())
+    account = ManagedAccount("a", "a@example.com", "pw")
+    refresh.add_account(account)
+
+    async def run():
+        return await asyncio.gather(*(refresh.refresh(account) for _ in range(concurrent)))
+    assert all(asyncio.run(run()))
+    assert provider.logins == ["a@example.com"]
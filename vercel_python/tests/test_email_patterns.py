@@ -0,0 +1,61 @@
+import pytest
+
+from custom_lib.email_patterns import VERIFYING, compile_pattern, format_emails, parse_name, transliterate
+
+
+@pytest.mark.parametrize("name, parts", [
+    ("Nathan Beber", ("nathan", "", "beber")),
+    ("John Michael Smith", ("john", "michael", "smith")),
+    ("José Ñúñez", ("jose", "", "nunez")),
+    ("Jürgen Weiß", ("jurgen", "", "weiss")),
+    ("Ana Garcia-Lopez", ("ana", "", "garcialopez")),
+    ("Ludwig van Beethoven", ("ludwig", "", "vanbeethoven")),
+    ("Maria de la Cruz", ("maria", "", "delacruz")),
+    ("Maria De La Cruz", ("maria", "", "delacruz")),
+    ("Kim Le Nguyen", ("kim", "le", "nguyen")),
+    ("Ana Da Silva Santos", ("ana", "dasilva", "santos")),
+    ("Jane Doe, CFA", ("jane", "", "doe")),
+    ("Sam Lee (he/him)", ("sam", "", "lee")),
+    ("Robert Downey Jr.", ("robert", "", "downey")),
+    ("Mary O'Neil", ("mary", "", "oneil")),
+])
+def test_parse_name(name, parts):
+    assert parse_name(name) == parts
+
+
+@pytest.mark.parametrize("name", ["Jane", "Nathan B.", "J. Smith", "", "   "])
+def test_incomplete_names(name):
+    assert parse_name(name) is None
+
+
+def test_transliterate_leaves_ascii_alone():
+    assert transliterate("Plain Name") == "Plain Name"
+    assert transliterate("Łukasz Søren") == "Lukasz Soren"
+
+
+@pytest.mark.parametrize("pattern, expected", [
+    ("[first].[last]", "john.smith"),
+    ("[first_initial][last]", "jsmith"),
+    ("[last]_[first]", "smith_john"),
+    ("[first]", "john"),
+    ("[first_name].[last_name]@example.com", "john.smith"),
+    (" [FIRST]-[LAST] ", "john-smith"),
+    ("[first][middle_initial][last]", "johnmsmith"),
+])
+def test_compile_pattern(pattern, expected):
+    assert compile_pattern(pattern)(("john", "michael", "smith")) == expected
+
+
+def test_missing_middle_name_collapses_separators():
+    assert compile_pattern("[first].[middle].[last]")(("john", "", "smith")) == "john.smith"
+    assert compile_pattern("[middle].[first]")(("john", "", "smith")) == "john"
+
+
+@pytest.mark.parametrize("pattern", ["", "...", "[first]+[last]", "[nickname].[last]", "first.last", "[first] [last]"])
+def test_unknown_patterns_are_rejected(pattern):
+    assert compile_pattern(pattern) is None
+
+
+def test_format_emails_keeps_order_and_marks_incomplete_names():
+    assert format_emails("[first_initial][last]", ["Nathan Beber", "Jane D.", "John Smith"]) == ["nbeber", VERIFYING, "jsmith"]
+    assert format_emails("[unknown]", ["John Smith"]) is None
@@ -0,0 +1,72 @@
+import asyncio
+
+from custom_lib.account_pool import AccountPool
+from custom_lib.email_pipeline import run_email_pipeline
+from custom_lib.profile_model import Profile
+
+URLS = [f"https://www.linkedin.com/in/person-{i}" for i in range(6)]
+
+
+def fake_enrich(failing=(), delays=None):
+    async def enrich(client, value, url_value):
+        await asyncio.sleep((delays or {}).get(value, 0))
+        if value in failing:
+            raise ValueError(f"{value} is private")
+        return Profile()
+    return enrich
+
+
+def run(monkeypatch, enrich, **kwargs):
+    monkeypatch.setattr("custom_lib.email_pipeline.enrich_profile_async", enrich)
+    pool = AccountPool([object(), object()], max_concurrency=2)
+
+    async def collect():
+        return [event async for event in run_email_pipeline(pool, URLS, **kwargs)]
+    return asyncio.run(asyncio.wait_for(collect(), timeout=5))
+
+
+def test_every_input_gets_one_email_in_completion_order(monkeypatch):
+    async def draft(profile):
+        return "hello"
+
+    # The first profile is slowest, so it must not hold up the others
+    events = run(monkeypatch, fake_enrich(delays={URLS[0]: 0.05}), draft=draft, draft_concurrency=3)
+    emails = [event for event in events if event.kind == "email"]
+    assert sorted(event.index for event in emails) == list(range(len(URLS)))
+    assert emails[-1].index == 0
+
+
+def test_failed_enrichment_skips_the_llm(monkeypatch):
+    drafted = []
+
+    async def draft(profile):
+        drafted.append(profile)
+        return "hello"
+
+    events = run(monkeypatch, fake_enrich(failing={URLS[1]}), draft=draft)
+    failed = [event for event in events if event.kind == "draft_failed"]
+    assert [(event.index, event.email) for event in failed] == [(1, "")]
+    assert "private" in failed[0].error
+    assert len(drafted) == len(URLS) - 1
+
+
+def test_short_pack_is_reported_instead_of_hanging(monkeypatch):
+    async def draft(profile):
+        raise AssertionError("packed drafting only")
+
+    async def draft_pack(profiles):
+        # Drops the last profile of every pack
+        return ["hello"] * (len(profiles) - 1)
+
+    events = run(monkeypatch, fake_enrich(), draft=draft, draft_pack=draft_pack, pack_size=3, draft_concurrency=1)
+    done = [event for event in events if event.kind in ("email", "draft_failed")]
+    assert sorted(event.index for event in done) == list(range(len(URLS)))
+    assert any(event.kind == "draft_failed" for event in done)
+
+
+def test_draft_errors_become_draft_failed(monkeypatch):
+    async def draft(profile):
+        raise RuntimeError("LLM down")
+
+    events = run(monkeypatch, fake_enrich(), draft=draft)
+    assert sum(event.kind == "draft_failed" for event in events) == len(URLS)
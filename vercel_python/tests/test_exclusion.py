@@ -0,0 +1,53 @@
+import base64
+
+import pytest
+
+from custom_lib.exclusion import MAX_FILTER_BYTES, MAX_NUM_HASHES, BloomFilter, ExclusionSet
+
+IDS = [f"person-{i}" for i in range(2000)]
+
+
+def test_round_trip_keeps_members():
+    bloom = BloomFilter.from_ids(IDS, error_rate=0.01)
+    decoded = BloomFilter.from_string(bloom.to_string())
+    assert all(id_ in decoded for id_ in IDS)
+    false_positives = sum(f"stranger-{i}" in decoded for i in range(10000))
+    assert false_positives < 300
+
+
+def test_parse_accepts_string_filter_or_none():
+    bloom = BloomFilter.from_ids(IDS[:10])
+    assert BloomFilter.parse(None) is None
+    assert BloomFilter.parse("") is None
+    assert BloomFilter.parse(bloom) is bloom
+    assert "person-3" in BloomFilter.parse(bloom.to_string())
+
+
+@pytest.mark.parametrize("encoded", [
+    "not a filter",
+    "3:***",
+    f"{MAX_NUM_HASHES + 1}:{base64.b64encode(bytes(8)).decode()}",
+    "100000000:AAAA",
+    "0:AAAA",
+    f"3:{base64.b64encode(bytes(MAX_FILTER_BYTES + 3)).decode()}",
+])
+def test_from_string_rejects_invalid_or_oversized(encoded):
+    with pytest.raises(ValueError):
+        BloomFilter.from_string(encoded)
+
+
+def test_for_capacity_bounds():
+    assert BloomFilter.for_capacity(100, error_rate=1e-30).num_hashes == MAX_NUM_HASHES
+    with pytest.raises(ValueError):
+        BloomFilter.for_capacity(100, error_rate=0)
+    with pytest.raises(ValueError):
+        BloomFilter.for_capacity(10 ** 8)
+
+
+def test_exclusion_set_does_not_touch_caller_list():
+    ids = ["a"]
+    exclusion = ExclusionSet(ids, BloomFilter.from_ids(["b"]))
+    exclusion.add("c")
+    assert "a" in exclusion and "b" in exclusion and "c" in exclusion
+    assert "d" not in exclusion
+    assert ids == ["a"]
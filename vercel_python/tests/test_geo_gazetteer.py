@@ -0,0 +1,45 @@
+from custom_lib.geo_gazetteer import GeoGazetteer
+
+TEXAS_TYPEAHEAD = [
+    ("102748797", "Texas, United States"),
+    ("104193316", "Paris, Texas, United States"),
+    ("90000064", "Dallas-Fort Worth Metroplex"),
+]
+
+
+def test_lookup_answers_queries_and_titles():
+    gazetteer = GeoGazetteer()
+    gazetteer.add_typeahead(TEXAS_TYPEAHEAD, query="Texas")
+    assert gazetteer.lookup("texas") == "102748797"
+    assert gazetteer.lookup("Paris, Texas, United States") == "104193316"
+
+
+def test_lookup_ignores_aliases_of_other_titles():
+    gazetteer = GeoGazetteer()
+    gazetteer.add_typeahead(TEXAS_TYPEAHEAD, query="Texas")
+    # "Paris" is only the leading word of Paris, TX: it must go to the live typeahead
+    assert gazetteer.lookup("Paris") is None
+    assert [entry.geo_id for entry in gazetteer.complete("Paris")] == ["104193316"]
+
+
+def test_weaker_key_does_not_overwrite_stronger():
+    gazetteer = GeoGazetteer()
+    gazetteer.add_typeahead([("1", "Paris, Île-de-France, France")], query="Paris")
+    gazetteer.add_typeahead(TEXAS_TYPEAHEAD, query="Texas")
+    assert gazetteer.lookup("paris") == "1"
+
+
+def test_seed_aliases_do_not_resolve():
+    gazetteer = GeoGazetteer.from_seed_file()
+    assert gazetteer.lookup("New York") is not None
+    for name in ("Rochester", "Albany", "Melrose", "Garden City"):
+        assert gazetteer.lookup(name) is None
+
+
+def test_seed_round_trip():
+    gazetteer = GeoGazetteer()
+    gazetteer.add_typeahead(TEXAS_TYPEAHEAD, query="Texas")
+    reloaded = GeoGazetteer()
+    reloaded.load_seed(gazetteer.to_seed())
+    assert len(reloaded) == 3
+    assert reloaded.lookup("texas") == "102748797"
@@ -0,0 +1,35 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Run from vercel_python: python -m pytest tests
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from custom_lib.startup_report import LAZY_MODULES, import_time_breakdown
+
+# Cold-import budget for api.index in ms; raise it on slow CI machines with IMPORT_BUDGET_MS
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "1500"))
+
+
+@pytest.fixture(scope="module")
+def breakdown():
+    try:
+        return import_time_breakdown("api.index")
+    except RuntimeError as e:
+        if "ModuleNotFoundError" in str(e):
+            pytest.skip(f"api.index dependencies not installed: {str(e).splitlines()[-1]}")
+        raise
+
+
+def test_cold_import_within_budget(breakdown):
+    slowest = ", ".join(f"{name} {elapsed_ms:.0f}ms" for name, elapsed_ms in breakdown["packages"][:5])
+    assert breakdown["total_ms"] <= IMPORT_BUDGET_MS, (
+        f"import api.index took {breakdown['total_ms']:.0f}ms (budget {IMPORT_BUDGET_MS:.0f}ms): {slowest}"
+    )
+
+
+def test_heavy_dependencies_stay_lazy(breakdown):
+    loaded = {name.split(".")[0] for name in breakdown["loaded"]}
+    assert not loaded & set(LAZY_MODULES), f"imported eagerly: {sorted(loaded & set(LAZY_MODULES))}"
@@ -0,0 +1,25 @@
+from custom_lib.log_payload import REDACTED, LogPayload, redact
+
+
+def test_credentials_are_redacted():
+    payload = {
+        "session": "handle-secret",
+        "sessions": ["other-handle-secret"],
+        "cookies": [{"name": "li_at", "value": "cookie-secret", "domain": ".linkedin.com"}],
+        "password": "pw-secret",
+        "input": "investment banking",
+    }
+    rendered = str(LogPayload(payload))
+    assert "secret" not in rendered
+    assert "investment banking" in rendered
+
+
+def test_cookie_dicts_redacted_under_any_key():
+    cookie_sets = {"cookie_sets": [[{"name": "li_at", "value": "cookie-secret", "domain": ".linkedin.com"}]]}
+    assert redact(cookie_sets) == {"cookie_sets": [[{"name": "li_at", "value": REDACTED}]]}
+
+
+def test_truncation_and_sampling():
+    rendered = str(LogPayload(list(range(100)), max_chars=20))
+    assert rendered.endswith("chars)")
+    assert str(LogPayload({"a": 1}, sample_rate=0.0)) == "<dict with 1 keys>"
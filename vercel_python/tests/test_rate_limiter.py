@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from custom_lib.rate_limiter import AsyncRateLimiter
+
+
+class FakeTime:
+    """Clock advanced by the limiter's own sleeps, so tests run instantly."""
+
+    def __init__(self, monkeypatch):
+        self.now = 0.0
+        self.sleeps = []
+        real_sleep = asyncio.sleep
+
+        async def sleep(delay):
+            self.sleeps.append(delay)
+            self.now += delay
+            await real_sleep(0)
+        monkeypatch.setattr(asyncio, "sleep", sleep)
+
+    def __call__(self):
+        return self.now
+
+
+def test_rate_must_be_positive():
+    with pytest.raises(ValueError):
+        AsyncRateLimiter(0)
+
+
+def test_burst_up_to_capacity_then_paced(monkeypatch):
+    clock = FakeTime(monkeypatch)
+    limiter = AsyncRateLimiter(6, per=60, clock=clock)
+
+    async def run():
+        for _ in range(8):
+            await limiter.acquire()
+    asyncio.run(run())
+    # Six tokens up front, then one every 10 seconds
+    assert clock.sleeps == [pytest.approx(10), pytest.approx(10)]
+    assert clock.now == pytest.approx(20)
+
+
+def test_oversized_request_waits_for_a_full_bucket(monkeypatch):
+    clock = FakeTime(monkeypatch)
+    limiter = AsyncRateLimiter(2, per=1, clock=clock)
+
+    async def run():
+        await limiter.acquire(2)
+        await limiter.acquire(100)
+    asyncio.run(run())
+    assert clock.now == pytest.approx(1)
+
+
+def test_concurrent_waiters_share_the_budget(monkeypatch):
+    clock = FakeTime(monkeypatch)
+    limiter = AsyncRateLimiter(1, per=1, capacity=1, clock=clock)
+    finished = []
+
+    async def worker(i):
+        await limiter.acquire()
+        finished.append((i, clock.now))
+
+    async def run():
+        await asyncio.gather(*(worker(i) for i in range(4)))
+    asyncio.run(run())
+    assert [i for i, _ in finished] == [0, 1, 2, 3]
+    assert [now for _, now in finished] == [pytest.approx(t) for t in (0, 1, 2, 3)]
@@ -0,0 +1,82 @@
+import asyncio
+
+from custom_lib.automail_ai_search_v2 import _collect_pages_async
+from custom_lib.exclusion import ExclusionSet
+
+PAGE_SIZE = 10
+
+
+def person(i, private=False):
+    return {
+        "name": f"Person {i}",
+        "url": f"https://www.linkedin.com/in/person-{i}",
+        "location": "New York",
+        "distance": "OUT_OF_NETWORK" if private else "DISTANCE_2",
+    }
+
+
+class FakeLinkedin:
+    """Serves fixed pages and records which offsets were requested."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.offsets = []
+
+    async def search_people(self, include_private_profiles=False, limit=-1, offset=0, **filters):
+        self.offsets.append(offset)
+        await asyncio.sleep(0)
+        page = self.pages[offset // PAGE_SIZE] if offset // PAGE_SIZE < len(self.pages) else []
+        return page if include_private_profiles else [p for p in page if p["distance"] != "OUT_OF_NETWORK"]
+
+
+def collect(linkedin, target_count, exclude=()):
+    all_results = []
+
+    async def run():
+        return await _collect_pages_async(
+            linkedin, {"offset": 0, "limit": PAGE_SIZE}, None, ExclusionSet(list(exclude)), all_results, target_count
+        )
+    return asyncio.run(run()), all_results
+
+
+def test_full_first_page_requests_nothing_more():
+    linkedin = FakeLinkedin([[person(i) for i in range(10)], [person(i) for i in range(10, 20)]])
+    end, results = collect(linkedin, 5)
+    assert len(results) == 5
+    assert end == 5
+    assert linkedin.offsets == [0]
+
+
+def test_short_first_page_prefetches_ahead():
+    pages = [[person(i) for i in range(page * 10, page * 10 + 10)] for page in range(4)]
+    linkedin = FakeLinkedin(pages)
+    # Page 0 is all excluded, so the search has to read on
+    end, results = collect(linkedin, 15, exclude=[p["url"].rsplit("/", 1)[1] for p in pages[0]])
+    assert len(results) == 15
+    assert linkedin.offsets[:3] == [0, 10, 20]
+
+
+def test_private_only_page_is_not_the_end():
+    pages = [[person(i, private=True) for i in range(10)], [person(i) for i in range(10, 20)], []]
+    end, results = collect(FakeLinkedin(pages), 5)
+    assert [p["url"] for p, _ in results] == [person(i)["url"] for i in range(10, 15)]
+    assert end == 15
+
+
+def test_empty_raw_page_ends_the_search():
+    end, results = collect(FakeLinkedin([[person(i) for i in range(3)]]), 5)
+    assert len(results) == 3
+    assert end is None
+
+
+def test_no_speculative_fill_without_school_or_cad():
+    from custom_lib.automail_ai_search_v2 import execute_single_search_paged_async
+
+    linkedin = FakeLinkedin([[person(i) for i in range(3)]])
+    page = asyncio.run(execute_single_search_paged_async(
+        linkedin, "1", "Acme", "2", target_count=5, speculative=True
+    ))
+    # The identical fill search would request offset 0 a second time
+    assert linkedin.offsets.count(0) == 1
+    assert len(page.rows) == 3
+    assert page.next_fill_offset is None